@@ -1,17 +1,8 @@
-import pandas as pd
-import json
+import os
+import sys
 
-df = pd.read_csv('iclr_2026/iclr_2026_v1/ratings_data.csv')
-meta = json.load(open('iclr_2026/iclr_2026_v1/submissions_metadata.json'))
-no_rating = set(df[df['num_reviews'] == 0]['submission_number'].tolist())
-results = []
-for sub in meta:
-    num = sub.get('number')
-    if num in no_rating:
-        title = sub.get('content', {}).get('title', '')
-        results.append({'number': num, 'title': title})
-print('Total:', len(results))
-print('---')
-for r in results[:50]:
-    print(f"{r['number']}: {r['title']}")
-print('...')
\ No newline at end of file
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from meta import list_no_rating
+
+# Equivalent to: python3 src/meta.py list-no-rating <metadata_file>
+list_no_rating('iclr_2026/iclr_2026_v1/submissions_metadata.json')
@@ -3,19 +3,74 @@
 Generate distribution analyses and plots
 """
 
+import os
 import pandas as pd
+import pyarrow.csv as pacsv
+import matplotlib
+matplotlib.use('Agg')  # Headless rendering, also inherited by the plot worker processes
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import ast
+
+from cache_metadata import LIST_SCORE_PATTERN, valid_scores
 
 # Set style
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
+# Default output resolution; 300 is still available via the dpi argument
+DEFAULT_DPI = 150
+
+
+def save_plot(fig, output_dir, name, dpi=DEFAULT_DPI, fmt='png'):
+    """
+    Save the figure as <output_dir>/<name>.<fmt> and close it
+    PNGs use a light zlib level: encoding dominates savefig time at high dpi.
+    The plots set the tight layout engine, so the layout is solved once at draw
+    time instead of a second bbox_inches='tight' render pass
+    """
+    output_file = Path(output_dir) / f'{name}.{fmt}'
+    save_kwargs = {'pil_kwargs': {'compress_level': 1}} if fmt == 'png' else {}
+    fig.savefig(output_file, dpi=dpi, facecolor='white', **save_kwargs)
+    plt.close(fig)
+    print(f"✓ Saved: {output_file}")
+
+
+def count_labels(counts, total, sep='\n', cumulative=True):
+    """
+    Build the '<count> (<pct>%) [<cumulative pct>%]' labels for all bars at once
+    Percentages are formatted with NumPy string ufuncs in one pass over the counts
+    """
+    counts = np.asarray(counts)
+    labels = np.array([f'{count:,}' for count in counts])
+    labels = np.char.add(np.char.add(labels, sep + '('), np.char.mod('%.1f', counts / total * 100))
+    labels = np.char.add(labels, '%)')
+    if cumulative:
+        cumulative_pct = np.cumsum(counts) / total * 100
+        labels = np.char.add(np.char.add(labels, '\n['), np.char.mod('%.1f', cumulative_pct))
+        labels = np.char.add(labels, '%]')
+    return labels
+
 
-def plot_primary_area_distribution(df, output_dir='outputs'):
+def parse_list_column(series):
+    """
+    Flatten a column of score lists into a single contiguous float array
+    Typed list columns (Parquet) are exploded directly; stringified lists (CSV)
+    are parsed in one vectorized regex pass instead of a per-row literal_eval loop.
+    Either way only valid scores are kept (cache_metadata.valid_scores), so a
+    fractional score such as 5.5 is dropped, as it is from the Parquet lists.
+    """
+    if not pd.api.types.is_string_dtype(series):
+        values = series.explode().dropna().astype(np.float64).to_numpy()
+    else:
+        parts = series.dropna().str.extractall(LIST_SCORE_PATTERN)
+        values = parts['text'].fillna(parts['number']).astype(np.float64).to_numpy()
+    return values[valid_scores(values)]
+
+
+def plot_primary_area_distribution(df, output_dir='outputs', dpi=DEFAULT_DPI, fmt='png'):
     """
     Plot primary area count distribution (ranked most to least)
     """
@@ -28,10 +83,8 @@ def plot_primary_area_distribution(df, output_dir='outputs'):
                     color='steelblue', edgecolor='black', linewidth=0.5, alpha=0.85)
     
     # Add count labels
-    for i, (count, area) in enumerate(zip(area_counts.values, area_counts.index)):
-        pct = (count / len(df)) * 100
-        ax.text(count + max(area_counts) * 0.01, i, f'{count:,} ({pct:.1f}%)',
-               ha='left', va='center', fontsize=11, fontweight='bold')
+    ax.bar_label(bars, labels=count_labels(area_counts.values, len(df), sep=' ', cumulative=False),
+                 padding=3, fontsize=11, fontweight='bold')
     
     # Labels
     ax.set_yticks(range(len(area_counts)))
@@ -46,44 +99,23 @@ def plot_primary_area_distribution(df, output_dir='outputs'):
     ax.set_axisbelow(True)
     ax.invert_yaxis()
     
-    plt.tight_layout()
+    fig.set_layout_engine('tight')
     
-    output_file = Path(output_dir) / 'area_distribution.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file}")
-    plt.close()
+    save_plot(fig, output_dir, 'area_distribution', dpi, fmt)
     
     return area_counts
 
 
-def plot_all_confidence_ratings(df, output_dir='outputs'):
+def plot_all_confidence_ratings(all_confidences, output_dir='outputs', dpi=DEFAULT_DPI, fmt='png'):
     """
     Plot distribution of ALL individual confidence ratings
-    """
-    # Parse all confidence ratings
-    all_confidences = []
-    for conf_str in df['confidences']:
-        try:
-            confs = ast.literal_eval(conf_str)
-            for c in confs:
-                # Extract numeric value
-                if isinstance(c, (int, float)):
-                    all_confidences.append(c)
-                elif isinstance(c, str):
-                    try:
-                        all_confidences.append(int(c.split(':')[0]))
-                    except:
-                        pass
-        except:
-            pass
-    
-    all_confidences = np.array(all_confidences)
     
+    Args:
+        all_confidences: Flat array of individual confidence ratings
+    """
     # Get counts for each unique value
     unique_vals, counts = np.unique(all_confidences, return_counts=True)
     total = len(all_confidences)
-    cumsum = np.cumsum(counts)
-    cumulative_pct = (cumsum / total) * 100
     
     fig, ax = plt.subplots(figsize=(14, 10))
     
@@ -92,11 +124,7 @@ def plot_all_confidence_ratings(df, output_dir='outputs'):
                    color='coral', edgecolor='black', linewidth=0.5, alpha=0.85)
     
     # Add labels
-    for i, (val, count, cum_pct) in enumerate(zip(unique_vals, counts, cumulative_pct)):
-        pct = (count / total) * 100
-        ax.text(i, count + max(counts) * 0.01, 
-               f'{count:,}\n({pct:.1f}%)\n[{cum_pct:.1f}%]',
-               ha='center', va='bottom', fontsize=11, fontweight='bold')
+    ax.bar_label(bars, labels=count_labels(counts, total), padding=3, fontsize=11, fontweight='bold')
     
     # Labels
     ax.set_xticks(range(len(unique_vals)))
@@ -125,42 +153,21 @@ def plot_all_confidence_ratings(df, output_dir='outputs'):
     ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.7, axis='y')
     ax.set_axisbelow(True)
     
-    plt.tight_layout()
+    fig.set_layout_engine('tight')
     
-    output_file = Path(output_dir) / 'all_confidence_distribution.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file}")
-    plt.close()
+    save_plot(fig, output_dir, 'all_confidence_distribution', dpi, fmt)
 
 
-def plot_all_overall_ratings(df, output_dir='outputs'):
+def plot_all_overall_ratings(all_ratings, output_dir='outputs', dpi=DEFAULT_DPI, fmt='png'):
     """
     Plot distribution of ALL individual overall ratings
-    """
-    # Parse all overall ratings
-    all_ratings = []
-    for rating_str in df['ratings']:
-        try:
-            ratings = ast.literal_eval(rating_str)
-            for r in ratings:
-                # Extract numeric value
-                if isinstance(r, (int, float)):
-                    all_ratings.append(r)
-                elif isinstance(r, str):
-                    try:
-                        all_ratings.append(int(r.split(':')[0]))
-                    except:
-                        pass
-        except:
-            pass
-    
-    all_ratings = np.array(all_ratings)
     
+    Args:
+        all_ratings: Flat array of individual overall ratings
+    """
     # Get counts for each unique value
     unique_vals, counts = np.unique(all_ratings, return_counts=True)
     total = len(all_ratings)
-    cumsum = np.cumsum(counts)
-    cumulative_pct = (cumsum / total) * 100
     
     fig, ax = plt.subplots(figsize=(16, 10))
     
@@ -180,11 +187,7 @@ def plot_all_overall_ratings(df, output_dir='outputs'):
         bar.set_facecolor(cmap(norm_rating))
     
     # Add labels
-    for i, (val, count, cum_pct) in enumerate(zip(unique_vals, counts, cumulative_pct)):
-        pct = (count / total) * 100
-        ax.text(i, count + max(counts) * 0.01, 
-               f'{count:,}\n({pct:.1f}%)\n[{cum_pct:.1f}%]',
-               ha='center', va='bottom', fontsize=10, fontweight='bold')
+    ax.bar_label(bars, labels=count_labels(counts, total), padding=3, fontsize=10, fontweight='bold')
     
     # Labels
     ax.set_xticks(range(len(unique_vals)))
@@ -214,25 +217,21 @@ def plot_all_overall_ratings(df, output_dir='outputs'):
     ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.7, axis='y')
     ax.set_axisbelow(True)
     
-    plt.tight_layout()
+    fig.set_layout_engine('tight')
     
-    output_file = Path(output_dir) / 'all_overall_ratings_distribution.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file}")
-    plt.close()
+    save_plot(fig, output_dir, 'all_overall_ratings_distribution', dpi, fmt)
 
 
-def plot_avg_confidence_distribution(df, output_dir='outputs'):
+def plot_avg_confidence_distribution(df, output_dir='outputs', dpi=DEFAULT_DPI, fmt='png'):
     """
     Plot distribution of average confidence per submission
     """
     avg_confs = df[df['avg_confidence'].notna()]['avg_confidence']
     
-    # Get counts for each unique value
-    unique_vals, counts = np.unique(avg_confs.round(2), return_counts=True)
+    # Get counts for each unique value (hash-based count, sorted by value)
+    value_counts = avg_confs.round(2).value_counts(sort=False).sort_index()
+    unique_vals, counts = value_counts.index.to_numpy(), value_counts.to_numpy()
     total = len(avg_confs)
-    cumsum = np.cumsum(counts)
-    cumulative_pct = (cumsum / total) * 100
     
     fig, ax = plt.subplots(figsize=(16, 10))
     
@@ -242,12 +241,9 @@ def plot_avg_confidence_distribution(df, output_dir='outputs'):
     
     # Add labels (only for larger bars to avoid clutter)
     max_count = max(counts)
-    for i, (val, count, cum_pct) in enumerate(zip(unique_vals, counts, cumulative_pct)):
-        if count > max_count * 0.02:  # Only label if > 2% of max
-            pct = (count / total) * 100
-            ax.text(i, count + max_count * 0.01, 
-                   f'{count:,}\n({pct:.1f}%)',
-                   ha='center', va='bottom', fontsize=9, fontweight='bold')
+    labels = count_labels(counts, total, cumulative=False)
+    labels = np.where(counts > max_count * 0.02, labels, '')  # Only label if > 2% of max
+    ax.bar_label(bars, labels=labels, padding=3, fontsize=9, fontweight='bold')
     
     # Labels
     ax.set_xticks(range(len(unique_vals)))
@@ -281,15 +277,12 @@ def plot_avg_confidence_distribution(df, output_dir='outputs'):
     ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.7, axis='y')
     ax.set_axisbelow(True)
     
-    plt.tight_layout()
+    fig.set_layout_engine('tight')
     
-    output_file = Path(output_dir) / 'avg_confidence_distribution.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file}")
-    plt.close()
+    save_plot(fig, output_dir, 'avg_confidence_distribution', dpi, fmt)
 
 
-def main(csv_file='data/ratings_data.csv', output_dir='outputs'):
+def main(csv_file='data/ratings_data.csv', output_dir='outputs', dpi=DEFAULT_DPI, fmt='png'):
     """
     Generate all distribution analyses
     """
@@ -297,37 +290,47 @@ def main(csv_file='data/ratings_data.csv', output_dir='outputs'):
     print("Distribution Analysis")
     print("="*60)
     
-    # Load data
-    df = pd.read_csv(csv_file)
+    # Load data (typed Parquet if available, else multi-threaded Arrow CSV reader)
+    if csv_file.endswith('.parquet'):
+        df = pd.read_parquet(csv_file)
+    else:
+        df = pacsv.read_csv(csv_file).to_pandas()
     print(f"\nLoaded {len(df):,} submissions")
     
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    # 1. Primary area distribution
-    print("\n1. Generating primary area distribution...")
-    area_counts = plot_primary_area_distribution(df, output_dir)
-    
-    print("\nTop 10 Primary Areas:")
-    for area, count in area_counts.head(10).items():
-        pct = (count / len(df)) * 100
-        print(f"  {area[:60]:<60} {count:>5,} ({pct:>5.1f}%)")
-    
     # Filter to submissions with reviews
     df_rated = df[df['num_reviews'] > 0].copy()
     print(f"\n{len(df_rated):,} submissions have reviews")
     
-    # 2. All confidence ratings
-    print("\n2. Generating all confidence ratings distribution...")
-    plot_all_confidence_ratings(df_rated, output_dir)
-    
-    # 3. All overall ratings
-    print("\n3. Generating all overall ratings distribution...")
-    plot_all_overall_ratings(df_rated, output_dir)
+    # Parse the stringified list columns once and share across plots
+    all_ratings = parse_list_column(df_rated['ratings'])
+    all_confidences = parse_list_column(df_rated['confidences'])
+    
+    # The four plots are independent, so render them in parallel worker processes
+    print("\nGenerating plots:")
+    print("  1. Primary area distribution")
+    print("  2. All confidence ratings distribution")
+    print("  3. All overall ratings distribution")
+    print("  4. Average confidence distribution")
+    with ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:
+        area_future = executor.submit(plot_primary_area_distribution, df[['primary_area']],
+                                      output_dir, dpi, fmt)
+        futures = [
+            executor.submit(plot_all_confidence_ratings, all_confidences, output_dir, dpi, fmt),
+            executor.submit(plot_all_overall_ratings, all_ratings, output_dir, dpi, fmt),
+            executor.submit(plot_avg_confidence_distribution, df_rated[['avg_confidence']],
+                            output_dir, dpi, fmt),
+        ]
+        area_counts = area_future.result()
+        for future in futures:
+            future.result()
     
-    # 4. Average confidence distribution
-    print("\n4. Generating average confidence distribution...")
-    plot_avg_confidence_distribution(df_rated, output_dir)
+    print("\nTop 10 Primary Areas:")
+    for area, count in area_counts.head(10).items():
+        pct = (count / len(df)) * 100
+        print(f"  {area[:60]:<60} {count:>5,} ({pct:>5.1f}%)")
     
     print("\n" + "="*60)
     print("✅ All plots generated successfully!")
@@ -340,6 +343,8 @@ if __name__ == "__main__":
     
     csv_file = sys.argv[1] if len(sys.argv) > 1 else 'data/ratings_data.csv'
     output_dir = sys.argv[2] if len(sys.argv) > 2 else 'outputs'
+    dpi = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_DPI
+    fmt = sys.argv[4] if len(sys.argv) > 4 else 'png'  # png, svg, webp, pdf
     
-    main(csv_file, output_dir)
+    main(csv_file, output_dir, dpi, fmt)
 
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Convert submissions_metadata.json into a compact Parquet cache
+Each submission is flattened to the fields the analysis scripts actually use,
+so later runs can skip JSON parsing entirely.
+
+Usage:
+    python3 src/cache_metadata.py <metadata_file> [parquet_file]
+
+Example:
+    python3 src/cache_metadata.py iclr_2026/iclr_2026_v1/submissions_metadata.json
+"""
+
+import os
+import re
+import sys
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from metadata_io import iter_meta
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Review fields stored per submission: (content key, column name)
+REVIEW_FIELDS = [
+    ('rating', 'ratings'),
+    ('confidence', 'confidences'),
+    ('soundness', 'soundness'),
+    ('presentation', 'presentation'),
+    ('contribution', 'contribution'),
+]
+
+# Leading integer of a score string ("6: Weak Accept" -> 6); the number must be
+# the whole text before the first ':' so that e.g. "3 good" stays unparsed
+LEADING_INT_PATTERN = r'\s*([+-]?\d+)\s*(?::|\Z)'
+_LEADING_INT_RE = re.compile(LEADING_INT_PATTERN)
+
+# Each score of a stringified list ("[6, 8]", "[5.5, -1]" or "['6: Weak Accept', ...]"):
+# a quoted element is read like LEADING_INT_PATTERN (group 'text'), a bare number
+# is read whole, fraction included (group 'number'), so that 5.5 reaches
+# valid_scores and is dropped there instead of being read as 5
+LIST_SCORE_PATTERN = (r"[\[,]\s*(?:(?P<quote>['\"])\s*(?P<text>[+-]?\d+)\s*(?::|(?P=quote))"
+                      r"|(?P<number>[+-]?\d+(?:\.\d+)?)\s*(?=[,\]]))")
+
+# Valid scores are whole numbers that fit the int8 score lists; anything else
+# (e.g. 5.5) is dropped rather than truncated
+SCORE_MIN = -128
+SCORE_MAX = 127
+
+# Submissions flattened per record batch while streaming the JSON
+BATCH_SIZE = 4096
+
+# Bumped whenever flattening changes, so caches built by older code are rebuilt
+CACHE_VERSION = b'2'
+
+SCHEMA = pa.schema(
+    [
+        ('number', pa.int32()),
+        ('id', pa.string()),
+        ('title', pa.string()),
+        ('primary_area', pa.string()),
+        ('venue', pa.string()),
+        ('venueid', pa.string()),
+    ]
+    + [(column, pa.list_(pa.int8())) for _, column in REVIEW_FIELDS],
+    metadata={b'cache_version': CACHE_VERSION},
+)
+
+
+def field_value(content, key, default=None):
+    """Unwrap an OpenReview field which may be stored as {'value': ...}"""
+    val = content.get(key, default)
+    if isinstance(val, dict):
+        val = val.get('value', default)
+    return val
+
+
+def parse_score(val):
+    """
+    Parse a score such as 6, {'value': 6} or '6: Weak Accept' into an int
+    Unwrapping and parsing happen in one call; returns None if the value is invalid
+    (e.g. '3 good', 5.5, NaN). Shared by every extractor, so they agree on what counts.
+    """
+    if isinstance(val, dict):
+        val = val.get('value')
+    if isinstance(val, str):
+        match = _LEADING_INT_RE.match(val)
+        if match is None:
+            return None
+        score = int(match.group(1))
+    else:
+        try:
+            score = int(val)
+        except (TypeError, ValueError, OverflowError):
+            return None
+        if score != val:
+            return None
+    return score if SCORE_MIN <= score <= SCORE_MAX else None
+
+
+def valid_scores(values):
+    """
+    Mask of the numeric scores parse_score would accept (whole and within int8)
+    Vectorized form for float arrays, where NaN marks a missing score
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return (values == np.trunc(values)) & (values >= SCORE_MIN) & (values <= SCORE_MAX)
+
+
+def flatten_submission(submission):
+    """Flatten one submission into a row matching SCHEMA"""
+    content = submission.get('content', {})
+    row = {
+        'number': submission.get('number'),
+        'id': submission.get('id'),
+        'title': field_value(content, 'title'),
+        'primary_area': field_value(content, 'primary_area', 'N/A'),
+        'venue': field_value(content, 'venue', ''),
+        'venueid': field_value(content, 'venueid', ''),
+    }
+    for _, column in REVIEW_FIELDS:
+        row[column] = []
+
+    for reply in submission.get('details', {}).get('replies', []):
+        reply_content = reply.get('content', {})
+
+        # Only replies with both rating and confidence are reviews
+        if 'rating' not in reply_content or 'confidence' not in reply_content:
+            continue
+
+        # Single pass: each score is unwrapped and parsed exactly once. Empty
+        # values (None, '', 0) are skipped, as the extractors always have
+        for field, column in REVIEW_FIELDS:
+            val = field_value(reply_content, field)
+            if val:
+                score = parse_score(val)
+                if score is not None:
+                    row[column].append(score)
+
+    return row
+
+
+def _reduce_segments(values, offsets, avg, low, high):
+    """Mean, min and max of every non-empty segment in a single pass (compiled with Numba)"""
+    for i in range(len(offsets) - 1):
+        start, end = offsets[i], offsets[i + 1]
+        if start == end:
+            continue
+        total = lo = hi = values[start]
+        for j in range(start + 1, end):
+            val = values[j]
+            total += val
+            if val < lo:
+                lo = val
+            if val > hi:
+                hi = val
+        avg[i] = total / (end - start)
+        low[i] = lo
+        high[i] = hi
+
+
+if numba is not None:
+    _reduce_segments = numba.njit(cache=True, boundscheck=False)(_reduce_segments)
+
+
+def segment_stats(values, offsets):
+    """
+    Per-segment count, mean, min and max of a flat value array
+    Segment i is values[offsets[i]:offsets[i + 1]]. Uses one compiled pass when
+    Numba is installed, NumPy segment reductions otherwise; either way no Python
+    loop over rows. Empty segments get NaN statistics.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+
+    avg = np.full(len(counts), np.nan)
+    low = np.full(len(counts), np.nan)
+    high = np.full(len(counts), np.nan)
+
+    if numba is not None:
+        _reduce_segments(values, offsets, avg, low, high)
+        return counts, avg, low, high
+
+    # Empty segments share their start with the next segment, so reducing over
+    # the non-empty starts only gives exactly one result per non-empty row
+    nonempty = counts > 0
+    if nonempty.any():
+        starts = offsets[:-1][nonempty]
+        avg[nonempty] = np.add.reduceat(values, starts) / counts[nonempty]
+        low[nonempty] = np.minimum.reduceat(values, starts)
+        high[nonempty] = np.maximum.reduceat(values, starts)
+
+    return counts, avg, low, high
+
+
+def list_column_stats(column):
+    """
+    Per-row count, mean, min and max of a list<int8> column
+    Reduces over the flat value buffer (see segment_stats). Rows with an empty
+    list get NaN statistics.
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    offsets = column.offsets.to_numpy()
+    return segment_stats(column.flatten().to_numpy(), offsets - offsets[0])
+
+
+def default_cache_path(metadata_file):
+    """Cache lives next to the metadata file as submissions.parquet"""
+    return os.path.join(os.path.dirname(metadata_file), 'submissions.parquet')
+
+
+def build_cache(metadata_file, cache_file=None):
+    """
+    Stream the metadata JSON and write the flattened Parquet cache
+    Rows are flushed every BATCH_SIZE submissions, so peak memory stays flat
+    """
+    cache_file = cache_file or default_cache_path(metadata_file)
+    with pq.ParquetWriter(cache_file, SCHEMA, compression='zstd') as writer:
+        rows = []
+        for submission in iter_meta(metadata_file):
+            rows.append(flatten_submission(submission))
+            if len(rows) >= BATCH_SIZE:
+                writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=SCHEMA))
+                rows = []
+        if rows:
+            writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=SCHEMA))
+    return cache_file
+
+
+def load_submissions_table(metadata_file, columns=None, filters=None):
+    """
+    Read the flattened submissions as a pyarrow Table
+    The cache is (re)built whenever it is missing, older than the JSON file, or
+    written by an older flattening (CACHE_VERSION).
+    """
+    cache_file = default_cache_path(metadata_file)
+    if (not os.path.exists(cache_file)
+            or os.path.getmtime(cache_file) < os.path.getmtime(metadata_file)
+            or (pq.read_schema(cache_file).metadata or {}).get(b'cache_version') != CACHE_VERSION):
+        build_cache(metadata_file, cache_file)
+    return pq.read_table(cache_file, columns=columns, filters=filters)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 src/cache_metadata.py <metadata_file> [parquet_file]")
+        sys.exit(1)
+
+    metadata_file = sys.argv[1]
+    cache_file = sys.argv[2] if len(sys.argv) > 2 else None
+
+    if not os.path.exists(metadata_file):
+        print(f"❌ Error: File not found: {metadata_file}")
+        sys.exit(1)
+
+    print(f"Building Parquet cache from {metadata_file}...")
+    cache_file = build_cache(metadata_file, cache_file)
+    print(f"✅ Saved: {cache_file}")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Shared decision classifiers for OpenReview venue/venueid strings
+A conference has only a handful of distinct venue/venueid pairs, so both
+ladders are memoized: each distinct pair is classified once per run.
+"""
+
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def classify_decision(venue: str, venueid: str, conference: str = 'ICLR') -> tuple:
+    """
+    Decision ladder used by the scrapers, in order of specificity
+    Returns (decision, decision_type), e.g. ('Accept (Oral)', 'Accept'), or
+    ('Unknown', 'Unknown') when no rung matches. conference is the venue prefix
+    of the fallback rungs ("Submitted to <conference>" means rejected; any other
+    venue naming it without "Submitted"/"Withdrawn" is an accepted poster).
+    """
+    # Check for Withdrawn (always check first)
+    if 'Withdrawn' in venueid or 'Withdrawn' in venue:
+        return ('Withdrawn', 'Withdrawn')
+
+    # Check for Desk Reject
+    elif 'Desk_Rejected' in venueid or 'Desk Reject' in venue:
+        return ('Desk Reject', 'Reject')
+
+    # Check for Reject (including "Submitted to ICLR YYYY" which means rejected)
+    elif 'Rejected_Submission' in venueid or 'Rejected' in venueid or \
+         venue.startswith(f'Submitted to {conference}'):
+        return ('Reject', 'Reject')
+
+    # Check for Accept - Oral (most specific, check first)
+    elif 'Oral' in venueid or 'Oral' in venue:
+        return ('Accept (Oral)', 'Accept')
+
+    # Check for Accept - Spotlight
+    elif 'Spotlight' in venueid or 'Spotlight' in venue:
+        return ('Accept (Spotlight)', 'Accept')
+
+    # Check for Accept - Poster
+    elif 'Poster' in venueid or 'Poster' in venue:
+        return ('Accept (Poster)', 'Accept')
+
+    # Fallback: if venue contains "ICLR YYYY" but not "Submitted" or "Withdrawn",
+    # it's likely an accepted paper (assume Poster if type unclear)
+    elif conference in venue and 'Submitted' not in venue and 'Withdrawn' not in venue:
+        return ('Accept (Poster)', 'Accept')
+
+    return ('Unknown', 'Unknown')
+
+
+@functools.lru_cache(maxsize=None)
+def classify_ratings_decision(venue: str, venueid: str) -> tuple:
+    """
+    Decision ladder of extract_ratings.py, with its own labels
+    Returns (decision, decision_type), e.g. ('Accept', 'Oral'). Matching is
+    case-insensitive and acceptance is read from the venue only; a venue with no
+    decision yet ("Submitted to ICLR 2026") is ('Pending', 'Pending'), which
+    extract_ratings uses to detect whether decisions are posted at all.
+    """
+    venue_str = venue.lower()
+    venueid_str = venueid.lower()
+
+    # Check for withdrawn
+    if "withdrawn" in venue_str or "withdrawn" in venueid_str:
+        return "Withdrawn", "Withdrawn"
+
+    # Check for desk reject
+    if "desk reject" in venue_str or "desk_rejected" in venueid_str:
+        return "Reject", "Desk Reject"
+
+    # Check for acceptance types (check in order of specificity)
+    if "oral" in venue_str:
+        return "Accept", "Oral"
+    elif "spotlight" in venue_str:
+        return "Accept", "Spotlight"
+    elif "poster" in venue_str or ("conference" in venue_str and "202" in venue_str):
+        # "ICLR 202X Conference" typically means accepted as poster
+        return "Accept", "Poster"
+
+    # Check for rejection
+    if "reject" in venue_str or "rejected" in venueid_str:
+        return "Reject", "Reject"
+
+    # No decision found
+    return "Pending", "Pending"
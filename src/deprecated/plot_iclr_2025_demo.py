@@ -3,48 +3,79 @@
 Generate simple visualizations for ICLR 2025 demo data (10 samples)
 """
 
+import os
+import sys
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # File output only, no GUI backend
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from pathlib import Path
-import ast
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analyze_distributions import parse_list_column
 
 # Set style
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
+# Output resolution for the demo plots
+DPI = 150
+
+# Fast PNG encoding: light zlib compression, no extra optimize pass
+PNG_OPTIONS = {'compress_level': 1, 'optimize': False}
+
+# Only the columns the plots read, with compact dtypes (the score lists other
+# than confidences are never parsed)
+COLUMN_DTYPES = {
+    'primary_area': 'category',
+    'decision': 'category',
+    'decision_type': 'category',
+    'num_reviews': 'int8',
+    'avg_rating': 'float32',
+    'confidences': object,
+}
+
+
+def _save_plot(fig, output_dir, filename):
+    """
+    Lay out the shared figure and save it to output_dir/filename
+    """
+    fig.tight_layout()
+    output_file = Path(output_dir) / filename
+    fig.savefig(output_file, dpi=DPI, facecolor='white', pil_kwargs=PNG_OPTIONS)
+    print(f"✓ Saved: {output_file}")
+
 
-def plot_rating_distribution(csv_file='iclr_2025/iclr_2025_demo/ratings_data.csv',
-                              output_dir='outputs/iclr_2025'):
+def _bar_with_labels(ax, x, counts, labels, label_offset, **bar_kwargs):
+    """
+    Draw vertical bars with a bold text label just above each bar
+    """
+    bars = ax.bar(x, counts, edgecolor='black', **bar_kwargs)
+    for xi, count, label in zip(x, counts, labels):
+        ax.text(xi, count + label_offset, label,
+               ha='center', va='bottom', fontsize=11, fontweight='bold')
+    return bars
+
+
+def plot_rating_distribution(rated_df, ax, output_dir='outputs/iclr_2025'):
     """
     Create rating distribution plot for demo data
     """
-    # Load data
-    df = pd.read_csv(csv_file)
-    rated_df = df[df['avg_rating'].notna()].copy()
-    
-    print(f"Loaded {len(rated_df)} submissions with ratings")
-    
-    # Create output directory
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    
     # Calculate statistics
     mean_rating = rated_df['avg_rating'].mean()
     median_rating = rated_df['avg_rating'].median()
     std_rating = rated_df['avg_rating'].std()
     
     # Create figure
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # Create histogram
-    n, bins, patches = ax.hist(rated_df['avg_rating'], bins=8, 
-                                edgecolor='black', linewidth=1.2, alpha=0.8)
+    fig = ax.figure
     
-    # Color gradient
-    colors = plt.cm.RdYlGn(np.linspace(0.2, 0.8, len(patches)))
-    for patch, color in zip(patches, colors):
-        patch.set_facecolor(color)
+    # Create histogram with a color gradient (one vectorized bar call)
+    counts, edges = np.histogram(rated_df['avg_rating'].to_numpy(), bins=8)
+    colors = plt.cm.RdYlGn(np.linspace(0.2, 0.8, len(counts)))
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color=colors,
+           edgecolor='black', linewidth=1.2, alpha=0.8)
     
     # Add mean and median lines
     ax.axvline(mean_rating, color='red', linestyle='--', linewidth=2.5,
@@ -62,23 +93,16 @@ def plot_rating_distribution(csv_file='iclr_2025/iclr_2025_demo/ratings_data.csv
     ax.legend(fontsize=12, loc='upper right')
     ax.grid(True, alpha=0.3, linestyle='--')
     
-    plt.tight_layout()
-    
-    output_file = Path(output_dir) / 'demo_rating_distribution.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file}")
-    plt.close()
+    _save_plot(fig, output_dir, 'demo_rating_distribution.png')
 
 
-def plot_area_distribution(csv_file='iclr_2025/iclr_2025_demo/ratings_data.csv',
-                           output_dir='outputs/iclr_2025'):
+def plot_area_distribution(df, ax, output_dir='outputs/iclr_2025'):
     """
     Plot primary area distribution
     """
-    df = pd.read_csv(csv_file)
     area_counts = df['primary_area'].value_counts()
     
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig = ax.figure
     
     # Create horizontal bar chart
     bars = ax.barh(range(len(area_counts)), area_counts.values,
@@ -100,118 +124,79 @@ def plot_area_distribution(csv_file='iclr_2025/iclr_2025_demo/ratings_data.csv',
     ax.invert_yaxis()
     ax.grid(True, alpha=0.3, linestyle='--', axis='x')
     
-    plt.tight_layout()
-    
-    output_file = Path(output_dir) / 'demo_area_distribution.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file}")
-    plt.close()
+    _save_plot(fig, output_dir, 'demo_area_distribution.png')
 
 
-def plot_confidence_distribution(csv_file='iclr_2025/iclr_2025_demo/ratings_data.csv',
-                                 output_dir='outputs/iclr_2025'):
+def plot_confidence_distribution(confidence_counts, ax, output_dir='outputs/iclr_2025'):
     """
     Plot reviewer confidence distribution
+    
+    Args:
+        confidence_counts: (unique_vals, counts) of all individual confidence ratings
     """
-    df = pd.read_csv(csv_file)
-    
-    # Parse all confidence ratings
-    all_confidences = []
-    for conf_str in df['confidences']:
-        try:
-            confs = ast.literal_eval(conf_str)
-            for c in confs:
-                if isinstance(c, (int, float)):
-                    all_confidences.append(c)
-                elif isinstance(c, str):
-                    try:
-                        all_confidences.append(int(c.split(':')[0]))
-                    except:
-                        pass
-        except:
-            pass
-    
-    if not all_confidences:
+    unique_vals, counts = confidence_counts
+    
+    if len(unique_vals) == 0:
         print("⚠ No confidence data to plot")
         return
     
-    all_confidences = np.array(all_confidences)
-    unique_vals, counts = np.unique(all_confidences, return_counts=True)
+    total_reviews = counts.sum()
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = ax.figure
     
-    # Create bar chart
-    bars = ax.bar(unique_vals, counts, color='coral', 
-                   edgecolor='black', linewidth=1, alpha=0.85, width=0.6)
-    
-    # Add count labels
-    for val, count in zip(unique_vals, counts):
-        ax.text(val, count + 0.2, f'{count}',
-               ha='center', va='bottom', fontsize=11, fontweight='bold')
+    # Create bar chart with count labels
+    _bar_with_labels(ax, unique_vals, counts, [f'{count}' for count in counts], 0.2,
+                     color='coral', linewidth=1, alpha=0.85, width=0.6)
     
     # Labels
     ax.set_xlabel('Confidence Level', fontsize=14, fontweight='bold')
     ax.set_ylabel('Number of Reviews', fontsize=14, fontweight='bold')
     ax.set_title(f'ICLR 2025 Demo: Reviewer Confidence Distribution\n'
-                 f'Total Reviews: {len(all_confidences)} | '
-                 f'Mean Confidence: {all_confidences.mean():.2f}',
+                 f'Total Reviews: {total_reviews} | '
+                 f'Mean Confidence: {(unique_vals * counts).sum() / total_reviews:.2f}',
                  fontsize=16, fontweight='bold', pad=15)
     
     ax.set_xticks(unique_vals)
     ax.grid(True, alpha=0.3, linestyle='--', axis='y')
     
-    plt.tight_layout()
-    
-    output_file = Path(output_dir) / 'demo_confidence_distribution.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file}")
-    plt.close()
+    _save_plot(fig, output_dir, 'demo_confidence_distribution.png')
 
 
-def plot_reviews_per_paper(csv_file='iclr_2025/iclr_2025_demo/ratings_data.csv',
-                           output_dir='outputs/iclr_2025'):
+def plot_reviews_per_paper(review_counts, ax, output_dir='outputs/iclr_2025'):
     """
     Plot distribution of reviews per paper
-    """
-    df = pd.read_csv(csv_file)
-    review_counts = df['num_reviews'].value_counts().sort_index()
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    Args:
+        review_counts: Submissions per number of reviews, sorted by number of reviews
+    """
+    avg_reviews = (review_counts.index.to_numpy() * review_counts.to_numpy()).sum() / review_counts.sum()
     
-    bars = ax.bar(review_counts.index, review_counts.values,
-                   color='mediumseagreen', edgecolor='black', 
-                   linewidth=1, alpha=0.85, width=0.6)
+    fig = ax.figure
     
-    # Add labels
-    for num_reviews, count in zip(review_counts.index, review_counts.values):
-        ax.text(num_reviews, count + 0.15, f'{count}',
-               ha='center', va='bottom', fontsize=11, fontweight='bold')
+    _bar_with_labels(ax, review_counts.index, review_counts.values,
+                     [f'{count}' for count in review_counts.values], 0.15,
+                     color='mediumseagreen', linewidth=1, alpha=0.85, width=0.6)
     
     ax.set_xlabel('Number of Reviews', fontsize=14, fontweight='bold')
     ax.set_ylabel('Number of Submissions', fontsize=14, fontweight='bold')
     ax.set_title(f'ICLR 2025 Demo: Reviews per Submission\n'
-                 f'Average: {df["num_reviews"].mean():.2f} reviews/paper',
+                 f'Average: {avg_reviews:.2f} reviews/paper',
                  fontsize=16, fontweight='bold', pad=15)
     
     ax.set_xticks(review_counts.index)
     ax.grid(True, alpha=0.3, linestyle='--', axis='y')
     
-    plt.tight_layout()
-    
-    output_file = Path(output_dir) / 'demo_reviews_per_paper.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file}")
-    plt.close()
+    _save_plot(fig, output_dir, 'demo_reviews_per_paper.png')
 
 
-def plot_decision_distribution(csv_file='iclr_2025/iclr_2025_demo/ratings_data.csv',
-                                output_dir='outputs/iclr_2025'):
+def plot_decision_distribution(decision_counts, ax, output_dir='outputs/iclr_2025'):
     """
     Plot decision distribution (Accept/Reject/Withdrawn breakdown)
-    """
-    df = pd.read_csv(csv_file)
-    decision_counts = df['decision'].value_counts()
     
+    Args:
+        decision_counts: Submissions per decision, most common first
+    """
+
     # Define colors for each decision type
     colors_map = {
         'Accept (Oral)': '#1a9850',
@@ -223,17 +208,13 @@ def plot_decision_distribution(csv_file='iclr_2025/iclr_2025_demo/ratings_data.c
     }
     colors = [colors_map.get(d, 'gray') for d in decision_counts.index]
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    bars = ax.bar(range(len(decision_counts)), decision_counts.values,
-                   color=colors, edgecolor='black', linewidth=1.2, alpha=0.9)
+    fig = ax.figure
     
-    # Add labels
-    total = len(df)
-    for i, (decision, count) in enumerate(zip(decision_counts.index, decision_counts.values)):
-        pct = (count / total) * 100
-        ax.text(i, count + 0.15, f'{count}\n({pct:.1f}%)',
-               ha='center', va='bottom', fontsize=11, fontweight='bold')
+    # Bars labelled with count and share of all submissions
+    total = decision_counts.sum()
+    _bar_with_labels(ax, range(len(decision_counts)), decision_counts.values,
+                     [f'{count}\n({count / total * 100:.1f}%)' for count in decision_counts.values],
+                     0.15, color=colors, linewidth=1.2, alpha=0.9)
     
     ax.set_xticks(range(len(decision_counts)))
     ax.set_xticklabels(decision_counts.index, fontsize=12, rotation=15, ha='right')
@@ -243,22 +224,13 @@ def plot_decision_distribution(csv_file='iclr_2025/iclr_2025_demo/ratings_data.c
     
     ax.grid(True, alpha=0.3, linestyle='--', axis='y')
     
-    plt.tight_layout()
-    
-    output_file = Path(output_dir) / 'demo_decision_distribution.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file}")
-    plt.close()
+    _save_plot(fig, output_dir, 'demo_decision_distribution.png')
 
 
-def plot_rating_by_decision(csv_file='iclr_2025/iclr_2025_demo/ratings_data.csv',
-                            output_dir='outputs/iclr_2025'):
+def plot_rating_by_decision(df_rated, ax, output_dir='outputs/iclr_2025'):
     """
     Plot rating distributions grouped by decision type
     """
-    df = pd.read_csv(csv_file)
-    df_rated = df[df['avg_rating'].notna()].copy()
-    
     # Group by decision type
     decision_types = ['Accept', 'Reject', 'Withdrawn']
     data_by_decision = []
@@ -275,7 +247,7 @@ def plot_rating_by_decision(csv_file='iclr_2025/iclr_2025_demo/ratings_data.csv'
         print("⚠ No rating data to plot by decision")
         return
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = ax.figure
     
     # Create box plot
     bp = ax.boxplot(data_by_decision, labels=labels, patch_artist=True,
@@ -301,12 +273,19 @@ def plot_rating_by_decision(csv_file='iclr_2025/iclr_2025_demo/ratings_data.csv'
                 fontsize=16, fontweight='bold', pad=15)
     ax.grid(True, alpha=0.3, linestyle='--', axis='y')
     
-    plt.tight_layout()
-    
-    output_file = Path(output_dir) / 'demo_rating_by_decision.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file}")
-    plt.close()
+    _save_plot(fig, output_dir, 'demo_rating_by_decision.png')
+
+
+# Plot table: (plotter, dataset name, figure size); main() builds the datasets
+# once and draws every entry on the same reused figure
+PLOTS = [
+    (plot_rating_distribution, 'rated', (10, 6)),
+    (plot_area_distribution, 'all', (12, 6)),
+    (plot_confidence_distribution, 'confidence_counts', (10, 6)),
+    (plot_reviews_per_paper, 'review_counts', (10, 6)),
+    (plot_decision_distribution, 'decision_counts', (10, 6)),
+    (plot_rating_by_decision, 'rated', (10, 6)),
+]
 
 
 def main():
@@ -321,22 +300,44 @@ def main():
     csv_file = 'iclr_2025/iclr_2025_demo/ratings_data.csv'
     output_dir = 'outputs/iclr_2025'
     
+    # Load data once and share it across all plots (typed Parquet copy if present)
+    parquet_file = os.path.splitext(csv_file)[0] + '.parquet'
+    if os.path.exists(parquet_file):
+        df = pd.read_parquet(parquet_file, columns=list(COLUMN_DTYPES)).astype(COLUMN_DTYPES)
+    else:
+        df = pd.read_csv(csv_file, usecols=list(COLUMN_DTYPES), dtype=COLUMN_DTYPES)
+    rated_df = df[df['avg_rating'].notna()].copy()
+    
+    # Create output directory
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
     print("Generating plots...")
     print()
+    print(f"Loaded {len(rated_df)} submissions with ratings")
+    
+    # Count each categorical column once, up front; the plotters only draw
+    # (confidences are parsed in one vectorized pass, handles "3" and "3: ...")
+    datasets = {
+        'all': df,
+        'rated': rated_df,
+        'confidence_counts': np.unique(parse_list_column(df['confidences']), return_counts=True),
+        'review_counts': df['num_reviews'].value_counts().sort_index(),
+        'decision_counts': df['decision'].value_counts(),
+    }
     
-    # Generate all plots
-    plot_rating_distribution(csv_file, output_dir)
-    plot_area_distribution(csv_file, output_dir)
-    plot_confidence_distribution(csv_file, output_dir)
-    plot_reviews_per_paper(csv_file, output_dir)
-    plot_decision_distribution(csv_file, output_dir)
-    plot_rating_by_decision(csv_file, output_dir)
+    # Generate all plots on one reused figure (cleared between plots)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for plot_fn, dataset, figsize in PLOTS:
+        ax.clear()
+        fig.set_size_inches(figsize)
+        plot_fn(datasets[dataset], ax, output_dir)
+    plt.close(fig)
     
     print()
     print("="*60)
     print("✅ All demo visualizations complete!")
     print(f"📁 Saved to: {output_dir}/")
-    print(f"📊 Generated 6 plots including decision analysis")
+    print(f"📊 Generated {len(PLOTS)} plots including decision analysis")
     print("="*60)
 
 
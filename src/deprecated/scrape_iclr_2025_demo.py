@@ -4,50 +4,94 @@ Demo script to scrape 10 ICLR 2025 conference submissions from OpenReview
 For demonstration purposes only - fetches a small sample
 """
 
-import json
+import argparse
+import hashlib
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from tqdm import tqdm
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metadata import field_value, parse_score, list_column_stats
+from decisions import classify_decision
+from metadata_io import load_meta, save_meta
+
+# Reuse cached API responses younger than this (seconds)
+CACHE_TTL = 24 * 60 * 60
+
+# Review score columns, kept as lists in the DataFrame
+SCORE_COLUMNS = ['ratings', 'confidences', 'soundness', 'presentation', 'contribution']
+
+# Venue prefix of the decision ladder's fallback rungs
+CONFERENCE = 'ICLR 2025'
 
 def get_sample_submissions(venue_id: str = "ICLR.cc/2025/Conference", 
                           output_dir: str = None, 
-                          limit: int = 10) -> List[Dict]:
+                          limit: int = 10,
+                          use_cache: bool = True) -> List[Dict]:
     """
     Fetch sample submissions for ICLR 2025 using OpenReview API
+    Responses are cached in output_dir for CACHE_TTL seconds (use_cache=False to refetch)
     """
+    if limit <= 0:
+        return []
+    
+    cache_path = None
+    if output_dir:
+        cache_key = hashlib.sha1(f"{venue_id}|{limit}|0".encode()).hexdigest()[:16]
+        cache_path = os.path.join(output_dir, f'.cache_{cache_key}.json')
+    
+    if (use_cache and cache_path and os.path.exists(cache_path)
+            and time.time() - os.path.getmtime(cache_path) < CACHE_TTL):
+        all_submissions = load_meta(cache_path)
+        print(f"✓ Loaded {len(all_submissions)} submissions from cache ({cache_path})")
+        return all_submissions
+    
     base_url = "https://api2.openreview.net"
     
     # Get submissions
     submissions_url = f"{base_url}/notes"
+    page_size = min(limit, 1000)  # API maximum per request
     params = {
         "invitation": f"{venue_id}/-/Submission",
         "details": "replies,invitation",
-        "limit": limit,
-        "offset": 0
+        "limit": page_size,
     }
     
     all_submissions = []
     
     print(f"Fetching {limit} sample submissions from {venue_id}...")
     
-    try:
-        response = requests.get(submissions_url, params=params, timeout=30)
+    # One pooled keep-alive connection shared by all page requests
+    session = requests.Session()
+    
+    def fetch_page(offset):
+        response = session.get(submissions_url, params={**params, "offset": offset}, timeout=30)
         response.raise_for_status()
-        data = response.json()
-        
-        notes = data.get('notes', [])
-        all_submissions.extend(notes)
+        return response.json().get('notes', [])
+    
+    try:
+        # Pages are independent, so fetch them concurrently (results keep offset order)
+        offsets = list(range(0, limit, page_size))
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(offsets)))) as executor:
+            for notes in executor.map(fetch_page, offsets):
+                all_submissions.extend(notes)
+        all_submissions = all_submissions[:limit]
         print(f"✓ Fetched {len(all_submissions)} submissions")
         
         # Save immediately
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
             submissions_file = os.path.join(output_dir, 'submissions_metadata.json')
-            with open(submissions_file, 'w') as f:
-                json.dump(all_submissions, f, indent=2)
+            save_meta(submissions_file, all_submissions)
+            save_meta(cache_path, all_submissions)
             print(f"✓ Saved to {submissions_file}")
         
     except Exception as e:
@@ -58,72 +102,50 @@ def get_sample_submissions(venue_id: str = "ICLR.cc/2025/Conference",
     return all_submissions
 
 
+def classify_decisions(venue: pd.Series, venueid: pd.Series):
+    """
+    Determine decision status for all submissions at once from venue/venueid
+    Rungs are checked in order of specificity, first match wins (decisions.classify_decision)
+    """
+    # Only a handful of distinct venue/venueid pairs exist, so each one is
+    # classified once and the result is broadcast back through the codes
+    codes, keys = pd.factorize(venue + '\x00' + venueid)
+    labels = [classify_decision(*key.split('\x00', 1), CONFERENCE) for key in keys]
+    decision = np.array([d for d, _ in labels], dtype=object)[codes]
+    decision_type = np.array([t for _, t in labels], dtype=object)[codes]
+    return decision, decision_type
+
+
 def extract_submission_data(submissions: List[Dict]) -> pd.DataFrame:
     """
     Extract key information from submissions including decision status
     """
-    data = []
+    n = len(submissions)
+    if n == 0:
+        return pd.DataFrame()
+    
+    # Preallocated columns, filled by index (no per-row dicts)
+    submission_ids = np.empty(n, dtype=object)
+    numbers = np.empty(n, dtype=object)
+    primary_areas = np.empty(n, dtype=object)
+    venues = np.empty(n, dtype=object)
+    venueids = np.empty(n, dtype=object)
+    num_reviews = np.zeros(n, dtype=np.int8)
+    score_lists = {column: np.empty(n, dtype=object) for column in SCORE_COLUMNS}
     
-    for submission in tqdm(submissions, desc="Processing submissions"):
+    # Throttle progress updates: at most once a second / every 1% of submissions
+    progress = tqdm(submissions, desc="Processing submissions",
+                    mininterval=1.0, miniters=max(1, n // 100))
+    for i, submission in enumerate(progress):
         submission_id = submission.get('id')
         number = submission.get('number', None)
         content = submission.get('content', {})
         
-        # Get primary area
-        primary_area = content.get('primary_area', {})
-        if isinstance(primary_area, dict):
-            primary_area = primary_area.get('value', 'N/A')
+        primary_areas[i] = field_value(content, 'primary_area', 'N/A')
         
-        # Extract decision from venue/venueid
-        venue = content.get('venue', {})
-        if isinstance(venue, dict):
-            venue = venue.get('value', '')
-        
-        venueid = content.get('venueid', {})
-        if isinstance(venueid, dict):
-            venueid = venueid.get('value', '')
-        
-        # Determine decision status
-        # Check in order of specificity: Oral > Spotlight > Poster > Reject > Withdrawn
-        decision = 'Unknown'
-        decision_type = 'Unknown'
-        
-        # Check for Withdrawn
-        if 'Withdrawn' in venueid or 'Withdrawn' in venue:
-            decision = 'Withdrawn'
-            decision_type = 'Withdrawn'
-        
-        # Check for Desk Reject
-        elif 'Desk_Rejected' in venueid or 'Desk Reject' in venue:
-            decision = 'Desk Reject'
-            decision_type = 'Reject'
-        
-        # Check for Reject (including "Submitted to ICLR 2025" which means rejected)
-        elif 'Rejected_Submission' in venueid or 'Rejected' in venueid or \
-             'Submitted to ICLR 2025' == venue:
-            decision = 'Reject'
-            decision_type = 'Reject'
-        
-        # Check for Accept - Oral (most specific, check first)
-        elif 'Oral' in venueid or 'ICLR 2025 Oral' in venue:
-            decision = 'Accept (Oral)'
-            decision_type = 'Accept'
-        
-        # Check for Accept - Spotlight
-        elif 'Spotlight' in venueid or 'ICLR 2025 Spotlight' in venue:
-            decision = 'Accept (Spotlight)'
-            decision_type = 'Accept'
-        
-        # Check for Accept - Poster
-        elif 'Poster' in venueid or 'ICLR 2025 Poster' in venue:
-            decision = 'Accept (Poster)'
-            decision_type = 'Accept'
-        
-        # Fallback: if venue contains "ICLR 2025" but not "Submitted" or "Withdrawn", 
-        # it's likely an accepted paper (assume Poster if type unclear)
-        elif 'ICLR 2025' in venue and 'Submitted' not in venue and 'Withdrawn' not in venue:
-            decision = 'Accept (Poster)'
-            decision_type = 'Accept'
+        # Decision is derived from venue/venueid after the loop
+        venues[i] = field_value(content, 'venue', '')
+        venueids[i] = field_value(content, 'venueid', '')
         
         # Extract reviews from replies
         replies = submission.get('details', {}).get('replies', [])
@@ -139,72 +161,65 @@ def extract_submission_data(submissions: List[Dict]) -> pd.DataFrame:
             
             # Check if this is a review
             if 'rating' in reply_content and 'confidence' in reply_content:
-                # Extract rating
-                rating_val = reply_content['rating']
-                if isinstance(rating_val, dict):
-                    rating_val = rating_val.get('value')
-                if rating_val:
-                    ratings.append(rating_val)
-                
-                # Extract confidence
-                conf_val = reply_content['confidence']
-                if isinstance(conf_val, dict):
-                    conf_val = conf_val.get('value')
-                if conf_val:
-                    confidences.append(conf_val)
-                
-                # Extract other scores
-                for field, target_list in [('soundness', soundness_scores),
+                # Extract rating, confidence and other scores
+                for field, target_list in [('rating', ratings),
+                                          ('confidence', confidences),
+                                          ('soundness', soundness_scores),
                                           ('presentation', presentation_scores),
                                           ('contribution', contribution_scores)]:
-                    if field in reply_content:
-                        val = reply_content[field]
-                        if isinstance(val, dict):
-                            val = val.get('value')
-                        if val:
-                            target_list.append(val)
+                    val = field_value(reply_content, field)
+                    if val:
+                        target_list.append(val)
         
-        # Calculate averages
-        avg_rating = None
-        if ratings:
-            # Parse numeric values from ratings
-            numeric_ratings = []
-            for r in ratings:
-                if isinstance(r, (int, float)):
-                    numeric_ratings.append(r)
-                elif isinstance(r, str):
-                    try:
-                        # Try to extract number (format might be "5: Marginally below...")
-                        numeric_ratings.append(int(r.split(':')[0]))
-                    except:
-                        pass
-            if numeric_ratings:
-                avg_rating = sum(numeric_ratings) / len(numeric_ratings)
-        
-        record = {
-            'submission_id': submission_id,
-            'submission_number': number,
-            'primary_area': primary_area,
-            'decision': decision,
-            'decision_type': decision_type,
-            'num_reviews': len(ratings),
-            'ratings': str(ratings),
-            'confidences': str(confidences),
-            'soundness': str(soundness_scores),
-            'presentation': str(presentation_scores),
-            'contribution': str(contribution_scores),
-            'avg_rating': avg_rating
-        }
-        
-        data.append(record)
+        submission_ids[i] = submission_id
+        numbers[i] = number
+        num_reviews[i] = len(ratings)
+        for column, values in zip(SCORE_COLUMNS, [ratings, confidences, soundness_scores,
+                                                  presentation_scores, contribution_scores]):
+            score_lists[column][i] = values
     
-    return pd.DataFrame(data)
+    # Parse numeric values from ratings (format might be "5: Marginally below...") into
+    # one flat list<int8> buffer, then average each submission's segment in a single pass
+    parsed_ratings = pa.array([[s for s in map(parse_score, values) if s is not None]
+                               for values in score_lists['ratings']], type=pa.list_(pa.int8()))
+    _, avg_ratings, _, _ = list_column_stats(parsed_ratings)
+    
+    df = pd.DataFrame({
+        'submission_id': submission_ids,
+        'submission_number': numbers,
+        'primary_area': primary_areas,
+        'num_reviews': num_reviews,
+        **score_lists,
+        'avg_rating': avg_ratings,
+    }).infer_objects()
+    decision, decision_type = classify_decisions(pd.Series(venues, dtype=str),
+                                                 pd.Series(venueids, dtype=str))
+    df.insert(3, 'decision', decision)
+    df.insert(4, 'decision_type', decision_type)
+    return df
+
+
+def save_parquet(df: pd.DataFrame, output_file: str) -> None:
+    """
+    Save the data with review scores as typed list<int8> columns
+    Readers get ready-to-use arrays instead of stringified lists
+    """
+    table = pa.Table.from_pandas(df.drop(columns=SCORE_COLUMNS), preserve_index=False)
+    for column in SCORE_COLUMNS:
+        scores = [[s for s in map(parse_score, values) if s is not None] for values in df[column]]
+        table = table.append_column(column, pa.array(scores, type=pa.list_(pa.int8())))
+    pq.write_table(table.select(list(df.columns)), output_file)
 
 
 def main():
     """
     Main function to scrape demo ICLR 2025 data
     """
+    parser = argparse.ArgumentParser(description='Scrape a small ICLR 2025 demo sample')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore cached API responses and refetch')
+    args = parser.parse_args()
+    
     print("="*60)
     print("ICLR 2025 Demo Data Scraper")
     print("Fetching 10 sample submissions")
@@ -218,7 +233,8 @@ def main():
     os.makedirs(output_dir, exist_ok=True)
     
     # Fetch submissions
-    submissions = get_sample_submissions(venue_id, output_dir, limit=10)
+    submissions = get_sample_submissions(venue_id, output_dir, limit=10,
+                                         use_cache=not args.no_cache)
     
     if not submissions:
         print("❌ No submissions fetched. Exiting.")
@@ -228,10 +244,11 @@ def main():
     print("\nExtracting ratings and metadata...")
     df = extract_submission_data(submissions)
     
-    # Save to CSV
+    # Save to CSV (list columns are written as "[...]") plus a typed Parquet copy
     output_file = os.path.join(output_dir, 'ratings_data.csv')
     df.to_csv(output_file, index=False)
-    print(f"\n✅ Data saved to {output_file}")
+    save_parquet(df, os.path.join(output_dir, 'ratings_data.parquet'))
+    print(f"\n✅ Data saved to {output_file} (+ ratings_data.parquet)")
     print(f"Total submissions collected: {len(df)}")
     
     # Print summary statistics
@@ -5,228 +5,179 @@ Collects: submission number, ratings, confidence, decisions (Oral/Spotlight/Post
 Uses same optimizations as ICLR 2026 scraper: batch processing, retry logic, checkpoints
 """
 
-import json
-import time
-import requests
-from typing import List, Dict
+import functools
+from typing import Callable, List, Dict, Tuple
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from tqdm import tqdm
 import os
+import sys
 
-def get_all_submissions(venue_id: str = "ICLR.cc/2025/Conference", output_dir: str = None) -> List[Dict]:
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metadata import parse_score
+from decisions import classify_decision
+from openreview_client import fetch_all_notes
+
+# Review score fields, stored per submission as rows of NaN-padded matrices
+SCORE_FIELDS = ['rating', 'confidence', 'soundness', 'presentation', 'contribution']
+
+# CSV column names for each score field
+SCORE_COLUMNS = ['ratings', 'confidences', 'soundness', 'presentation', 'contribution']
+
+# Minimum matrix width (reviews per submission); wider if a submission has more
+MAX_REVIEWS = 8
+
+
+def make_decision_matcher(year: int) -> Callable[[str, str], Tuple[str, str]]:
     """
-    Fetch all submissions for ICLR 2025 using OpenReview API with retry logic
-    Saves incrementally after each batch if output_dir is provided
+    Build a (venue, venueid) -> (decision, decision_type) matcher for one ICLR year
+    The shared memoized ladder (decisions.classify_decision) with its venue
+    prefix fixed to "ICLR <year>".
     """
-    base_url = "https://api2.openreview.net"
-    
-    # Get all submissions
-    submissions_url = f"{base_url}/notes"
-    params = {
-        "invitation": f"{venue_id}/-/Submission",
-        "details": "replies,invitation",
-        "limit": 500,  # Smaller batches to avoid timeouts
-        "offset": 0
-    }
-    
-    all_submissions = []
-    
-    print(f"Fetching submissions from {venue_id}...")
-    
-    while True:
-        retry_count = 0
-        success = False
-        
-        while not success:
-            try:
-                response = requests.get(submissions_url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                notes = data.get('notes', [])
-                if not notes:
-                    return all_submissions
-                    
-                all_submissions.extend(notes)
-                print(f"Fetched {len(all_submissions)} submissions so far...")
-                
-                # Save incrementally after each batch
-                if output_dir:
-                    submissions_file = os.path.join(output_dir, 'submissions_metadata.json')
-                    with open(submissions_file, 'w') as f:
-                        json.dump(all_submissions, f, indent=2)
-                    print(f"  ✓ Saved to {submissions_file}")
-                
-                # Check if there are more results
-                if len(notes) < params['limit']:
-                    print(f"✓ Reached end of submissions")
-                    return all_submissions
-                
-                params['offset'] += params['limit']
-                time.sleep(5)  # Wait between successful batches
-                success = True
-                
-            except Exception as e:
-                retry_count += 1
-                print(f"Error fetching submissions (attempt {retry_count}): {e}")
-                
-                # Wait times: 1min, 2min, 5min, then keep trying every 5min
-                if retry_count == 1:
-                    wait_time = 60  # 1 minute
-                elif retry_count == 2:
-                    wait_time = 120  # 2 minutes
-                else:
-                    wait_time = 300  # 5 minutes (keep trying every 5 min)
-                
-                print(f"Retrying in {wait_time} seconds ({wait_time/60:.1f} minutes)...")
-                time.sleep(wait_time)
-    
-    print(f"Total submissions fetched: {len(all_submissions)}")
-    return all_submissions
+    return functools.partial(classify_decision, conference=f'ICLR {year}')
+
+
+_match_decision = make_decision_matcher(2025)
+
+# Cached: the score vocabulary ("5: Marginally below...", ...) is tiny
+_parse_score_string = functools.lru_cache(maxsize=None)(parse_score)
+
+
+def _numeric_score(val):
+    """Numeric value of a review score (see parse_score: e.g. 5.5 is dropped); strings parsed once"""
+    if isinstance(val, str):
+        return _parse_score_string(val)
+    return parse_score(val)
+
+
+def classify_decisions(venue: pd.Series, venueid: pd.Series):
+    """
+    Determine decision status for all submissions at once from venue/venueid
+    Rungs are checked in order of specificity, first match wins (decisions.classify_decision)
+    """
+    # Only a handful of distinct venue/venueid pairs exist, so each one is
+    # classified once and the result is broadcast back through the codes
+    codes, keys = pd.factorize(venue + '\x00' + venueid)
+    matched = [_match_decision(*key.split('\x00', 1)) for key in keys]
+    decision = np.array([d for d, _ in matched], dtype=object)[codes]
+    decision_type = np.array([t for _, t in matched], dtype=object)[codes]
+    return decision, decision_type
 
 
-def extract_submission_data(submissions: List[Dict]) -> pd.DataFrame:
+def extract_submission_data(submissions: List[Dict]):
     """
     Extract key information from submissions including decision status
     Fast extraction - no API calls needed!
+    Returns the DataFrame and, per score field, an (n_submissions, n_reviews)
+    float matrix of parsed scores padded with NaN
     """
-    data = []
+    n = len(submissions)
+    if n == 0:
+        return pd.DataFrame(), {}
+    
+    # Preallocated columns, filled by index
+    submission_ids = np.empty(n, dtype=object)
+    numbers = np.empty(n, dtype=object)
+    primary_areas = np.empty(n, dtype=object)
+    venues = np.empty(n, dtype=object)
+    venueids = np.empty(n, dtype=object)
+    num_reviews = np.zeros(n, dtype=np.int64)
+    score_strings = {field: np.empty(n, dtype=object) for field in SCORE_FIELDS}
+    flat_rows = {field: [] for field in SCORE_FIELDS}
+    flat_cols = {field: [] for field in SCORE_FIELDS}
+    flat_values = {field: [] for field in SCORE_FIELDS}
     
-    for submission in tqdm(submissions, desc="Processing submissions"):
-        submission_id = submission.get('id')
-        number = submission.get('number', None)
+    for i, submission in enumerate(tqdm(submissions, desc="Processing submissions")):
         content = submission.get('content', {})
+        submission_ids[i] = submission.get('id')
+        numbers[i] = submission.get('number', None)
         
         # Get primary area
         primary_area = content.get('primary_area', {})
         if isinstance(primary_area, dict):
             primary_area = primary_area.get('value', 'N/A')
+        primary_areas[i] = primary_area
         
-        # Extract decision from venue/venueid
+        # Decision is derived from venue/venueid for all rows after the loop
         venue = content.get('venue', {})
         if isinstance(venue, dict):
             venue = venue.get('value', '')
+        venues[i] = venue
         
         venueid = content.get('venueid', {})
         if isinstance(venueid, dict):
             venueid = venueid.get('value', '')
-        
-        # Determine decision status
-        # Check in order of specificity: Oral > Spotlight > Poster > Reject > Withdrawn
-        decision = 'Unknown'
-        decision_type = 'Unknown'
-        
-        # Check for Withdrawn
-        if 'Withdrawn' in venueid or 'Withdrawn' in venue:
-            decision = 'Withdrawn'
-            decision_type = 'Withdrawn'
-        
-        # Check for Desk Reject
-        elif 'Desk_Rejected' in venueid or 'Desk Reject' in venue:
-            decision = 'Desk Reject'
-            decision_type = 'Reject'
-        
-        # Check for Reject (including "Submitted to ICLR 2025" which means rejected)
-        elif 'Rejected_Submission' in venueid or 'Rejected' in venueid or \
-             'Submitted to ICLR 2025' == venue:
-            decision = 'Reject'
-            decision_type = 'Reject'
-        
-        # Check for Accept - Oral (most specific, check first)
-        elif 'Oral' in venueid or 'ICLR 2025 Oral' in venue:
-            decision = 'Accept (Oral)'
-            decision_type = 'Accept'
-        
-        # Check for Accept - Spotlight
-        elif 'Spotlight' in venueid or 'ICLR 2025 Spotlight' in venue:
-            decision = 'Accept (Spotlight)'
-            decision_type = 'Accept'
-        
-        # Check for Accept - Poster
-        elif 'Poster' in venueid or 'ICLR 2025 Poster' in venue:
-            decision = 'Accept (Poster)'
-            decision_type = 'Accept'
-        
-        # Fallback: if venue contains "ICLR 2025" but not "Submitted" or "Withdrawn", 
-        # it's likely an accepted paper (assume Poster if type unclear)
-        elif 'ICLR 2025' in venue and 'Submitted' not in venue and 'Withdrawn' not in venue:
-            decision = 'Accept (Poster)'
-            decision_type = 'Accept'
+        venueids[i] = venueid
         
         # Extract reviews from replies
         replies = submission.get('details', {}).get('replies', [])
-        
-        ratings = []
-        confidences = []
-        soundness_scores = []
-        presentation_scores = []
-        contribution_scores = []
+        values = {field: [] for field in SCORE_FIELDS}
         
         for reply in replies:
             reply_content = reply.get('content', {})
             
             # Check if this is a review
             if 'rating' in reply_content and 'confidence' in reply_content:
-                # Extract rating
-                rating_val = reply_content['rating']
-                if isinstance(rating_val, dict):
-                    rating_val = rating_val.get('value')
-                if rating_val:
-                    ratings.append(rating_val)
-                
-                # Extract confidence
-                conf_val = reply_content['confidence']
-                if isinstance(conf_val, dict):
-                    conf_val = conf_val.get('value')
-                if conf_val:
-                    confidences.append(conf_val)
-                
-                # Extract other scores
-                for field, target_list in [('soundness', soundness_scores),
-                                          ('presentation', presentation_scores),
-                                          ('contribution', contribution_scores)]:
+                for field in SCORE_FIELDS:
                     if field in reply_content:
                         val = reply_content[field]
                         if isinstance(val, dict):
                             val = val.get('value')
                         if val:
-                            target_list.append(val)
-        
-        # Calculate averages
-        avg_rating = None
-        if ratings:
-            # Parse numeric values from ratings
-            numeric_ratings = []
-            for r in ratings:
-                if isinstance(r, (int, float)):
-                    numeric_ratings.append(r)
-                elif isinstance(r, str):
-                    try:
-                        # Try to extract number (format might be "5: Marginally below...")
-                        numeric_ratings.append(int(r.split(':')[0]))
-                    except:
-                        pass
-            if numeric_ratings:
-                avg_rating = sum(numeric_ratings) / len(numeric_ratings)
-        
-        record = {
-            'submission_id': submission_id,
-            'submission_number': number,
-            'primary_area': primary_area,
-            'decision': decision,
-            'decision_type': decision_type,
-            'num_reviews': len(ratings),
-            'ratings': str(ratings),
-            'confidences': str(confidences),
-            'soundness': str(soundness_scores),
-            'presentation': str(presentation_scores),
-            'contribution': str(contribution_scores),
-            'avg_rating': avg_rating
-        }
+                            field_values = values[field]
+                            # Numeric value lands at (row i, review position)
+                            score = _numeric_score(val)
+                            if score is not None:
+                                flat_rows[field].append(i)
+                                flat_cols[field].append(len(field_values))
+                                flat_values[field].append(score)
+                            field_values.append(val)
         
-        data.append(record)
+        num_reviews[i] = len(values['rating'])
+        for field in SCORE_FIELDS:
+            score_strings[field][i] = str(values[field])
+    
+    # Scatter the flat (row, review, value) triples into NaN-padded matrices at once
+    scores = {}
+    for field in SCORE_FIELDS:
+        width = max(MAX_REVIEWS, max(flat_cols[field], default=-1) + 1)
+        scores[field] = np.full((n, width), np.nan)
+        scores[field][flat_rows[field], flat_cols[field]] = flat_values[field]
+    
+    # Average rating per submission in one vectorized pass over the matrix
+    counts = np.count_nonzero(~np.isnan(scores['rating']), axis=1)
+    sums = np.nansum(scores['rating'], axis=1)
+    avg_ratings = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
     
-    return pd.DataFrame(data)
+    decision, decision_type = classify_decisions(pd.Series(venues, dtype=str),
+                                                 pd.Series(venueids, dtype=str))
+    df = pd.DataFrame({
+        'submission_id': submission_ids,
+        'submission_number': numbers,
+        'primary_area': primary_areas,
+        'decision': decision,
+        'decision_type': decision_type,
+        'num_reviews': num_reviews,
+        **{column: score_strings[field] for field, column in zip(SCORE_FIELDS, SCORE_COLUMNS)},
+        'avg_rating': avg_ratings,
+    }).infer_objects()
+    return df, scores
+
+
+def save_parquet(df: pd.DataFrame, scores: Dict[str, np.ndarray], output_file: str) -> None:
+    """
+    Save the data with review scores as typed list<int8> columns
+    Lists are built straight from the score matrices (row-major, NaN padding dropped)
+    """
+    table = pa.Table.from_pandas(df.drop(columns=SCORE_COLUMNS), preserve_index=False)
+    for field, column in zip(SCORE_FIELDS, SCORE_COLUMNS):
+        present = ~np.isnan(scores[field])
+        offsets = np.concatenate([[0], np.cumsum(present.sum(axis=1))]).astype(np.int32)
+        values = pa.array(scores[field][present].astype(np.int8))  # only valid scores are present
+        table = table.append_column(column, pa.ListArray.from_arrays(offsets, values))
+    pq.write_table(table.select(list(df.columns)), output_file, compression='zstd')
 
 
 def main():
@@ -250,7 +201,7 @@ def main():
     print("This may take 30-60 minutes depending on total submissions...")
     print()
     
-    submissions = get_all_submissions(venue_id, output_dir)
+    submissions = fetch_all_notes(venue_id, output_dir)
     
     if not submissions:
         print("❌ No submissions fetched. Exiting.")
@@ -267,12 +218,13 @@ def main():
     print("This is fast - processing locally, no API calls!")
     print()
     
-    df = extract_submission_data(submissions)
+    df, scores = extract_submission_data(submissions)
     
     # Save to CSV
     output_file = os.path.join(output_dir, 'ratings_data.csv')
     df.to_csv(output_file, index=False)
-    print(f"\n✅ Data saved to {output_file}")
+    save_parquet(df, scores, os.path.join(output_dir, 'ratings_data.parquet'))
+    print(f"\n✅ Data saved to {output_file} (+ ratings_data.parquet)")
     
     # Print summary statistics
     print("\n" + "="*60)
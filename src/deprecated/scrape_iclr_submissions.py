@@ -5,129 +5,60 @@ Collects: submission number, ratings (overall, soundness, excitement, contributi
 confidence, and topic information
 """
 
-import json
-import time
-import requests
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict
 import pandas as pd
 from tqdm import tqdm
 import os
+import sys
 
-def get_all_submissions(venue_id: str = "ICLR.cc/2026/Conference", output_dir: str = None) -> List[Dict]:
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metadata_io import save_meta, append_jsonl, iter_jsonl
+from openreview_client import (BUCKET, NOTES_URL, SESSION, fetch_all_notes,
+                               retry_with_backoff)
+
+# Forum review fetches kept in flight at once (the step is RTT-bound)
+MAX_WORKERS = 25
+
+
+def filter_reviews(notes: List[Dict]) -> List[Dict]:
     """
-    Fetch all submissions for ICLR 2026 using OpenReview API with retry logic
-    Saves incrementally after each batch if output_dir is provided
+    Keep only actual reviews, identified by content structure
+    Reviews have 'rating', 'confidence', 'soundness', etc.
     """
-    base_url = "https://api2.openreview.net"
-    
-    # Get all submissions
-    submissions_url = f"{base_url}/notes"
-    params = {
-        "invitation": f"{venue_id}/-/Submission",
-        "details": "replies,invitation",
-        "limit": 500,  # Smaller batches to avoid timeouts
-        "offset": 0
-    }
-    
-    all_submissions = []
-    
-    print(f"Fetching submissions from {venue_id}...")
-    
-    while True:
-        retry_count = 0
-        success = False
-        
-        while not success:
-            try:
-                response = requests.get(submissions_url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                notes = data.get('notes', [])
-                if not notes:
-                    return all_submissions
-                    
-                all_submissions.extend(notes)
-                print(f"Fetched {len(all_submissions)} submissions so far...")
-                
-                # Save incrementally after each batch
-                if output_dir:
-                    submissions_file = os.path.join(output_dir, 'submissions_metadata.json')
-                    with open(submissions_file, 'w') as f:
-                        json.dump(all_submissions, f, indent=2)
-                    print(f"  ✓ Saved to {submissions_file}")
-                
-                # Check if there are more results
-                if len(notes) < params['limit']:
-                    print(f"✓ Reached end of submissions")
-                    return all_submissions
-                
-                params['offset'] += params['limit']
-                time.sleep(5)  # Wait between successful batches
-                success = True
-                
-            except Exception as e:
-                retry_count += 1
-                print(f"Error fetching submissions (attempt {retry_count}): {e}")
-                
-                # Wait times: 1min, 2min, 5min, then keep trying every 5min
-                if retry_count == 1:
-                    wait_time = 60  # 1 minute
-                elif retry_count == 2:
-                    wait_time = 120  # 2 minutes
-                else:
-                    wait_time = 300  # 5 minutes (keep trying every 5 min)
-                
-                print(f"Retrying in {wait_time} seconds ({wait_time/60:.1f} minutes)...")
-                time.sleep(wait_time)
-    
-    print(f"Total submissions fetched: {len(all_submissions)}")
-    return all_submissions
+    reviews = []
+    for note in notes:
+        content = note.get('content', {})
+        # Check if this looks like a review (has rating and confidence)
+        if 'rating' in content and 'confidence' in content:
+            reviews.append(note)
+    return reviews
 
 
+@retry_with_backoff('fetching reviews')
 def get_reviews_for_submission(submission_id: str, venue_id: str = "ICLR.cc/2026/Conference") -> List[Dict]:
     """
     Fetch all reviews for a specific submission with persistent retry logic
     We get all notes in the forum and filter for reviews based on content structure
+    Only needed for submissions listed without their replies
     """
-    base_url = "https://api2.openreview.net"
-    reviews_url = f"{base_url}/notes"
-    
-    params = {
-        "forum": submission_id,
-    }
-    
-    attempt = 0
-    while True:
-        try:
-            response = requests.get(reviews_url, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            all_notes = data.get('notes', [])
-            
-            # Filter for actual reviews based on content structure
-            # Reviews have 'rating', 'confidence', 'soundness', etc.
-            reviews = []
-            for note in all_notes:
-                content = note.get('content', {})
-                # Check if this looks like a review (has rating and confidence)
-                if 'rating' in content and 'confidence' in content:
-                    reviews.append(note)
-            
-            return reviews
-        except Exception as e:
-            attempt += 1
-            # Wait times: 1min, 2min, 5min, then keep trying every 5min
-            if attempt == 1:
-                wait_time = 60  # 1 minute
-            elif attempt == 2:
-                wait_time = 120  # 2 minutes
-            else:
-                wait_time = 300  # 5 minutes (keep trying every 5 min)
-            
-            if attempt == 1:
-                print(f"  ⚠ Error fetching reviews, retrying in {wait_time/60:.1f} min...")
-            time.sleep(wait_time)
+    BUCKET.acquire()
+    response = SESSION.get(NOTES_URL, params={"forum": submission_id}, timeout=15)
+    response.raise_for_status()
+    return filter_reviews(response.json().get('notes', []))
+
+
+@functools.lru_cache(maxsize=None)
+def _rating_prefix(rating: str):
+    """
+    Leading integer of a rating string such as "5: Marginally below...", or None
+    Cached: the rating vocabulary is tiny, so each distinct string is parsed once
+    """
+    try:
+        return int(rating.split(':', 1)[0])
+    except ValueError:
+        return None
 
 
 def extract_submission_data(submission: Dict, reviews: List[Dict]) -> Dict:
@@ -195,12 +126,8 @@ def extract_submission_data(submission: Dict, reviews: List[Dict]) -> Dict:
         # Calculate averages if ratings exist
         if ratings['overall_ratings']:
             # Extract numeric values from ratings (e.g., "6: Weak Accept" -> 6)
-            numeric_ratings = []
-            for r in ratings['overall_ratings']:
-                try:
-                    numeric_ratings.append(int(str(r).split(':')[0]))
-                except:
-                    pass
+            numeric_ratings = [_rating_prefix(str(r)) for r in ratings['overall_ratings']]
+            numeric_ratings = [r for r in numeric_ratings if r is not None]
             submission_data['avg_overall_rating'] = sum(numeric_ratings) / len(numeric_ratings) if numeric_ratings else None
         else:
             submission_data['avg_overall_rating'] = None
@@ -228,7 +155,8 @@ def main():
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    checkpoint_file = os.path.join(output_dir, 'scrape_checkpoint.json')
+    # Append-only checkpoint: one JSON line per processed submission
+    checkpoint_file = os.path.join(output_dir, 'scrape_checkpoint.jsonl')
     
     # Check if we have a checkpoint to resume from
     processed_ids = set()
@@ -236,15 +164,15 @@ def main():
     
     if os.path.exists(checkpoint_file):
         print(f"Found checkpoint file. Loading progress...")
-        with open(checkpoint_file, 'r') as f:
-            checkpoint = json.load(f)
-            all_data = checkpoint.get('data', [])
-            processed_ids = set(checkpoint.get('processed_ids', []))
+        for entry in iter_jsonl(checkpoint_file):
+            if entry['id'] not in processed_ids:
+                processed_ids.add(entry['id'])
+                all_data.append(entry['data'])
         print(f"Resuming from checkpoint: {len(all_data)} submissions already processed")
     
     # Step 1: Get all submissions (saves incrementally after each batch)
     print("\n" + "="*50)
-    submissions = get_all_submissions(venue_id, output_dir)
+    submissions = fetch_all_notes(venue_id, output_dir)
     
     if not submissions:
         print("No submissions found. The data might not be publicly available yet.")
@@ -257,37 +185,51 @@ def main():
     print("="*50 + "\n")
     
     # Step 2: Get reviews for each submission
-    print("Fetching reviews for each submission...")
+    # Reviews come embedded in the listing (details=replies), so no extra API
+    # calls are needed; submissions without replies fall back to a forum fetch
+    print("Extracting reviews for each submission...")
     
-    save_interval = 100  # Save checkpoint every 100 submissions
-    submissions_since_save = 0
+    checkpoint = open(checkpoint_file, 'ab')
     
-    for submission in tqdm(submissions):
-        submission_id = submission.get('id')
-        if not submission_id:
-            continue
-        
-        # Skip if already processed
-        if submission_id in processed_ids:
-            continue
-        
-        reviews = get_reviews_for_submission(submission_id, venue_id)
+    def record(submission, reviews):
         submission_data = extract_submission_data(submission, reviews)
         all_data.append(submission_data)
-        processed_ids.add(submission_id)
-        
-        submissions_since_save += 1
+        processed_ids.add(submission['id'])
         
-        # Save checkpoint periodically
-        if submissions_since_save >= save_interval:
-            with open(checkpoint_file, 'w') as f:
-                json.dump({
-                    'data': all_data,
-                    'processed_ids': list(processed_ids)
-                }, f)
-            submissions_since_save = 0
-        
-        time.sleep(1.5)  # Wait between each submission's reviews
+        # Checkpoint each submission as it completes
+        append_jsonl(checkpoint, {'id': submission['id'], 'data': submission_data})
+        checkpoint.flush()
+    
+    missing_replies = []
+    for submission in tqdm(submissions):
+        if not submission.get('id') or submission['id'] in processed_ids:
+            continue
+        replies = submission.get('details', {}).get('replies')
+        if replies is None:
+            missing_replies.append(submission)
+            continue
+        record(submission, filter_reviews(replies))
+    
+    if missing_replies:
+        print(f"Fetching reviews for {len(missing_replies)} submissions listed without replies...")
+        # Results are collected here as the concurrent fetches complete
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(get_reviews_for_submission, submission['id'], venue_id): submission
+                for submission in missing_replies
+            }
+            for future in tqdm(as_completed(futures), total=len(futures)):
+                submission = futures[future]
+                try:
+                    reviews = future.result()
+                except Exception as e:
+                    # One failed forum fetch (e.g. a 404) skips that submission
+                    # only; it stays out of the checkpoint and is retried next run
+                    print(f"  ⚠ Skipping submission {submission['id']}: {e}")
+                    continue
+                record(submission, reviews)
+    
+    checkpoint.close()
     
     # Step 3: Save final results to CSV
     df = pd.DataFrame(all_data)
@@ -322,8 +264,7 @@ def main():
     
     # Save raw data as JSON for reference
     json_output = os.path.join(output_dir, 'submissions_raw.json')
-    with open(json_output, 'w') as f:
-        json.dump(all_data, f, indent=2)
+    save_meta(json_output, all_data)
     print(f"Raw data also saved to {json_output}")
     
     # Clean up checkpoint file
@@ -1,22 +1,58 @@
 #!/usr/bin/env python3
 """
-Universal extraction of ratings and decision data from metadata
-This script automatically detects whether decision information is available and extracts it if present.
+Extraction of ratings and decision data from metadata
+Streams the metadata JSON one submission at a time and detects whether decision
+information is available (extracting it if present). Writes the CSV plus a typed
+Parquet copy next to it (same stem), with the review scores as integer lists.
 
 Usage:
-    python3 src/extract_ratings_universal.py <metadata_file> [output_file]
+    python3 src/extract_ratings.py <metadata_file> [output_file]
     
 Example:
-    python3 src/extract_ratings_universal.py iclr_2025/iclr_2025_v1/submissions_metadata.json iclr_2025/iclr_2025_v1/ratings_data.csv
-    python3 src/extract_ratings_universal.py iclr_2026/iclr_2026_v1/submissions_metadata.json iclr_2026/iclr_2026_v1/ratings_data.csv
+    python3 src/extract_ratings.py iclr_2025/iclr_2025_v1/submissions_metadata.json iclr_2025/iclr_2025_v1/ratings_data.csv
+    python3 src/extract_ratings.py iclr_2026/iclr_2026_v1/submissions_metadata.json iclr_2026/iclr_2026_v1/ratings_data.csv
 """
 
-import json
+import itertools
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from tqdm import tqdm
 import sys
 import os
 
+from cache_metadata import parse_score, segment_stats
+from decisions import classify_ratings_decision
+from metadata_io import iter_meta
+
+# Leading submissions buffered from the stream to detect decision information
+DETECTION_SAMPLE_SIZE = 100
+
+# Rows serialized per to_csv chunk: bounds the formatting buffer for large tables
+CSV_CHUNK_SIZE = 4096
+
+# Compact dtypes: nullable ints where values may be missing, and categories for
+# the low-cardinality string columns (decision columns only when detected).
+# The computed stats stay float64 so the CSV keeps its format (e.g. "4.0")
+COLUMN_DTYPES = {
+    'submission_number': 'Int32',
+    'primary_area': 'category',
+    'decision': 'category',
+    'decision_type': 'category',
+    'num_reviews': 'int8',
+}
+
+# Narrower Arrow types for the computed stats, used in the typed Parquet copy only
+PARQUET_STAT_TYPES = {
+    'avg_rating': pa.float32(),
+    'min_rating': pa.int8(),
+    'max_rating': pa.int8(),
+    'avg_confidence': pa.float32(),
+}
+
+# Per-review score lists collected for every submission
+REVIEW_LIST_FIELDS = ['ratings', 'confidences', 'soundness', 'presentation', 'contribution']
+
 
 def extract_decision(venue, venueid):
     """
@@ -30,32 +66,7 @@ def extract_decision(venue, venueid):
     - Withdrawn
     - Pending (no decision yet)
     """
-    venue_str = str(venue).lower() if venue else ""
-    venueid_str = str(venueid).lower() if venueid else ""
-    
-    # Check for withdrawn
-    if "withdrawn" in venue_str or "withdrawn" in venueid_str:
-        return "Withdrawn", "Withdrawn"
-    
-    # Check for desk reject
-    if "desk reject" in venue_str or "desk_rejected" in venueid_str:
-        return "Reject", "Desk Reject"
-    
-    # Check for acceptance types (check in order of specificity)
-    if "oral" in venue_str:
-        return "Accept", "Oral"
-    elif "spotlight" in venue_str:
-        return "Accept", "Spotlight"
-    elif "poster" in venue_str or ("conference" in venue_str and "202" in venue_str):
-        # "ICLR 202X Conference" typically means accepted as poster
-        return "Accept", "Poster"
-    
-    # Check for rejection
-    if "reject" in venue_str or "rejected" in venueid_str:
-        return "Reject", "Reject"
-    
-    # No decision found
-    return "Pending", "Pending"
+    return classify_ratings_decision(str(venue) if venue else "", str(venueid) if venueid else "")
 
 
 def extract_reviews_from_submission(submission):
@@ -107,13 +118,74 @@ def extract_reviews_from_submission(submission):
     }
 
 
+def _extract_reviews_value_schema(submission):
+    """
+    extract_reviews_from_submission specialized for {'value': ...} score fields
+    Indexes the fields directly instead of chained .get()/isinstance checks; a
+    submission that does not fit the schema falls back to the generic extractor.
+    """
+    ratings = []
+    confidences = []
+    soundness = []
+    presentation = []
+    contribution = []
+    
+    try:
+        for reply in submission['details']['replies']:
+            content = reply['content']
+            if 'rating' not in content or 'confidence' not in content:
+                continue
+            
+            rating_val = content['rating']['value']
+            if rating_val is not None:
+                ratings.append(rating_val)
+            conf_val = content['confidence']['value']
+            if conf_val:
+                confidences.append(conf_val)
+            
+            for field, target_list in (('soundness', soundness),
+                                       ('presentation', presentation),
+                                       ('contribution', contribution)):
+                if field in content:
+                    val = content[field]['value']
+                    if val is not None:
+                        target_list.append(val)
+    except (KeyError, TypeError):
+        return extract_reviews_from_submission(submission)
+    
+    return {
+        'ratings': ratings,
+        'confidences': confidences,
+        'soundness': soundness,
+        'presentation': presentation,
+        'contribution': contribution
+    }
+
+
+def detect_value_schema(submissions):
+    """
+    Check whether review scores are stored as {'value': ...} dicts.
+    The schema is uniform within a venue, so the first review found decides.
+    """
+    for submission in submissions:
+        for reply in submission.get('details', {}).get('replies', []):
+            content = reply.get('content', {})
+            if 'rating' in content and 'confidence' in content:
+                return isinstance(content['rating'], dict)
+    return False
+
+
 def detect_if_decisions_available(submissions, sample_size=100):
     """
     Automatically detect if decision information is available in the metadata.
-    Checks a sample of submissions for venue/venueid patterns.
+    Checks a sample of submissions for venue/venueid patterns, stopping as soon
+    as enough decisions have been seen.
     """
     sample = submissions[:min(sample_size, len(submissions))]
     
+    # If more than 10% of sample has decisions, consider decisions available
+    threshold = sample_size * 0.1
+    
     decision_indicators = 0
     for submission in sample:
         venue = submission.get('content', {}).get('venue', '')
@@ -124,11 +196,10 @@ def detect_if_decisions_available(submissions, sample_size=100):
         # If we find any non-pending decisions, decisions are available
         if decision != "Pending":
             decision_indicators += 1
+            if decision_indicators > threshold:
+                return True
     
-    # If more than 10% of sample has decisions, consider decisions available
-    has_decisions = decision_indicators > (sample_size * 0.1)
-    
-    return has_decisions
+    return False
 
 
 def main(metadata_file='data/submissions_metadata.json', 
@@ -147,116 +218,114 @@ def main(metadata_file='data/submissions_metadata.json',
         print(f"❌ Error: File not found: {metadata_file}")
         sys.exit(1)
     
-    with open(metadata_file, 'r') as f:
-        submissions = json.load(f)
-    
-    print(f"✓ Loaded {len(submissions):,} submissions")
+    # Submissions are streamed one at a time; only the detection sample is
+    # buffered, then chained back in front of the rest of the stream
+    submissions = iter_meta(metadata_file)
+    sample = list(itertools.islice(submissions, DETECTION_SAMPLE_SIZE))
     
     # Auto-detect if decisions are available
     print("\nDetecting if decision information is available...")
-    has_decisions = detect_if_decisions_available(submissions)
+    has_decisions = detect_if_decisions_available(sample, DETECTION_SAMPLE_SIZE)
     
     if has_decisions:
         print("✓ Decision information detected! Will extract decision data.")
     else:
         print("✓ No decision information found. Extracting ratings only.")
     
+    # Review extractor specialized to the score schema of this venue
+    if detect_value_schema(sample):
+        extract_reviews = _extract_reviews_value_schema
+    else:
+        extract_reviews = extract_reviews_from_submission
+    
     # Extract data
     print("\nExtracting data from submissions...")
-    results = []
     
-    for submission in tqdm(submissions):
-        # Get basic info
-        number = submission.get('number', None)
+    # Column arrays, filled while streaming the submissions once
+    numbers = []
+    primary_areas = []
+    venues = []
+    venueids = []
+    review_lists = {field: [] for field in REVIEW_LIST_FIELDS}
+    
+    # Parsed scores per field, concatenated; offsets[i]:offsets[i+1] is submission i
+    score_flat = {field: [] for field in REVIEW_LIST_FIELDS}
+    score_offsets = {field: [0] for field in REVIEW_LIST_FIELDS}
+    
+    for submission in tqdm(itertools.chain(sample, submissions)):
         content = submission.get('content', {})
+        numbers.append(submission.get('number', None))
         
         # Get primary area
         primary_area = content.get('primary_area', {})
         if isinstance(primary_area, dict):
             primary_area = primary_area.get('value', 'N/A')
+        primary_areas.append(primary_area)
         
         # Extract reviews
-        reviews = extract_reviews_from_submission(submission)
-        
-        # Create record
-        record = {
-            'submission_number': number,
-            'primary_area': primary_area,
-            'num_reviews': len(reviews['ratings']),
-            'ratings': str(reviews['ratings']),  # Store as string for CSV
-            'confidences': str(reviews['confidences']),
-            'soundness': str(reviews['soundness']),
-            'presentation': str(reviews['presentation']),
-            'contribution': str(reviews['contribution']),
-        }
-        
-        # Extract decision information if available
-        if has_decisions:
-            venue = content.get('venue', '')
-            venueid = content.get('venueid', '')
-            decision, decision_type = extract_decision(venue, venueid)
-            record['decision'] = decision
-            record['decision_type'] = decision_type
-        
-        # Add computed fields for ratings
-        if reviews['ratings']:
-            # Extract numeric values from ratings
-            numeric_ratings = []
-            for r in reviews['ratings']:
-                try:
-                    # Handle both "6: Weak Accept" format and plain numbers
-                    if isinstance(r, str):
-                        numeric_ratings.append(int(r.split(':')[0]))
-                    else:
-                        numeric_ratings.append(int(r))
-                except:
-                    pass
+        reviews = extract_reviews(submission)
+        for field in REVIEW_LIST_FIELDS:
+            review_lists[field].append(reviews[field])
             
-            if numeric_ratings:
-                record['avg_rating'] = sum(numeric_ratings) / len(numeric_ratings)
-                record['min_rating'] = min(numeric_ratings)
-                record['max_rating'] = max(numeric_ratings)
-            else:
-                record['avg_rating'] = None
-                record['min_rating'] = None
-                record['max_rating'] = None
-        else:
-            record['avg_rating'] = None
-            record['min_rating'] = None
-            record['max_rating'] = None
+            # Numeric values for the computed fields; unparseable scores are skipped
+            flat = score_flat[field]
+            flat.extend(v for v in map(parse_score, reviews[field]) if v is not None)
+            score_offsets[field].append(len(flat))
         
-        # Add computed fields for confidence
-        if reviews['confidences']:
-            # Extract numeric confidence values
-            numeric_conf = []
-            for c in reviews['confidences']:
-                try:
-                    if isinstance(c, str):
-                        numeric_conf.append(int(c.split(':')[0]))
-                    else:
-                        numeric_conf.append(int(c))
-                except:
-                    pass
-            
-            if numeric_conf:
-                record['avg_confidence'] = sum(numeric_conf) / len(numeric_conf)
-            else:
-                record['avg_confidence'] = None
-        else:
-            record['avg_confidence'] = None
-        
-        results.append(record)
+        if has_decisions:
+            venues.append(content.get('venue', ''))
+            venueids.append(content.get('venueid', ''))
+    
+    print(f"✓ Loaded {len(numbers):,} submissions")
+    
+    # Computed fields: one segment reduction per column instead of per-row sum/min/max
+    _, avg_rating, min_rating, max_rating = segment_stats(score_flat['ratings'], score_offsets['ratings'])
+    _, avg_confidence, _, _ = segment_stats(score_flat['confidences'], score_offsets['confidences'])
     
     # Create DataFrame
-    df = pd.DataFrame(results)
+    columns = {
+        'submission_number': numbers,
+        'primary_area': primary_areas,
+        'num_reviews': [len(r) for r in review_lists['ratings']],
+    }
+    for field in REVIEW_LIST_FIELDS:
+        columns[field] = [str(v) for v in review_lists[field]]  # Store as string for CSV
+    
+    # Extract decision information if available
+    if has_decisions:
+        decisions = [extract_decision(venue, venueid) for venue, venueid in zip(venues, venueids)]
+        columns['decision'] = [d for d, _ in decisions]
+        columns['decision_type'] = [t for _, t in decisions]
+    
+    columns['avg_rating'] = avg_rating
+    columns['min_rating'] = min_rating
+    columns['max_rating'] = max_rating
+    columns['avg_confidence'] = avg_confidence
+    df = pd.DataFrame(columns).astype({name: dtype for name, dtype in COLUMN_DTYPES.items()
+                                       if name in columns})
+    
+    # Typed copy: the same columns, with the parsed scores as list<int8> instead of strings
+    typed = pa.table({
+        name: (pa.ListArray.from_arrays(pa.array(score_offsets[name], type=pa.int32()),
+                                        pa.array(score_flat[name], type=pa.int8()))
+               if name in REVIEW_LIST_FIELDS
+               else pa.array(df[name], type=PARQUET_STAT_TYPES.get(name), from_pandas=True))
+        for name in df.columns
+    })
     
     # Sort by submission number
-    df = df.sort_values('submission_number')
+    df = df.sort_values('submission_number', kind='stable', ignore_index=True)
+    
+    # Save to CSV in fixed-size chunks with explicit '\n' line endings (the same
+    # bytes as a plain to_csv on POSIX, independent of the platform's os.linesep)
+    df.to_csv(output_file, index=False, lineterminator='\n', chunksize=CSV_CHUNK_SIZE)
     
-    # Save to CSV
-    df.to_csv(output_file, index=False)
+    # Save typed copy next to the CSV: list columns need no string parsing on reload
+    parquet_file = os.path.splitext(output_file)[0] + '.parquet'
+    pq.write_table(typed.sort_by('submission_number'), parquet_file, compression='zstd')
     
     print(f"\n✅ Data saved to {output_file}")
+    print(f"   Typed copy: {parquet_file}")
     print(f"   Total submissions: {len(df):,}")
     print(f"   Submissions with reviews: {len(df[df['num_reviews'] > 0]):,}")
     
@@ -346,7 +415,7 @@ if __name__ == "__main__":
         output_file = sys.argv[2] if len(sys.argv) > 2 else 'ratings_data.csv'
         main(metadata_file, output_file)
     else:
-        print("Usage: python3 src/extract_ratings_universal.py <metadata_file> [output_file]")
+        print("Usage: python3 src/extract_ratings.py <metadata_file> [output_file]")
         print("\nExample:")
-        print("  python3 src/extract_ratings_universal.py iclr_2025/iclr_2025_v1/submissions_metadata.json iclr_2025/iclr_2025_v1/ratings_data.csv")
+        print("  python3 src/extract_ratings.py iclr_2025/iclr_2025_v1/submissions_metadata.json iclr_2025/iclr_2025_v1/ratings_data.csv")
         sys.exit(1)
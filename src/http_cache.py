@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Conditional GET cache for OpenReview listing calls
+Response bodies are kept on disk with their ETag/Last-Modified validators,
+so unchanged pages come back as a bodyless 304 on later runs. Bodies younger
+than a caller-supplied max_age are served from disk without any request.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from metadata_io import ijson, load_meta, parse_json
+
+
+def _cache_paths(cache_dir, url, params):
+    """Body and validator files for one (url, params) request"""
+    key = hashlib.sha1(f"{url}?{sorted((params or {}).items())}".encode()).hexdigest()[:16]
+    return (os.path.join(cache_dir, f'{key}.json'),
+            os.path.join(cache_dir, f'{key}.validators.json'))
+
+
+def _is_fresh(body_path, max_age):
+    """Whether a cached body was fetched (or revalidated) less than max_age seconds ago"""
+    return (bool(max_age) and os.path.exists(body_path)
+            and time.time() - os.path.getmtime(body_path) < max_age)
+
+
+def _conditional_headers(body_path, validators_path):
+    """If-None-Match/If-Modified-Since headers for a cached response, if any"""
+    headers = {}
+    if os.path.exists(body_path) and os.path.exists(validators_path):
+        with open(validators_path, 'r') as f:
+            validators = json.load(f)
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def _response_validators(response):
+    """Validators of a response, or None if the server cannot revalidate it"""
+    validators = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+    if validators['etag'] or validators['last_modified']:
+        return validators
+    return None
+
+
+def _storable(response, max_age):
+    """
+    Validators to store with a response, or None if it is not worth caching
+    Without validators a body is still kept when max_age lets it be reused as is
+    """
+    validators = _response_validators(response)
+    if validators is None and max_age:
+        validators = {}
+    return validators
+
+
+def cached_get_json(session, url, params=None, cache_dir=None, timeout=30, max_age=0):
+    """
+    GET a JSON response, revalidating a cached copy with If-None-Match/If-Modified-Since
+    A cached copy younger than max_age seconds is returned without a request.
+    Without cache_dir this is a plain GET. Raises for HTTP error statuses.
+    """
+    if cache_dir is None:
+        response = session.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return parse_json(response.content)
+
+    body_path, validators_path = _cache_paths(cache_dir, url, params)
+    if _is_fresh(body_path, max_age):
+        return load_meta(body_path)
+    headers = _conditional_headers(body_path, validators_path)
+
+    response = session.get(url, params=params, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        os.utime(body_path)  # revalidated, so fresh again
+        return load_meta(body_path)
+    response.raise_for_status()
+
+    # Only responses the server can revalidate (or that may be reused as is) are worth keeping
+    validators = _storable(response, max_age)
+    if validators is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(body_path, 'wb') as f:
+            f.write(response.content)
+        with open(validators_path, 'w') as f:
+            json.dump(validators, f)
+    return parse_json(response.content)
+
+
+def cached_get_items(session, url, params=None, cache_dir=None, key='notes', timeout=30, max_age=0):
+    """
+    Yield the items of the top-level list `key` of a JSON response one at a time
+    The body is stream-parsed with ijson (spooled through the cache file when
+    cacheable), so the full decoded page is never held in memory.
+    A cached copy younger than max_age seconds is read without a request.
+    Falls back to cached_get_json when ijson is not installed.
+    """
+    if ijson is None:
+        yield from cached_get_json(session, url, params, cache_dir, timeout, max_age).get(key, [])
+        return
+
+    body_path = validators_path = None
+    headers = {}
+    if cache_dir is not None:
+        body_path, validators_path = _cache_paths(cache_dir, url, params)
+        if _is_fresh(body_path, max_age):
+            with open(body_path, 'rb') as f:
+                yield from ijson.items(f, f'{key}.item', use_float=True)
+            return
+        headers = _conditional_headers(body_path, validators_path)
+
+    with session.get(url, params=params, headers=headers, timeout=timeout, stream=True) as response:
+        if response.status_code == 304:
+            os.utime(body_path)  # revalidated, so fresh again
+            with open(body_path, 'rb') as f:
+                yield from ijson.items(f, f'{key}.item', use_float=True)
+            return
+        response.raise_for_status()
+
+        validators = _storable(response, max_age) if cache_dir is not None else None
+        if validators is None:
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, f'{key}.item', use_float=True)
+            return
+
+        # Spool the body to the cache, then parse it from disk
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(body_path + '.tmp', 'wb') as f:
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+        os.replace(body_path + '.tmp', body_path)
+        with open(validators_path, 'w') as f:
+            json.dump(validators, f)
+
+    with open(body_path, 'rb') as f:
+        yield from ijson.items(f, f'{key}.item', use_float=True)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Metadata utilities for submissions_metadata.json
+list-no-rating works on a single cached load of the flattened submissions;
+check and extract stream the raw replies, whose values the cache does not keep
+
+Usage:
+    python3 src/meta.py check <metadata_file> [--number N] [--rating R]
+    python3 src/meta.py list-no-rating <metadata_file> [--limit N]
+    python3 src/meta.py extract <metadata_file> [output_file]
+
+Example:
+    python3 src/meta.py check iclr_2026/iclr_2026_v1/submissions_metadata.json --number 25599
+    python3 src/meta.py list-no-rating iclr_2026/iclr_2026_v1/submissions_metadata.json
+"""
+
+import argparse
+import functools
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from cache_metadata import REVIEW_FIELDS, field_value, load_submissions_table, list_column_stats, parse_score
+from metadata_io import iter_meta
+
+
+@functools.lru_cache(maxsize=None)
+def load_table(metadata_file):
+    """
+    Load the flattened submissions as a pyarrow Table
+    Parsed once per process and shared by every caller
+    """
+    return load_submissions_table(metadata_file)
+
+
+def check_rating(metadata_file, number, rating=0):
+    """
+    Check whether a submission received a given rating
+    Reads the raw replies rather than the cached Table: the cache skips empty
+    scores such as 0, which is exactly what this check looks for. The metadata
+    is streamed and the scan stops at the submission.
+    """
+    submission = next((s for s in iter_meta(metadata_file) if s.get('number') == number), None)
+    if submission is None:
+        print(f'Submission {number} not found.')
+        return False
+
+    # Stop at the first match: the goal is presence detection
+    found = False
+    for reply in submission.get('details', {}).get('replies', []):
+        val = reply.get('content', {}).get('rating')
+        if val is None:
+            continue
+        if isinstance(val, dict):
+            val = val.get('value')
+        print('Rating:', val)
+        if str(val).strip() == str(rating):
+            found = True
+            break
+
+    if not found:
+        print(f'No rating {rating} found in API data.')
+    return found
+
+
+def list_no_rating(metadata_file, limit=50):
+    """
+    List submissions that have not received any reviews
+    """
+    table = load_table(metadata_file)
+    results = table.filter(pc.equal(pc.list_value_length(table['ratings']), 0))
+    results = results.select(['number', 'title']).sort_by('number')
+
+    print('Total:', results.num_rows)
+    print('---')
+    for r in results.slice(0, limit).to_pylist():
+        print(f"{r['number']}: {r['title']}")
+    print('...')
+    return results
+
+
+def review_lists(submission):
+    """
+    Raw review scores of one submission, per column, as the replies store them
+    (e.g. ['6: Weak Accept', ...]). Only replies with both rating and confidence
+    are reviews; empty values are skipped.
+    """
+    lists = {column: [] for _, column in REVIEW_FIELDS}
+    for reply in submission.get('details', {}).get('replies', []):
+        content = reply.get('content', {})
+        if 'rating' not in content or 'confidence' not in content:
+            continue
+        for field, column in REVIEW_FIELDS:
+            val = field_value(content, field)
+            if val:
+                lists[column].append(val)
+    return lists
+
+
+def extract(metadata_file='data/submissions_metadata.json',
+            output_file='data/ratings_data.csv'):
+    """
+    Extract ratings data from metadata file
+    Writes ratings_data.csv plus a typed Parquet copy next to it. The CSV keeps
+    the raw score values, so the metadata is streamed rather than read from the
+    cached Table (which holds parsed scores only); the statistics and the typed
+    copy use the parsed scores.
+    """
+    print("="*60)
+    print("Fast Rating Extraction")
+    print("="*60)
+    
+    # Load metadata
+    print(f"\nLoading metadata from {metadata_file}...")
+    numbers, areas = [], []
+    raw = {column: [] for _, column in REVIEW_FIELDS}
+    for submission in iter_meta(metadata_file):
+        numbers.append(submission.get('number'))
+        areas.append(field_value(submission.get('content', {}), 'primary_area', 'N/A'))
+        for column, values in review_lists(submission).items():
+            raw[column].append(values)
+    
+    print(f"✓ Loaded {len(numbers):,} submissions")
+    
+    # Extract data
+    print("\nExtracting ratings and confidence scores...")
+    
+    # Parsed scores as list<int8>; unparsable values (e.g. 5.5) are left out
+    scores = {column: pa.array([[score for score in map(parse_score, values) if score is not None]
+                                for values in lists], type=pa.list_(pa.int8()))
+              for column, lists in raw.items()}
+    num_reviews = [len(values) for values in raw['ratings']]
+    
+    # Per-submission aggregates straight from the flat list buffers
+    _, avg_rating, min_rating, max_rating = list_column_stats(scores['ratings'])
+    _, avg_confidence, _, _ = list_column_stats(scores['confidences'])
+    
+    # Create DataFrame
+    df = pd.DataFrame({
+        'submission_number': numbers,
+        'primary_area': areas,
+        'num_reviews': num_reviews,
+        # Store lists as strings for CSV
+        'ratings': [str(v) for v in raw['ratings']],
+        'confidences': [str(v) for v in raw['confidences']],
+        'soundness': [str(v) for v in raw['soundness']],
+        'presentation': [str(v) for v in raw['presentation']],
+        'contribution': [str(v) for v in raw['contribution']],
+        'avg_rating': avg_rating,
+        'min_rating': min_rating,
+        'max_rating': max_rating,
+        'avg_confidence': avg_confidence,
+    })
+    
+    # Sort by submission number
+    df = df.sort_values('submission_number')
+    
+    # Save to CSV
+    df.to_csv(output_file, index=False)
+    
+    # Save typed copy: list<int8> columns need no string parsing on reload
+    parquet_file = os.path.splitext(output_file)[0] + '.parquet'
+    typed = pa.table({
+        'submission_number': pa.array(numbers, type=pa.int32()),
+        'primary_area': areas,
+        'num_reviews': pa.array(num_reviews, type=pa.int16()),
+        **scores,
+    })
+    for column, values in [('avg_rating', avg_rating), ('min_rating', min_rating),
+                           ('max_rating', max_rating), ('avg_confidence', avg_confidence)]:
+        typed = typed.append_column(column, pa.array(values, from_pandas=True))
+    pq.write_table(typed.sort_by('submission_number'), parquet_file, compression='zstd')
+    
+    print(f"\n✅ Data saved to {output_file}")
+    print(f"   Typed copy: {parquet_file}")
+    print(f"   Total submissions: {len(df):,}")
+    print(f"   Submissions with reviews: {len(df[df['num_reviews'] > 0]):,}")
+    
+    # Summary statistics
+    print("\n" + "="*60)
+    print("SUMMARY STATISTICS")
+    print("="*60)
+    
+    reviewed = df[df['num_reviews'] > 0]
+    print(f"Total submissions: {len(df):,}")
+    print(f"Submissions with reviews: {len(reviewed):,} ({len(reviewed)/len(df)*100:.1f}%)")
+    
+    if len(reviewed) > 0:
+        print(f"\nReview statistics:")
+        print(f"  Average reviews per submission: {df['num_reviews'].mean():.2f}")
+        print(f"  Total reviews: {df['num_reviews'].sum():,}")
+        
+        rated = df[df['avg_rating'].notna()]
+        if len(rated) > 0:
+            print(f"\nRating statistics:")
+            print(f"  Average rating: {rated['avg_rating'].mean():.2f}")
+            print(f"  Rating range: {rated['min_rating'].min():.0f} - {rated['max_rating'].max():.0f}")
+            
+        conf = df[df['avg_confidence'].notna()]
+        if len(conf) > 0:
+            print(f"\nConfidence statistics:")
+            print(f"  Average confidence: {conf['avg_confidence'].mean():.2f}")
+        
+        print(f"\nTop 10 primary areas:")
+        top_areas = df['primary_area'].value_counts().head(10)
+        for area, count in top_areas.items():
+            pct = count / len(df) * 100
+            print(f"  {area[:50]:<50} {count:>5} ({pct:>4.1f}%)")
+    
+    print("\n" + "="*60)
+    print("\n✨ Extraction complete!")
+    print(f"\nOutput columns:")
+    print(f"  - submission_number")
+    print(f"  - primary_area")
+    print(f"  - num_reviews")
+    print(f"  - ratings (list)")
+    print(f"  - confidences (list)")
+    print(f"  - soundness (list)")
+    print(f"  - presentation (list)")
+    print(f"  - contribution (list)")
+    print(f"  - avg_rating, min_rating, max_rating")
+    print(f"  - avg_confidence")
+    print("="*60)
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Metadata utilities for OpenReview submissions')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    check_parser = subparsers.add_parser('check', help='Check whether a submission received a rating')
+    check_parser.add_argument('metadata_file')
+    check_parser.add_argument('--number', type=int, default=25599, help='Submission number')
+    check_parser.add_argument('--rating', type=int, default=0, help='Rating to look for')
+
+    list_parser = subparsers.add_parser('list-no-rating', help='List submissions without reviews')
+    list_parser.add_argument('metadata_file')
+    list_parser.add_argument('--limit', type=int, default=50, help='Number of submissions to print')
+
+    extract_parser = subparsers.add_parser('extract', help='Extract ratings data to CSV/Parquet')
+    extract_parser.add_argument('metadata_file')
+    extract_parser.add_argument('output_file', nargs='?', default='ratings_data.csv')
+
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        check_rating(args.metadata_file, args.number, args.rating)
+    elif args.command == 'list-no-rating':
+        list_no_rating(args.metadata_file, args.limit)
+    elif args.command == 'extract':
+        extract(args.metadata_file, args.output_file)
+
+
+if __name__ == "__main__":
+    main()
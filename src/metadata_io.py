@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for reading submissions_metadata.json
+Uses orjson when available (several times faster than the stdlib parser)
+and ijson for streaming one submission at a time
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Fields kept by project_submission: submission content and review scores
+SUBMISSION_FIELDS = ('title', 'keywords', 'primary_area', 'venue', 'venueid')
+REVIEW_SCORE_FIELDS = ('rating', 'confidence', 'soundness', 'presentation', 'contribution')
+
+
+def parse_json(data):
+    """Decode a JSON document from bytes (e.g. a response body) with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_meta(path):
+    """Load the full submissions metadata list from a JSON file"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_meta(path, submissions):
+    """
+    Write the submissions metadata list to a JSON file
+    Output is compact (no indentation) to keep large dumps fast and small
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(submissions))
+        return
+
+    with open(path, 'w') as f:
+        json.dump(submissions, f, separators=(',', ':'))
+
+
+def iter_meta(path):
+    """
+    Yield submissions one at a time without holding the whole file in memory
+    Falls back to a full load when ijson is not installed
+    """
+    if ijson is None:
+        yield from load_meta(path)
+        return
+
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, 'item', use_float=True)
+
+
+def project_submission(note):
+    """
+    Reduce an OpenReview submission note to the fields the analysis scripts use
+    Only review replies (those with a rating and a confidence) are kept
+    """
+    projected = {key: note[key] for key in ('id', 'number') if key in note}
+    content = note.get('content', {})
+    projected['content'] = {key: content[key] for key in SUBMISSION_FIELDS if key in content}
+
+    details = note.get('details')
+    if details is not None and 'replies' in details:
+        reviews = []
+        for reply in details['replies']:
+            reply_content = reply.get('content', {})
+            if 'rating' in reply_content and 'confidence' in reply_content:
+                review = {key: reply[key] for key in ('id', 'invitations') if key in reply}
+                review['content'] = {key: reply_content[key]
+                                     for key in REVIEW_SCORE_FIELDS if key in reply_content}
+                reviews.append(review)
+        projected['details'] = {'replies': reviews}
+    return projected
+
+
+def append_jsonl(f, record):
+    """Append one record as a JSON line to a file opened in binary append mode"""
+    if orjson is not None:
+        f.write(orjson.dumps(record) + b'\n')
+    else:
+        f.write(json.dumps(record, separators=(',', ':')).encode() + b'\n')
+
+
+def iter_jsonl(path, opener=open):
+    """
+    Yield the records of a JSONL file (opener=gzip.open for a gzipped one)
+    Only the last line can be cut off by an interrupted write: an unterminated
+    last line is skipped with a warning, while a corrupt line anywhere else raises
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    with opener(path, 'rb') as f:
+        for line in f:
+            try:
+                record = loads(line)
+            except ValueError:
+                if line.endswith(b'\n'):
+                    raise
+                print(f"  ⚠ Skipping truncated last line of {path}")
+                return
+            yield record
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Shared OpenReview API client for the scrapers
+One pooled session, a shared request rate limit, and a single retry policy
+that honors Retry-After, so every scraper fetches notes the same way.
+"""
+
+import functools
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+from http_cache import cached_get_items
+from metadata_io import append_jsonl, ijson, iter_jsonl, parse_json, project_submission, save_meta
+
+NOTES_URL = "https://api2.openreview.net/notes"
+
+# Connections kept alive per host (enough for the concurrent forum fetches)
+MAX_CONNECTIONS = 25
+
+# Listing pages fetched concurrently once the total count is known
+PAGE_WORKERS = 8
+
+# Notes buffered before their pages are appended to the listing progress file
+SAVE_THRESHOLD = 1000
+
+# Request rate shared by all threads: steady requests/second and burst size
+RATE_LIMIT = 10
+RATE_BURST = 20
+
+# One pooled keep-alive session for every OpenReview call, so the TCP/TLS
+# handshake is paid once instead of per request
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=MAX_CONNECTIONS, max_retries=0))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: acquire() blocks until a request may be sent
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+
+BUCKET = TokenBucket(RATE_LIMIT, RATE_BURST)
+
+# Retry backoff: doubles per attempt up to the cap, then jittered by ±50%
+RETRY_BASE = 2
+RETRY_CAP = 60
+
+# Attempts per call before the last error is raised
+MAX_ATTEMPTS = 10
+
+# Transient failures worth retrying: dropped connections, timeouts, and bodies
+# cut off mid-stream (which surface as JSON decode errors, from orjson/json or
+# from ijson reading the raw response); HTTP errors are judged by status below
+RETRYABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    ProtocolError,
+    ReadTimeoutError,
+    json.JSONDecodeError,  # also orjson.JSONDecodeError
+) + ((ijson.JSONError,) if ijson is not None else ())
+
+
+def retry_wait(error: Exception, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a failed request
+    Honors the server's Retry-After header on 429/503 responses; otherwise
+    backs off exponentially (2s, 4s, ... capped at RETRY_CAP) with jitter, so
+    concurrent page fetches that failed together do not retry in lockstep
+    """
+    response = getattr(error, 'response', None)
+    if response is not None and response.status_code in (429, 503):
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+
+    return min(RETRY_CAP, RETRY_BASE ** attempt) * random.uniform(0.5, 1.5)
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether a failed request is worth retrying
+    Only transient errors (RETRYABLE_ERRORS) and HTTP 429/5xx responses are:
+    a 4xx other than 429 would fail again, and anything else is a bug
+    """
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        return response is not None and (response.status_code == 429 or response.status_code >= 500)
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+def retry_with_backoff(description: str):
+    """
+    Decorator: retry the call up to MAX_ATTEMPTS times, waiting retry_wait() in between
+    Non-retryable errors (see is_retryable) are raised immediately, and the
+    last error is raised once the attempts run out.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            attempt = 0
+            while True:
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    attempt += 1
+                    if not is_retryable(e) or attempt >= MAX_ATTEMPTS:
+                        raise
+                    wait_time = retry_wait(e, attempt)
+                    print(f"  ⚠ Error {description} (attempt {attempt}): {e}")
+                    print(f"  Retrying in {wait_time:.0f} seconds...")
+                    time.sleep(wait_time)
+        return wrapper
+    return decorator
+
+
+@retry_with_backoff('fetching submissions')
+def fetch_notes_page(params: dict, cache_dir: str = None, max_age: float = 0) -> list:
+    """
+    Fetch one page of notes, stream-parsed and projected to the analysed fields
+    A cached page younger than max_age seconds is read from disk instead
+    """
+    BUCKET.acquire()
+    return [project_submission(note) for note in
+            cached_get_items(SESSION, NOTES_URL, params, cache_dir, timeout=30, max_age=max_age)]
+
+
+@retry_with_backoff('fetching submission count')
+def fetch_note_count(invitation: str):
+    """
+    Total number of notes for an invitation, or None if the API does not report it
+    """
+    BUCKET.acquire()
+    response = SESSION.get(NOTES_URL, params={"invitation": invitation, "limit": 1}, timeout=30)
+    response.raise_for_status()
+    return parse_json(response.content).get('count')
+
+
+def fetch_all_notes(venue_id: str, output_dir: str = None,
+                    details: str = 'replies,invitation', limit: int = 500,
+                    cache_ttl: float = 0, use_cache: bool = True) -> list:
+    """
+    Fetch all submissions of a venue with replies embedded
+    Pages are requested concurrently when the API reports the total count.
+    If output_dir is provided, fetched pages are appended to a gzipped JSONL
+    progress file as they arrive (every SAVE_THRESHOLD notes, and whenever the
+    listing stops early), so an interrupted scrape keeps what it fetched and the
+    next run only requests the missing pages. submissions_metadata.json is written
+    once the listing is complete, and the progress file is then removed.
+    Listing pages are also cached under output_dir/.http_cache (unless use_cache
+    is off): pages younger than cache_ttl seconds are reused without a request,
+    older ones are revalidated with their ETag.
+    """
+    if not output_dir:
+        return _fetch_pages(venue_id, details, limit, None, 0)
+
+    progress_file = os.path.join(output_dir, 'submissions_metadata.jsonl.gz')
+    cache_dir = os.path.join(output_dir, '.http_cache') if use_cache else None
+    all_notes = _fetch_pages(venue_id, details, limit, cache_dir, cache_ttl, progress_file)
+
+    submissions_file = os.path.join(output_dir, 'submissions_metadata.json')
+    save_meta(submissions_file, all_notes)
+    print(f"  ✓ Saved to {submissions_file}")
+    if os.path.exists(progress_file):
+        os.remove(progress_file)
+    return all_notes
+
+
+def _load_progress(progress_file: str, limit: int) -> dict:
+    """
+    Listing pages saved by an earlier, interrupted run: offset -> notes
+    Pages saved with another page size are ignored, and a later copy of a page
+    replaces an earlier one. A gzip member cut off mid-append ends the file.
+    """
+    pages = {}
+    if not progress_file or not os.path.exists(progress_file):
+        return pages
+    try:
+        for record in iter_jsonl(progress_file, opener=gzip.open):
+            if record.get('limit') == limit:
+                pages[record['offset']] = record['notes']
+    except EOFError:
+        print(f"  ⚠ Skipping the interrupted last write of {progress_file}")
+    return pages
+
+
+def _save_progress(progress_file: str, unsaved: dict, limit: int, force: bool = False):
+    """
+    Append buffered pages (offset -> notes) to the gzipped JSONL progress file
+    One line per page, so each save costs O(batch) rather than rewriting the file.
+    Only flushes once SAVE_THRESHOLD notes are pending unless force is set; the
+    buffer is emptied in place.
+    """
+    if not progress_file or not unsaved:
+        return
+    if not force and sum(len(notes) for notes in unsaved.values()) < SAVE_THRESHOLD:
+        return
+    with gzip.open(progress_file, 'ab') as f:
+        for offset, notes in unsaved.items():
+            append_jsonl(f, {'offset': offset, 'limit': limit, 'notes': notes})
+    unsaved.clear()
+
+
+def _fetch_pages(venue_id: str, details: str, limit: int, cache_dir: str, cache_ttl: float,
+                 progress_file: str = None) -> list:
+    """
+    Page through the venue's submissions; see fetch_all_notes
+    Full pages saved in progress_file are reused; the last page (and anything
+    past the reported count) may still grow, so it is always requested again and
+    revalidated rather than reused within cache_ttl. Pages not yet in the
+    progress file are flushed to it if the listing fails or is interrupted.
+    """
+    unsaved = {}  # fetched pages not yet in the progress file
+    try:
+        params = {
+            "invitation": f"{venue_id}/-/Submission",
+            "details": details,
+            "limit": limit,  # Smaller batches to avoid timeouts
+            "offset": 0
+        }
+
+        # Only full pages are final; a short one was the end of the listing back then
+        saved = {offset: notes for offset, notes in _load_progress(progress_file, limit).items()
+                 if len(notes) == limit}
+        if saved:
+            print(f"Resuming with {len(saved) * limit} submissions saved by an interrupted run")
+
+        all_notes = []
+
+        print(f"Fetching submissions from {venue_id}...")
+
+        # With the total known up front, every missing page is requested concurrently
+        total = fetch_note_count(params['invitation'])
+        if total:
+            offsets = list(range(0, total, limit))
+            pages = {offset: saved[offset] for offset in offsets[:-1] if offset in saved}
+            fetched = sum(len(notes) for notes in pages.values())
+            with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+                futures = {executor.submit(fetch_notes_page, {**params, 'offset': offset}, cache_dir,
+                                           cache_ttl if offset != offsets[-1] else 0): offset
+                           for offset in offsets if offset not in pages}
+                for future in as_completed(futures):
+                    offset = futures[future]
+                    notes = pages[offset] = unsaved[offset] = future.result()
+                    fetched += len(notes)
+                    print(f"Fetched {fetched} submissions so far...")
+                    _save_progress(progress_file, unsaved, limit)
+
+            # Pages are reassembled in offset order
+            all_notes = [note for offset in offsets for note in pages[offset]]
+            if len(pages[offsets[-1]]) < limit:
+                print(f"✓ Reached end of submissions")
+                return all_notes
+            params['offset'] = offsets[-1] + limit
+
+        # Page sequentially past the reported count (or when it is unknown)
+        while True:
+            notes = saved.get(params['offset'])
+            if notes is None:
+                notes = unsaved[params['offset']] = fetch_notes_page(dict(params), cache_dir)
+                _save_progress(progress_file, unsaved, limit)
+            if not notes:
+                return all_notes
+
+            all_notes.extend(notes)
+            print(f"Fetched {len(all_notes)} submissions so far...")
+
+            # Check if there are more results
+            if len(notes) < limit:
+                print(f"✓ Reached end of submissions")
+                return all_notes
+
+            params['offset'] += limit
+    except BaseException:
+        _save_progress(progress_file, unsaved, limit, force=True)
+        raise
@@ -4,23 +4,42 @@ Generate decision-related visualizations for conference submissions.
 Only generates plots if decision information is available in the data.
 
 Usage:
-    python3 src/plot_decisions.py <ratings_csv> <output_dir>
+    python3 src/plot_decisions.py <ratings_csv|ratings_parquet> <output_dir>
     
 Example:
     python3 src/plot_decisions.py iclr_2025/iclr_2025_v1/ratings_data.csv outputs/iclr_2025/
+    python3 src/plot_decisions.py iclr_2025/iclr_2025_v1/ratings_data.parquet outputs/iclr_2025/
 """
 
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # File output only, no GUI backend
 import matplotlib.pyplot as plt
 import seaborn as sns
 import sys
 import os
 import numpy as np
 
+# Low-cardinality string columns, loaded as categories (integer codes)
+CATEGORY_COLUMNS = {'primary_area': 'category', 'decision': 'category', 'decision_type': 'category'}
+
 # Set style
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
+# Shared label/title/legend fonts, set once instead of per call
+plt.rcParams.update({
+    'axes.labelweight': 'bold',
+    'axes.titleweight': 'bold',
+    'axes.labelsize': 12,
+    'axes.titlesize': 14,
+    'legend.fontsize': 11,
+})
+
+# Merge sub-pixel path segments when rendering (violin outlines, histogram edges)
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+
 
 def check_decisions_available(df):
     """Check if decision information is available in the dataframe"""
@@ -36,17 +55,16 @@ def check_decisions_available(df):
     return len(non_pending) > 0
 
 
-def plot_decision_distribution(df, output_dir):
+def plot_decision_distribution(df_decided, output_dir):
     """Plot overall decision distribution - one bar per decision type with counts"""
-    # Filter out pending decisions
-    df_decided = df[df['decision'] != 'Pending'].copy()
-    
     if len(df_decided) == 0:
         print("  ⚠ No decided submissions found, skipping decision distribution")
         return
     
     # Get decision type counts and sort by count
+    # (categorical counts include unobserved types such as Pending; drop them)
     decision_type_counts = df_decided['decision_type'].value_counts().sort_values(ascending=False)
+    decision_type_counts = decision_type_counts[decision_type_counts > 0]
     
     # Define colors for each decision type
     colors_type = {
@@ -71,8 +89,8 @@ def plot_decision_distribution(df, output_dir):
     # Set labels
     ax.set_xticks(range(len(decision_type_counts)))
     ax.set_xticklabels(decision_type_counts.index, fontsize=13, fontweight='bold')
-    ax.set_ylabel('Number of Submissions', fontsize=14, fontweight='bold')
-    ax.set_title('Decision Distribution', fontsize=16, fontweight='bold', pad=20)
+    ax.set_ylabel('Number of Submissions', fontsize=14)
+    ax.set_title('Decision Distribution', fontsize=16, pad=20)
     ax.grid(axis='y', alpha=0.3, linestyle='--')
     
     # Add counts and percentages on bars
@@ -90,19 +108,17 @@ def plot_decision_distribution(df, output_dir):
             verticalalignment='top', horizontalalignment='right',
             bbox=dict(boxstyle='round', facecolor='white', alpha=0.9, edgecolor='black', linewidth=1.5))
     
-    plt.tight_layout()
+    # Layout is solved once at draw time; no second bbox_inches='tight' render pass
+    fig.set_layout_engine('tight')
     output_path = os.path.join(output_dir, 'decision_distribution.png')
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.savefig(output_path, dpi=300)
     plt.close()
     
     print(f"  ✓ Saved: {output_path}")
 
 
-def plot_rating_by_decision(df, output_dir):
-    """Plot rating distributions by decision type"""
-    # Filter out pending and submissions without ratings
-    df_decided = df[(df['decision'] != 'Pending') & (df['avg_rating'].notna())].copy()
-    
+def plot_rating_by_decision(df_decided, output_dir):
+    """Plot rating distributions by decision type (decided submissions with ratings)"""
     if len(df_decided) == 0:
         print("  ⚠ No decided submissions with ratings found, skipping rating by decision")
         return
@@ -111,12 +127,13 @@ def plot_rating_by_decision(df, output_dir):
     
     # Order decision types
     decision_order = ['Oral', 'Spotlight', 'Poster', 'Reject', 'Desk Reject', 'Withdrawn']
-    decision_types_present = [d for d in decision_order if d in df_decided['decision_type'].values]
+    grouped = {dt: ratings.to_numpy() for dt, ratings in df_decided.groupby('decision_type', observed=True)['avg_rating']}
+    decision_types_present = [d for d in decision_order if d in grouped]
+    ratings_by_type = [grouped[dt] for dt in decision_types_present]
     
     # Create violin plot
     parts = ax.violinplot(
-        [df_decided[df_decided['decision_type'] == dt]['avg_rating'].values 
-         for dt in decision_types_present],
+        ratings_by_type,
         positions=range(len(decision_types_present)),
         widths=0.7,
         showmeans=True,
@@ -139,8 +156,7 @@ def plot_rating_by_decision(df, output_dir):
     
     # Add box plots on top
     box_parts = ax.boxplot(
-        [df_decided[df_decided['decision_type'] == dt]['avg_rating'].values 
-         for dt in decision_types_present],
+        ratings_by_type,
         positions=range(len(decision_types_present)),
         widths=0.3,
         patch_artist=True,
@@ -153,58 +169,47 @@ def plot_rating_by_decision(df, output_dir):
     
     ax.set_xticks(range(len(decision_types_present)))
     ax.set_xticklabels(decision_types_present, fontsize=12, fontweight='bold')
-    ax.set_ylabel('Average Rating', fontsize=12, fontweight='bold')
-    ax.set_xlabel('Decision Type', fontsize=12, fontweight='bold')
-    ax.set_title('Rating Distribution by Decision Type', fontsize=14, fontweight='bold', pad=20)
+    ax.set_ylabel('Average Rating')
+    ax.set_xlabel('Decision Type')
+    ax.set_title('Rating Distribution by Decision Type', pad=20)
     ax.grid(axis='y', alpha=0.3)
     
     # Add mean values
-    for i, dt in enumerate(decision_types_present):
-        mean_rating = df_decided[df_decided['decision_type'] == dt]['avg_rating'].mean()
-        count = len(df_decided[df_decided['decision_type'] == dt])
+    for i, ratings in enumerate(ratings_by_type):
+        mean_rating = ratings.mean()
+        count = len(ratings)
         ax.text(i, ax.get_ylim()[1] * 0.95, f'μ={mean_rating:.2f}\nn={count:,}',
                 ha='center', va='top', fontsize=9, fontweight='bold',
                 bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
     
-    plt.tight_layout()
+    fig.set_layout_engine('tight')
     output_path = os.path.join(output_dir, 'rating_by_decision.png')
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.savefig(output_path, dpi=300)
     plt.close()
     
     print(f"  ✓ Saved: {output_path}")
 
 
-def plot_acceptance_rate_by_area(df, output_dir, min_submissions=50):
+def plot_acceptance_rate_by_area(df_decided, output_dir, min_submissions=50):
     """Plot acceptance rates by research area"""
-    # Filter decided submissions
-    df_decided = df[df['decision'] != 'Pending'].copy()
-    
     if len(df_decided) == 0:
         print("  ⚠ No decided submissions found, skipping acceptance by area")
         return
     
-    # Calculate acceptance rates by area
-    area_stats = []
-    for area in df_decided['primary_area'].unique():
-        area_df = df_decided[df_decided['primary_area'] == area]
-        total = len(area_df)
-        
-        if total >= min_submissions:
-            accepted = len(area_df[area_df['decision'] == 'Accept'])
-            acceptance_rate = (accepted / total) * 100
-            area_stats.append({
-                'area': area,
-                'total': total,
-                'accepted': accepted,
-                'acceptance_rate': acceptance_rate
-            })
-    
-    if not area_stats:
+    # Calculate acceptance rates by area in one groupby pass (areas in order of appearance)
+    area_stats = (df_decided.assign(_accepted=(df_decided['decision'] == 'Accept').astype('int64'))
+                  .groupby('primary_area', sort=False, observed=True)
+                  .agg(total=('_accepted', 'size'), accepted=('_accepted', 'sum')))
+    area_stats['acceptance_rate'] = (area_stats['accepted'] / area_stats['total']) * 100
+    area_stats = area_stats[area_stats['total'] >= min_submissions]
+    
+    if len(area_stats) == 0:
         print(f"  ⚠ No areas with ≥{min_submissions} submissions, skipping acceptance by area")
         return
     
     # Convert to dataframe and sort
-    area_df = pd.DataFrame(area_stats).sort_values('acceptance_rate', ascending=True)
+    area_df = (area_stats.rename_axis('area').reset_index()
+               .sort_values('acceptance_rate', ascending=True))
     
     # Plot
     fig, ax = plt.subplots(figsize=(12, max(8, len(area_df) * 0.4)))
@@ -219,8 +224,8 @@ def plot_acceptance_rate_by_area(df, output_dir, min_submissions=50):
     labels = [area[:60] + '...' if len(area) > 60 else area for area in area_df['area'].values]
     ax.set_yticklabels(labels, fontsize=10)
     
-    ax.set_xlabel('Acceptance Rate (%)', fontsize=12, fontweight='bold')
-    ax.set_title('Acceptance Rate by Research Area', fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Acceptance Rate (%)')
+    ax.set_title('Acceptance Rate by Research Area', pad=20)
     ax.grid(axis='x', alpha=0.3)
     
     # Add percentage labels
@@ -234,20 +239,18 @@ def plot_acceptance_rate_by_area(df, output_dir, min_submissions=50):
     overall_acceptance = (df_decided['decision'] == 'Accept').sum() / len(df_decided) * 100
     ax.axvline(overall_acceptance, color='red', linestyle='--', linewidth=2, alpha=0.7,
                label=f'Overall: {overall_acceptance:.1f}%')
-    ax.legend(fontsize=11, loc='lower right')
+    ax.legend(loc='lower right')
     
-    plt.tight_layout()
+    fig.set_layout_engine('tight')
     output_path = os.path.join(output_dir, 'acceptance_rate_by_area.png')
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.savefig(output_path, dpi=300)
     plt.close()
     
     print(f"  ✓ Saved: {output_path}")
 
 
-def plot_rating_threshold_analysis(df, output_dir):
-    """Analyze rating thresholds for different decision types"""
-    df_decided = df[(df['decision'] != 'Pending') & (df['avg_rating'].notna())].copy()
-    
+def plot_rating_threshold_analysis(df_decided, output_dir):
+    """Analyze rating thresholds for different decision types (decided submissions with ratings)"""
     if len(df_decided) == 0:
         print("  ⚠ No decided submissions with ratings, skipping threshold analysis")
         return
@@ -263,33 +266,40 @@ def plot_rating_threshold_analysis(df, output_dir):
     fig, ax = plt.subplots(figsize=(14, 8))
     
     # Create overlapping histograms
+    # (binned once with NumPy and drawn as one step patch each, not one Rectangle per bar)
     bins = np.arange(1, 10.5, 0.25)
-    ax.hist(rejected, bins=bins, alpha=0.6, label='Rejected', color='#e74c3c', edgecolor='black')
-    ax.hist(accepted, bins=bins, alpha=0.6, label='Accepted', color='#2ecc71', edgecolor='black')
+    rejected_counts, _ = np.histogram(rejected, bins=bins)
+    accepted_counts, _ = np.histogram(accepted, bins=bins)
+    ax.stairs(rejected_counts, bins, fill=True, alpha=0.6, label='Rejected',
+              facecolor='#e74c3c', edgecolor='black', linewidth=1)
+    ax.stairs(accepted_counts, bins, fill=True, alpha=0.6, label='Accepted',
+              facecolor='#2ecc71', edgecolor='black', linewidth=1)
     
     # Add vertical lines for means
-    ax.axvline(rejected.mean(), color='#c0392b', linestyle='--', linewidth=2,
-               label=f'Reject Mean: {rejected.mean():.2f}')
-    ax.axvline(accepted.mean(), color='#27ae60', linestyle='--', linewidth=2,
-               label=f'Accept Mean: {accepted.mean():.2f}')
-    
-    ax.set_xlabel('Average Rating', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Number of Submissions', fontsize=12, fontweight='bold')
-    ax.set_title('Rating Distribution: Accepted vs Rejected', fontsize=14, fontweight='bold', pad=20)
-    ax.legend(fontsize=11, loc='upper right')
+    accepted_mean = accepted.mean()
+    rejected_mean = rejected.mean()
+    ax.axvline(rejected_mean, color='#c0392b', linestyle='--', linewidth=2,
+               label=f'Reject Mean: {rejected_mean:.2f}')
+    ax.axvline(accepted_mean, color='#27ae60', linestyle='--', linewidth=2,
+               label=f'Accept Mean: {accepted_mean:.2f}')
+    
+    ax.set_xlabel('Average Rating')
+    ax.set_ylabel('Number of Submissions')
+    ax.set_title('Rating Distribution: Accepted vs Rejected', pad=20)
+    ax.legend(loc='upper right')
     ax.grid(axis='y', alpha=0.3)
     
     # Add statistics text
-    stats_text = f"""Accept: n={len(accepted):,}, μ={accepted.mean():.2f}, σ={accepted.std():.2f}
-Reject: n={len(rejected):,}, μ={rejected.mean():.2f}, σ={rejected.std():.2f}"""
+    stats_text = f"""Accept: n={len(accepted):,}, μ={accepted_mean:.2f}, σ={accepted.std():.2f}
+Reject: n={len(rejected):,}, μ={rejected_mean:.2f}, σ={rejected.std():.2f}"""
     
     ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
             fontsize=10, verticalalignment='top',
             bbox=dict(boxstyle='round', facecolor='white', alpha=0.9))
     
-    plt.tight_layout()
+    fig.set_layout_engine('tight')
     output_path = os.path.join(output_dir, 'rating_threshold_analysis.png')
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.savefig(output_path, dpi=300)
     plt.close()
     
     print(f"  ✓ Saved: {output_path}")
@@ -301,9 +311,12 @@ def main(ratings_file, output_dir):
     print("Decision Analysis Visualizations")
     print("="*60)
     
-    # Load data
+    # Load data (typed Parquet copy from extract_ratings.py if given, else CSV)
     print(f"\nLoading data from {ratings_file}...")
-    df = pd.read_csv(ratings_file)
+    if ratings_file.endswith('.parquet'):
+        df = pd.read_parquet(ratings_file)
+    else:
+        df = pd.read_csv(ratings_file, dtype=CATEGORY_COLUMNS)
     print(f"✓ Loaded {len(df):,} submissions")
     
     # Check if decisions are available
@@ -318,24 +331,25 @@ def main(ratings_file, output_dir):
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
     
-    # Count decided submissions
-    decided_count = len(df[df['decision'] != 'Pending'])
-    print(f"  Decided submissions: {decided_count:,} / {len(df):,}")
+    # Filter once: decided submissions, and those of them with ratings
+    df_decided = df[(df['decision'] != 'Pending').to_numpy()]
+    df_rated = df_decided[df_decided['avg_rating'].notna().to_numpy()]
+    print(f"  Decided submissions: {len(df_decided):,} / {len(df):,}")
     
     print("\nGenerating decision visualizations...")
     
     # Generate plots
     print("\n1. Decision distribution...")
-    plot_decision_distribution(df, output_dir)
+    plot_decision_distribution(df_decided, output_dir)
     
     print("\n2. Rating by decision type...")
-    plot_rating_by_decision(df, output_dir)
+    plot_rating_by_decision(df_rated, output_dir)
     
     print("\n3. Acceptance rate by area...")
-    plot_acceptance_rate_by_area(df, output_dir)
+    plot_acceptance_rate_by_area(df_decided, output_dir)
     
     print("\n4. Rating threshold analysis...")
-    plot_rating_threshold_analysis(df, output_dir)
+    plot_rating_threshold_analysis(df_rated, output_dir)
     
     print("\n" + "="*60)
     print("✅ Decision visualizations complete!")
@@ -345,7 +359,7 @@ def main(ratings_file, output_dir):
 
 if __name__ == "__main__":
     if len(sys.argv) != 3:
-        print("Usage: python3 src/plot_decisions.py <ratings_csv> <output_dir>")
+        print("Usage: python3 src/plot_decisions.py <ratings_csv|ratings_parquet> <output_dir>")
         print("\nExample:")
         print("  python3 src/plot_decisions.py iclr_2025/iclr_2025_v1/ratings_data.csv outputs/iclr_2025/")
         sys.exit(1)
@@ -3,184 +3,276 @@
 Generate rating distribution plots for each primary area
 """
 
+import os
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # File output only, also inherited by the plot worker processes
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from matplotlib.colors import LinearSegmentedColormap
 
+from ratings_io import load_ratings
+
 # Set style
 plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
 
-def plot_area_rating_distribution(df, area_name, output_dir='outputs'):
+# Bar color gradient: blue -> yellow -> green (low to high rating)
+RATING_COLORS = ['#2166ac', '#4393c3', '#92c5de', '#fef0a5', '#f4e842', '#d7ee5e', '#a6d96a', '#66bd63', '#1a9850']
+RATING_CMAP = LinearSegmentedColormap.from_list('rating_colors', RATING_COLORS, N=100)
+
+# Path separators and spaces in area names become underscores in plot filenames
+FILENAME_TRANSLATION = str.maketrans({'/': '_', '\\': '_', ' ': '_'})
+
+# Draft resolution by default; pass dpi=300 for publication figures
+DEFAULT_DPI = 150
+
+# Rating scale reference shown in the lower right corner of every plot
+RATING_SCALE_TEXT = (
+    'Rating Scale:\n'
+    '  2: Strong Reject\n'
+    '  4: Reject\n'
+    '  5: Marginally Below\n'
+    '  6: Weak Accept\n'
+    '  8: Accept\n'
+    ' 10: Strong Accept'
+)
+
+# One Figure/Axes per process; the per-area artists are swapped out between
+# plots while the axis labels, text boxes and styling persist
+_figure = None
+_axes = None
+_stats_box = None
+_area_artists = []
+
+
+def get_area_axes():
     """
-    Create rating distribution plot for a specific area
+    Return the shared (Figure, Axes, statistics text box) with the previous area removed
+    The labels, rating scale box, grid and inverted y axis are set up only once.
+    """
+    global _figure, _axes, _stats_box
+    if _figure is None:
+        _figure, _axes = plt.subplots(figsize=(14, 20))
+        
+        # Labels
+        _axes.set_ylabel('Average Rating (each bar = unique rating value)', 
+                         fontsize=18, fontweight='bold', labelpad=10)
+        _axes.set_xlabel('Number of Submissions', fontsize=18, fontweight='bold')
+        
+        # Statistics box, filled in per area
+        _stats_box = _axes.text(0.98, 0.98, '',
+                                transform=_axes.transAxes,
+                                fontsize=14,
+                                verticalalignment='top',
+                                horizontalalignment='right',
+                                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.85, edgecolor='black', linewidth=1.5),
+                                family='monospace',
+                                zorder=15)
+        
+        # Rating scale
+        _axes.text(0.98, 0.02, RATING_SCALE_TEXT,
+                   transform=_axes.transAxes,
+                   fontsize=13,
+                   verticalalignment='bottom',
+                   horizontalalignment='right',
+                   bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8, edgecolor='black', linewidth=1.5),
+                   family='monospace',
+                   zorder=15)
+        
+        # Adjust tick label size
+        _axes.tick_params(axis='both', labelsize=14)
+        
+        # Grid styling
+        _axes.grid(True, alpha=0.3, linestyle='--', linewidth=0.7, axis='x')
+        _axes.set_axisbelow(True)
+        
+        # Invert y-axis (autoscaling keeps the orientation)
+        _axes.invert_yaxis()
+    else:
+        for artist in _area_artists:
+            artist.remove()
+        _area_artists.clear()
+        _axes.relim()
+        # tight_layout starts from the current margins, so start from the defaults again
+        _figure.subplots_adjust(**{side: plt.rcParams[f'figure.subplot.{side}']
+                                   for side in ('left', 'right', 'bottom', 'top')})
+    return _figure, _axes, _stats_box
+
+
+def plot_area_rating_distribution(area_name, stats, unique_ratings, counts, output_dir='outputs',
+                                  dpi=DEFAULT_DPI):
     """
-    # Filter to this area
-    area_df = df[df['primary_area'] == area_name].copy()
-    rated_df = area_df[area_df['avg_rating'].notna()].copy()
+    Create rating distribution plot for a specific area
     
-    if len(rated_df) == 0:
-        print(f"  ⚠ Skipping {area_name}: No ratings")
-        return
+    Args:
+        area_name: Primary area to plot
+        stats: Precomputed rating statistics of the area (row of area_rating_stats)
+        unique_ratings: Sorted rating values present in the area
+        counts: Number of submissions for each of unique_ratings
+        output_dir: Directory to save plots
+        dpi: Output resolution (300 for publication figures)
     
-    # Get value counts and sort
-    rating_counts = rated_df['avg_rating'].value_counts().sort_index()
-    unique_ratings = rating_counts.index.values
-    counts = rating_counts.values
+    Returns:
+        Path of the saved plot, or None if the area has no ratings
+    """
+    if stats['count'] == 0:
+        return None
     
     # Calculate cumulative percentages
-    total = len(rated_df)
-    cumsum = np.cumsum(counts)
-    cumulative_pct = (cumsum / total) * 100
-    
-    # Calculate statistics
-    mean_rating = rated_df['avg_rating'].mean()
-    median_rating = rated_df['avg_rating'].median()
-    std_rating = rated_df['avg_rating'].std()
+    total = int(stats['count'])
+    # Integer running counts, scaled to percentages in one pass
+    cumulative_pct = np.cumsum(counts) * (100.0 / total)
     
-    # Create figure
-    fig, ax = plt.subplots(figsize=(14, 20))
+    mean_rating = stats['mean']
+    median_rating = stats['median']
+    std_rating = stats['std']
     
-    # Create horizontal bars
-    bars = ax.barh(range(len(unique_ratings)), counts, 
-                    height=0.8, 
-                    edgecolor='black',
-                    linewidth=0.5,
-                    alpha=0.85)
-    
-    # Color gradient: blue -> yellow -> green
-    colors_list = ['#2166ac', '#4393c3', '#92c5de', '#fef0a5', '#f4e842', '#d7ee5e', '#a6d96a', '#66bd63', '#1a9850']
-    n_bins = 100
-    cmap = LinearSegmentedColormap.from_list('rating_colors', colors_list, N=n_bins)
+    # Shared figure, emptied of the previous area
+    fig, ax, stats_box = get_area_axes()
     
     # Normalize ratings to [0, 1] for colormap
     min_rating = unique_ratings.min()
     max_rating = unique_ratings.max()
+    if max_rating > min_rating:
+        norm_ratings = (unique_ratings - min_rating) / (max_rating - min_rating)
+    else:
+        norm_ratings = np.full(len(unique_ratings), 0.5)
     
-    for i, rating in enumerate(unique_ratings):
-        norm_rating = (rating - min_rating) / (max_rating - min_rating) if max_rating > min_rating else 0.5
-        bars[i].set_facecolor(cmap(norm_rating))
-    
-    # Add cumulative percentage labels with count
-    max_count = max(counts)
-    for i, (count, cum_pct) in enumerate(zip(counts, cumulative_pct)):
-        label = f'({count}) {cum_pct:.1f}%'
-        
-        if count > max_count * 0.05:
-            ax.text(count + max_count * 0.01, i, label, 
-                   ha='left', va='center', 
-                   fontsize=12, fontweight='bold')
-        else:
-            ax.text(count + max_count * 0.005, i, label, 
-                   ha='left', va='center', 
-                   fontsize=11, fontweight='bold',
-                   color='darkred')
+    # Create horizontal bars, colored by rating value in one call
+    bars = ax.barh(range(len(unique_ratings)), counts, 
+                    height=0.8, 
+                    color=RATING_CMAP(norm_ratings),
+                    edgecolor='black',
+                    linewidth=0.5,
+                    alpha=0.85,
+                    rasterized=True)
+    _area_artists.append(bars)
+    
+    # Add cumulative percentage labels with count; short bars (<= 5% of the
+    # longest) get a smaller dark red label closer to the bar end
+    labels = np.array([f'({count}) {cum_pct:.1f}%' for count, cum_pct in zip(counts, cumulative_pct)])
+    is_long = counts > max(counts) * 0.05
+    _area_artists.extend(ax.bar_label(bars, labels=np.where(is_long, labels, ''),
+                                      padding=6, fontsize=12, fontweight='bold'))
+    _area_artists.extend(ax.bar_label(bars, labels=np.where(is_long, '', labels),
+                                      padding=3, fontsize=11, fontweight='bold', color='darkred'))
     
     # Set y-axis labels
     ax.set_yticks(range(len(unique_ratings)))
-    ax.set_yticklabels([f'{r:.2f}' if r != int(r) else f'{int(r)}' 
-                        for r in unique_ratings], 
+    whole_ratings = unique_ratings.astype(int)
+    ax.set_yticklabels(np.where(unique_ratings == whole_ratings,
+                                np.char.mod('%d', whole_ratings),
+                                np.char.mod('%.2f', unique_ratings)),
                        fontsize=14)
     
     # Add horizontal lines for mean and median
     mean_idx = np.searchsorted(unique_ratings, mean_rating)
     median_idx = np.searchsorted(unique_ratings, median_rating)
     
-    ax.axhline(mean_idx, color='red', linestyle='--', linewidth=2.5, 
-               label=f'Mean: {mean_rating:.2f}', alpha=0.8, zorder=10)
-    ax.axhline(median_idx, color='purple', linestyle='--', linewidth=2.5, 
-               label=f'Median: {median_rating:.2f}', alpha=0.8, zorder=10)
-    
-    # Labels and title
-    ax.set_ylabel('Average Rating (each bar = unique rating value)', 
-                  fontsize=18, fontweight='bold', labelpad=10)
-    ax.set_xlabel('Number of Submissions', fontsize=18, fontweight='bold')
+    _area_artists.append(ax.axhline(mean_idx, color='red', linestyle='--', linewidth=2.5, 
+                                    label=f'Mean: {mean_rating:.2f}', alpha=0.8, zorder=10))
+    _area_artists.append(ax.axhline(median_idx, color='purple', linestyle='--', linewidth=2.5, 
+                                    label=f'Median: {median_rating:.2f}', alpha=0.8, zorder=10))
     
     # Truncate long area names for title
     display_name = area_name if len(area_name) <= 60 else area_name[:57] + '...'
     ax.set_title(f'Rating Distribution - {display_name}\n' + 
-                 f'n = {len(rated_df):,} submissions | Cumulative % shown',
+                 f'n = {total:,} submissions | Cumulative % shown',
                  fontsize=22, fontweight='bold', pad=20)
     
-    # Add statistics box
-    stats_text = (
+    # Fill in the statistics box
+    stats_box.set_text(
         f'Statistics:\n'
         f'───────────────\n'
         f'Mean:      {mean_rating:.3f}\n'
         f'Median:    {median_rating:.3f}\n'
         f'Std Dev:   {std_rating:.3f}\n'
-        f'Min:       {rated_df["avg_rating"].min():.2f}\n'
-        f'Max:       {rated_df["avg_rating"].max():.2f}\n'
+        f'Min:       {stats["min"]:.2f}\n'
+        f'Max:       {stats["max"]:.2f}\n'
         f'───────────────\n'
-        f'Q1 (25%):  {rated_df["avg_rating"].quantile(0.25):.2f}\n'
-        f'Q3 (75%):  {rated_df["avg_rating"].quantile(0.75):.2f}\n'
-        f'IQR:       {rated_df["avg_rating"].quantile(0.75) - rated_df["avg_rating"].quantile(0.25):.2f}\n'
+        f'Q1 (25%):  {stats["q1"]:.2f}\n'
+        f'Q3 (75%):  {stats["q3"]:.2f}\n'
+        f'IQR:       {stats["q3"] - stats["q1"]:.2f}\n'
         f'───────────────\n'
         f'Unique Values: {len(unique_ratings)}'
     )
     
-    ax.text(0.98, 0.98, stats_text,
-            transform=ax.transAxes,
-            fontsize=14,
-            verticalalignment='top',
-            horizontalalignment='right',
-            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.85, edgecolor='black', linewidth=1.5),
-            family='monospace',
-            zorder=15)
-    
-    # Add rating scale
-    scale_text = (
-        'Rating Scale:\n'
-        '  2: Strong Reject\n'
-        '  4: Reject\n'
-        '  5: Marginally Below\n'
-        '  6: Weak Accept\n'
-        '  8: Accept\n'
-        ' 10: Strong Accept'
-    )
-    
-    ax.text(0.98, 0.02, scale_text,
-            transform=ax.transAxes,
-            fontsize=13,
-            verticalalignment='bottom',
-            horizontalalignment='right',
-            bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8, edgecolor='black', linewidth=1.5),
-            family='monospace',
-            zorder=15)
-    
     # Legend
     ax.legend(loc='lower right', fontsize=14, framealpha=0.95, 
               edgecolor='black', fancybox=True, bbox_to_anchor=(1.0, 0.25))
     
-    # Adjust tick label size
-    ax.tick_params(axis='both', labelsize=14)
-    
-    # Grid styling
-    ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.7, axis='x')
-    ax.set_axisbelow(True)
-    
-    # Invert y-axis
-    ax.invert_yaxis()
-    
-    # Tight layout
-    plt.tight_layout()
+    # Tight layout already fits the labels, so savefig needs no bbox_inches='tight' pass
+    fig.tight_layout()
     
     # Save plot - sanitize filename
-    safe_name = area_name.replace('/', '_').replace('\\', '_').replace(' ', '_')
-    safe_name = safe_name[:100]  # Limit filename length
+    safe_name = area_name.translate(FILENAME_TRANSLATION)[:100]  # Limit filename length
     output_file = Path(output_dir) / f'rating_dist_{safe_name}.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"  ✓ Saved: {output_file.name}")
-    
-    plt.close()
+    fig.savefig(output_file, dpi=dpi, facecolor='white')
+    return output_file
+
+
+def _counts_quantile(counts_matrix, cum_counts, values, totals, q):
+    """
+    Linear-interpolated q-quantile of every row of an (area x rating) count matrix
+    Same result as Series.quantile (NumPy's 'linear' method) on the expanded ratings
+    """
+    position = (totals - 1) * q
+    lower = np.floor(position)
+    upper = np.minimum(lower + 1, totals - 1)
+    frac = position - lower
+    # Rating at sorted rank k is the first column whose cumulative count exceeds k
+    below = values[(cum_counts <= lower[:, None]).sum(axis=1)]
+    above = values[(cum_counts <= upper[:, None]).sum(axis=1)]
+    return np.where(frac >= 0.5,
+                    above - (above - below) * (1 - frac),
+                    below + (above - below) * frac)
+
+
+def area_rating_stats(df):
+    """
+    Per-area rating statistics and rating value counts from one counting pass
+    Areas and ratings are factorized and counted into an (area x rating) matrix
+    with a single np.bincount; every statistic is then derived from that small
+    matrix instead of reducing the ratings once per statistic.
+    Returns (stats, counts_matrix, ratings): stats has one row per area with
+    columns count/mean/median/std/min/max/q1/q3; counts_matrix[i, j] is the
+    number of submissions of area stats.index[i] rated ratings[j] (sorted).
+    """
+    area_codes, areas = pd.factorize(df['primary_area'], sort=True)
+    rating_codes, ratings = pd.factorize(df['avg_rating'], sort=True)
+    rated = (area_codes >= 0) & (rating_codes >= 0)
+    keys = area_codes[rated] * len(ratings) + rating_codes[rated]
+    counts_matrix = np.bincount(keys, minlength=len(areas) * len(ratings)).reshape(len(areas), len(ratings))
+    
+    values = np.asarray(ratings, dtype=np.float64)
+    totals = counts_matrix.sum(axis=1)
+    cum_counts = np.cumsum(counts_matrix, axis=1)
+    present = counts_matrix > 0
+    mean = counts_matrix @ values / totals
+    squared_dev = counts_matrix * (values - mean[:, None]) ** 2
+    
+    stats = pd.DataFrame({
+        'count': totals,
+        'mean': mean,
+        'median': _counts_quantile(counts_matrix, cum_counts, values, totals, 0.5),
+        'std': np.sqrt(squared_dev.sum(axis=1) / (totals - 1)),
+        'min': values[present.argmax(axis=1)],
+        'max': values[len(values) - 1 - present[:, ::-1].argmax(axis=1)],
+        'q1': _counts_quantile(counts_matrix, cum_counts, values, totals, 0.25),
+        'q3': _counts_quantile(counts_matrix, cum_counts, values, totals, 0.75),
+    }, index=pd.Index(areas, name='primary_area'))
+    
+    return stats, counts_matrix, np.asarray(ratings)
 
 
 def main(csv_file='data/ratings_data.csv', 
          output_dir='outputs',
-         min_submissions=50):
+         min_submissions=50,
+         workers=None,
+         dpi=DEFAULT_DPI):
     """
     Generate rating distribution plots for each primary area
     
@@ -188,21 +280,24 @@ def main(csv_file='data/ratings_data.csv',
         csv_file: Path to ratings CSV
         output_dir: Directory to save plots
         min_submissions: Minimum number of submissions to generate plot (default: 50)
+        workers: Number of plot worker processes (default: one per CPU)
+        dpi: Output resolution (default: 150; use 300 for publication figures)
     """
     print("="*60)
     print("Generating Rating Distribution by Primary Area")
     print("="*60)
     
     # Load data
-    df = pd.read_csv(csv_file)
+    df = load_ratings(csv_file, columns=['primary_area', 'avg_rating'])
     
     # Filter to submissions with reviews
-    df = df[df['avg_rating'].notna()].copy()
+    df.dropna(subset=['avg_rating'], inplace=True)
     
     print(f"\nLoaded {len(df):,} submissions with ratings")
     
-    # Get area counts
+    # Get area counts (a categorical column also lists areas with no rated rows)
     area_counts = df['primary_area'].value_counts()
+    area_counts = area_counts[area_counts > 0]
     
     # Filter areas with minimum submissions
     valid_areas = area_counts[area_counts >= min_submissions].index.tolist()
@@ -210,14 +305,33 @@ def main(csv_file='data/ratings_data.csv',
     print(f"Found {len(valid_areas)} areas with ≥{min_submissions} submissions")
     print(f"Generating plots...\n")
     
+    # All per-area statistics in one counting pass
+    stats, counts_matrix, ratings = area_rating_stats(df)
+    
+    # Each area's bars are the nonzero entries of its counts_matrix row
+    area_rows = counts_matrix[stats.index.get_indexer(valid_areas)]
+    present = area_rows > 0
+    
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    # Generate plot for each area
-    for i, area in enumerate(valid_areas, 1):
-        count = area_counts[area]
-        print(f"[{i}/{len(valid_areas)}] {area[:60]}... ({count} submissions)")
-        plot_area_rating_distribution(df, area, output_dir)
+    # Areas are independent figures, so render them in parallel worker processes;
+    # results come back in area order to keep the progress log stable
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        results = executor.map(plot_area_rating_distribution,
+                               valid_areas,
+                               [stats.loc[area] for area in valid_areas],
+                               [ratings[nonzero] for nonzero in present],
+                               [row[nonzero] for row, nonzero in zip(area_rows, present)],
+                               repeat(output_dir),
+                               repeat(dpi))
+        for i, (area, output_file) in enumerate(zip(valid_areas, results), 1):
+            count = area_counts[area]
+            print(f"[{i}/{len(valid_areas)}] {area[:60]}... ({count} submissions)")
+            if output_file is None:
+                print(f"  ⚠ Skipping {area}: No ratings")
+            else:
+                print(f"  ✓ Saved: {output_file.name}")
     
     print("\n" + "="*60)
     print(f"✅ Generated {len(valid_areas)} plots")
@@ -231,6 +345,8 @@ if __name__ == "__main__":
     csv_file = sys.argv[1] if len(sys.argv) > 1 else 'data/ratings_data.csv'
     output_dir = sys.argv[2] if len(sys.argv) > 2 else 'outputs'
     min_subs = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    dpi = int(sys.argv[5]) if len(sys.argv) > 5 else DEFAULT_DPI
     
-    main(csv_file, output_dir, min_subs)
+    main(csv_file, output_dir, min_subs, workers, dpi)
 
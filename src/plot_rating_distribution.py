@@ -4,100 +4,99 @@ Generate beautiful distribution plots for ICLR 2026 ratings data
 """
 
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # File output only, no GUI backend
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 from pathlib import Path
+from matplotlib.colors import LinearSegmentedColormap
+
+from ratings_io import load_ratings
 
 # Set style for publication-quality plots
 plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+
+# Draft resolution by default; pass dpi=300 for publication figures
+DEFAULT_DPI = 150
+
+# Percentiles computed for the summary (0 and 100 are the min and max)
+SUMMARY_PERCENTILES = [0, 10, 25, 50, 75, 90, 100]
+
+# Bar color gradient: blue -> yellow -> green (low to high rating)
+RATING_COLORS = ['#2166ac', '#4393c3', '#92c5de', '#fef0a5', '#f4e842', '#d7ee5e', '#a6d96a', '#66bd63', '#1a9850']
+RATING_CMAP = LinearSegmentedColormap.from_list('rating_colors', RATING_COLORS, N=100)
 
 def plot_avg_rating_distribution(csv_file='data/ratings_data.csv', 
-                                  output_dir='outputs'):
+                                  output_dir='outputs',
+                                  dpi=DEFAULT_DPI):
     """
     Create a comprehensive distribution plot for average ratings
     Each unique rating value gets its own bar with cumulative percentage
     """
     # Load data
-    df = pd.read_csv(csv_file)
+    df = load_ratings(csv_file, columns=['avg_rating'])
     
     # Filter to submissions with reviews
-    rated_df = df[df['avg_rating'].notna()].copy()
+    rated_df = df.dropna(subset=['avg_rating'])
     
     print(f"Loaded {len(rated_df):,} submissions with ratings")
     
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    # Get value counts for each unique rating and sort
-    rating_counts = rated_df['avg_rating'].value_counts().sort_index()
-    unique_ratings = rating_counts.index.values
-    counts = rating_counts.values
+    # Count each unique rating (np.unique returns them already sorted)
+    ratings = rated_df['avg_rating'].to_numpy()
+    unique_ratings, counts = np.unique(ratings, return_counts=True)
     
     # Calculate cumulative percentages
     total = len(rated_df)
-    cumsum = np.cumsum(counts)
-    cumulative_pct = (cumsum / total) * 100
+    # Integer running counts, scaled to percentages in one pass
+    cumulative_pct = np.cumsum(counts) * (100.0 / total)
     
     print(f"Number of unique rating values: {len(unique_ratings)}")
     
-    # Calculate statistics
-    mean_rating = rated_df['avg_rating'].mean()
-    median_rating = rated_df['avg_rating'].median()
-    std_rating = rated_df['avg_rating'].std()
+    # Calculate statistics; min, max and all reported percentiles share one sort
+    percentiles = dict(zip(SUMMARY_PERCENTILES, np.percentile(ratings, SUMMARY_PERCENTILES)))
+    mean_rating = ratings.mean()
+    median_rating = percentiles[50]
+    std_rating = ratings.std(ddof=1)
+    iqr = percentiles[75] - percentiles[25]
     
     # Create figure with larger size for horizontal layout
     fig, ax = plt.subplots(figsize=(14, 20))
     
-    # Create horizontal bars
-    bars = ax.barh(range(len(unique_ratings)), counts, 
-                    height=0.8, 
-                    edgecolor='black',
-                    linewidth=0.5,
-                    alpha=0.85)
-    
-    # Color-code bars with smooth gradient based on rating value
-    # Create colormap from blue (low) to yellow (middle) to green (high)
-    from matplotlib.colors import LinearSegmentedColormap
-    
-    # Define color gradient: blue -> cyan -> yellow -> yellow-green -> green
-    colors_list = ['#2166ac', '#4393c3', '#92c5de', '#fef0a5', '#f4e842', '#d7ee5e', '#a6d96a', '#66bd63', '#1a9850']
-    n_bins = 100
-    cmap = LinearSegmentedColormap.from_list('rating_colors', colors_list, N=n_bins)
-    
     # Normalize ratings to [0, 1] for colormap
     min_rating = unique_ratings.min()
     max_rating = unique_ratings.max()
+    if max_rating > min_rating:
+        norm_ratings = (unique_ratings - min_rating) / (max_rating - min_rating)
+    else:
+        norm_ratings = np.full(len(unique_ratings), 0.5)
     
-    for i, rating in enumerate(unique_ratings):
-        # Normalize rating to 0-1 range
-        norm_rating = (rating - min_rating) / (max_rating - min_rating)
-        bars[i].set_facecolor(cmap(norm_rating))
-    
-    # Add cumulative percentage labels with count on ALL bars (to the right of bars)
-    max_count = max(counts)
-    for i, (count, cum_pct) in enumerate(zip(counts, cumulative_pct)):
-        # Format: (count) percentage
-        label = f'({count}) {cum_pct:.1f}%'
-        
-        # For long bars, place label to the right; for short bars, also to the right
-        if count > max_count * 0.05:  # If bar is >5% of max width
-            # Place to right of bar
-            ax.text(count + max_count * 0.01, i, label, 
-                   ha='left', va='center', 
-                   fontsize=12, fontweight='bold')
-        else:
-            # For very short bars, place label to the right with smaller offset
-            ax.text(count + max_count * 0.005, i, label, 
-                   ha='left', va='center', 
-                   fontsize=11, fontweight='bold',
-                   color='darkred')
+    # Create horizontal bars, colored by rating value in one call
+    bars = ax.barh(range(len(unique_ratings)), counts, 
+                    height=0.8, 
+                    color=RATING_CMAP(norm_ratings),
+                    edgecolor='black',
+                    linewidth=0.5,
+                    alpha=0.85,
+                    rasterized=True)
+    
+    # Add cumulative percentage labels with count; short bars (<= 5% of the
+    # longest) get a smaller dark red label closer to the bar end
+    labels = np.array([f'({count}) {cum_pct:.1f}%' for count, cum_pct in zip(counts, cumulative_pct)])
+    is_long = counts > max(counts) * 0.05
+    ax.bar_label(bars, labels=np.where(is_long, labels, ''),
+                 padding=6, fontsize=12, fontweight='bold')
+    ax.bar_label(bars, labels=np.where(is_long, '', labels),
+                 padding=3, fontsize=11, fontweight='bold', color='darkred')
     
     # Set y-axis labels to show actual rating values (now vertical)
     ax.set_yticks(range(len(unique_ratings)))
-    ax.set_yticklabels([f'{r:.2f}' if r != int(r) else f'{int(r)}' 
-                        for r in unique_ratings], 
+    whole_ratings = unique_ratings.astype(int)
+    ax.set_yticklabels(np.where(unique_ratings == whole_ratings,
+                                np.char.mod('%d', whole_ratings),
+                                np.char.mod('%.2f', unique_ratings)),
                        fontsize=14)
     
     # Add horizontal lines for mean and median
@@ -124,12 +123,12 @@ def plot_avg_rating_distribution(csv_file='data/ratings_data.csv',
         f'Mean:      {mean_rating:.3f}\n'
         f'Median:    {median_rating:.3f}\n'
         f'Std Dev:   {std_rating:.3f}\n'
-        f'Min:       {rated_df["avg_rating"].min():.2f}\n'
-        f'Max:       {rated_df["avg_rating"].max():.2f}\n'
+        f'Min:       {percentiles[0]:.2f}\n'
+        f'Max:       {percentiles[100]:.2f}\n'
         f'───────────────\n'
-        f'Q1 (25%):  {rated_df["avg_rating"].quantile(0.25):.2f}\n'
-        f'Q3 (75%):  {rated_df["avg_rating"].quantile(0.75):.2f}\n'
-        f'IQR:       {rated_df["avg_rating"].quantile(0.75) - rated_df["avg_rating"].quantile(0.25):.2f}\n'
+        f'Q1 (25%):  {percentiles[25]:.2f}\n'
+        f'Q3 (75%):  {percentiles[75]:.2f}\n'
+        f'IQR:       {iqr:.2f}\n'
         f'───────────────\n'
         f'Unique Values: {len(unique_ratings)}'
     )
@@ -177,12 +176,12 @@ def plot_avg_rating_distribution(csv_file='data/ratings_data.csv',
     # Invert y-axis so lowest ratings are at bottom
     ax.invert_yaxis()
     
-    # Tight layout
+    # Tight layout already fits the labels, so savefig needs no bbox_inches='tight' pass
     plt.tight_layout()
     
     # Save plot
     output_file = Path(output_dir) / 'average_rating_distribution.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.savefig(output_file, dpi=dpi, facecolor='white')
     print(f"✅ Saved: {output_file}")
     
     plt.close()
@@ -196,20 +195,23 @@ def plot_avg_rating_distribution(csv_file='data/ratings_data.csv',
     print(f"\nCentral Tendency:")
     print(f"  Mean:   {mean_rating:.3f}")
     print(f"  Median: {median_rating:.3f}")
-    print(f"  Mode:   {rated_df['avg_rating'].mode().values[0]:.2f}")
+    print(f"  Mode:   {unique_ratings[np.argmax(counts)]:.2f}")
     print(f"\nSpread:")
     print(f"  Std Dev: {std_rating:.3f}")
-    print(f"  Range:   {rated_df['avg_rating'].min():.2f} - {rated_df['avg_rating'].max():.2f}")
-    print(f"  IQR:     {rated_df['avg_rating'].quantile(0.75) - rated_df['avg_rating'].quantile(0.25):.3f}")
+    print(f"  Range:   {percentiles[0]:.2f} - {percentiles[100]:.2f}")
+    print(f"  IQR:     {iqr:.3f}")
     print(f"\nPercentiles:")
     for p in [10, 25, 50, 75, 90]:
-        print(f"  {p:2d}th: {rated_df['avg_rating'].quantile(p/100):.2f}")
+        print(f"  {p:2d}th: {percentiles[p]:.2f}")
     
     # Rating categories
     print(f"\nRating Categories:")
-    reject = len(rated_df[rated_df['avg_rating'] < 5])
-    borderline = len(rated_df[(rated_df['avg_rating'] >= 5) & (rated_df['avg_rating'] < 6)])
-    accept = len(rated_df[rated_df['avg_rating'] >= 6])
+    # Counts below 5 and below 6 come from the sorted unique ratings, no rescans
+    cum_counts = np.concatenate(([0], np.cumsum(counts)))
+    below_5, below_6 = cum_counts[np.searchsorted(unique_ratings, [5.0, 6.0])]
+    reject = below_5
+    borderline = below_6 - below_5
+    accept = cum_counts[-1] - below_6
     
     print(f"  Clear Reject (< 5):        {reject:>5,} ({reject/len(rated_df)*100:>5.1f}%)")
     print(f"  Borderline (5-6):          {borderline:>5,} ({borderline/len(rated_df)*100:>5.1f}%)")
@@ -217,7 +219,7 @@ def plot_avg_rating_distribution(csv_file='data/ratings_data.csv',
     
     # Show top 10 most common rating values
     print(f"\nTop 10 Most Common Rating Values:")
-    top_ratings = rating_counts.sort_values(ascending=False).head(10)
+    top_ratings = pd.Series(counts, index=unique_ratings).sort_values(ascending=False).head(10)
     for rating, count in top_ratings.items():
         pct = count / total * 100
         cum_at_rating = cumulative_pct[unique_ratings.tolist().index(rating)]
@@ -231,5 +233,6 @@ if __name__ == "__main__":
     
     csv_file = sys.argv[1] if len(sys.argv) > 1 else 'data/ratings_data.csv'
     output_dir = sys.argv[2] if len(sys.argv) > 2 else 'outputs'
+    dpi = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_DPI
     
-    plot_avg_rating_distribution(csv_file, output_dir)
+    plot_avg_rating_distribution(csv_file, output_dir, dpi)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Shared loader for the ratings table written by extract_ratings.py or scrape_iclr.py
+Reads the typed Parquet copy those scripts write next to the CSV whenever it is
+up to date; the plot scripts never write next to their input
+"""
+
+import os
+
+import pandas as pd
+import pyarrow.csv as pacsv
+
+
+def ratings_parquet_path(csv_file):
+    """Parquet copy lives next to the CSV with the same stem (as extract_ratings.py writes it)"""
+    return os.path.splitext(csv_file)[0] + '.parquet'
+
+
+def load_ratings(path, columns=None):
+    """
+    Load the ratings table from a CSV or Parquet file
+    For a CSV, the typed Parquet copy is read when it is at least as new as the
+    CSV; otherwise (no copy, or the CSV was edited since) the CSV itself is
+    parsed with Arrow's multi-threaded reader. Only the requested columns are
+    converted to pandas either way.
+    """
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns)
+
+    parquet_file = ratings_parquet_path(path)
+    if os.path.exists(parquet_file) and os.path.getmtime(parquet_file) >= os.path.getmtime(path):
+        return pd.read_parquet(parquet_file, columns=columns)
+
+    convert_options = pacsv.ConvertOptions(include_columns=columns) if columns is not None else None
+    return pacsv.read_csv(path, convert_options=convert_options).to_pandas()
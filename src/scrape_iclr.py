@@ -8,93 +8,73 @@ Scrapes any ICLR conference from OpenReview with support for:
 Usage:
     python scrape_iclr_universal.py --year 2025 --output iclr_2025/iclr_2025_v1
     python scrape_iclr_universal.py --year 2026 --output iclr_2026/iclr_2026_v1 --no-decisions
+    python scrape_iclr_universal.py --year 2026 --output iclr_2026/iclr_2026_v1 --no-reviews
     python scrape_iclr_universal.py --venue "ICLR.cc/2025/Conference" --output data/iclr_2025
 """
 
-import json
-import time
-import requests
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Optional
+import itertools
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from tqdm import tqdm
 import os
 import argparse
 
+from cache_metadata import LEADING_INT_PATTERN, segment_stats, valid_scores
+from decisions import classify_decision
+from metadata_io import iter_meta
+from openreview_client import fetch_all_notes
+from ratings_io import ratings_parquet_path
+
+# Columns of the extracted ratings table, in output order
+RECORD_COLUMNS = ['submission_id', 'submission_number', 'primary_area', 'decision', 'decision_type',
+                  'num_reviews', 'ratings', 'confidences', 'soundness', 'presentation',
+                  'contribution', 'avg_rating']
+
+# Low-cardinality text columns, held as pandas categories (one small code per row)
+CATEGORY_COLUMNS = ['primary_area', 'decision', 'decision_type']
+
+# Typed Parquet copy of the table: scores as integer lists, and the
+# low-cardinality text columns dictionary-encoded
+_TEXT_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+PARQUET_SCHEMA = pa.schema([
+    ('submission_id', pa.string()),
+    ('submission_number', pa.int32()),
+    ('primary_area', _TEXT_CATEGORY),
+    ('decision', _TEXT_CATEGORY),
+    ('decision_type', _TEXT_CATEGORY),
+    ('num_reviews', pa.int8()),
+    ('ratings', pa.list_(pa.int8())),
+    ('confidences', pa.list_(pa.int8())),
+    ('soundness', pa.list_(pa.int8())),
+    ('presentation', pa.list_(pa.int8())),
+    ('contribution', pa.list_(pa.int8())),
+    ('avg_rating', pa.float64()),
+])
+
+# Submissions extracted and appended to the output files per batch
+EXTRACT_BATCH_SIZE = 1000
+
+# Progress bar redraws: about this many per run, and at most one per interval (seconds)
+PROGRESS_UPDATES = 200
+PROGRESS_INTERVAL = 0.5
+
+# Columns print_summary_statistics reads
+SUMMARY_COLUMNS = ['primary_area', 'decision', 'decision_type', 'num_reviews', 'avg_rating']
+
+# Hours a cached listing page is reused without a request: finished conferences
+# no longer change, while reviews of an ongoing one keep coming in
+CACHE_TTL_HOURS_FINAL = 30 * 24
+CACHE_TTL_HOURS_IN_PROGRESS = 24
 
-def get_all_submissions(venue_id: str, output_dir: Optional[str] = None) -> List[Dict]:
-    """
-    Fetch all submissions using OpenReview API with retry logic
-    Saves incrementally after each batch if output_dir is provided
-    """
-    base_url = "https://api2.openreview.net"
-    
-    submissions_url = f"{base_url}/notes"
-    params = {
-        "invitation": f"{venue_id}/-/Submission",
-        "details": "replies,invitation",
-        "limit": 500,  # Batch size for optimal performance
-        "offset": 0
-    }
-    
-    all_submissions = []
-    
-    print(f"Fetching submissions from {venue_id}...")
-    
-    while True:
-        retry_count = 0
-        success = False
-        
-        while not success:
-            try:
-                response = requests.get(submissions_url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                notes = data.get('notes', [])
-                if not notes:
-                    return all_submissions
-                    
-                all_submissions.extend(notes)
-                print(f"Fetched {len(all_submissions)} submissions so far...")
-                
-                # Save incrementally after each batch
-                if output_dir:
-                    submissions_file = os.path.join(output_dir, 'submissions_metadata.json')
-                    with open(submissions_file, 'w') as f:
-                        json.dump(all_submissions, f, indent=2)
-                    print(f"  ✓ Saved to {submissions_file}")
-                
-                # Check if there are more results
-                if len(notes) < params['limit']:
-                    print(f"✓ Reached end of submissions")
-                    return all_submissions
-                
-                params['offset'] += params['limit']
-                time.sleep(5)  # Rate limiting: 5-second delay between batches
-                success = True
-                
-            except Exception as e:
-                retry_count += 1
-                print(f"Error fetching submissions (attempt {retry_count}): {e}")
-                
-                # Exponential backoff: 1min, 2min, 5min, then keep trying every 5min
-                if retry_count == 1:
-                    wait_time = 60
-                elif retry_count == 2:
-                    wait_time = 120
-                else:
-                    wait_time = 300
-                
-                print(f"Retrying in {wait_time} seconds ({wait_time/60:.1f} minutes)...")
-                time.sleep(wait_time)
-    
-    return all_submissions
 
 
 def extract_decision(venue: str, venueid: str, has_decisions: bool) -> tuple:
     """
     Extract decision information from venue/venueid fields
-    Returns (decision, decision_type)
+    Returns (decision, decision_type); the ladder itself is decisions.classify_decision
     
     Args:
         venue: Venue string from submission
@@ -106,64 +86,68 @@ def extract_decision(venue: str, venueid: str, has_decisions: bool) -> tuple:
     """
     if not has_decisions:
         return ('Pending', 'Pending')
-    
-    decision = 'Unknown'
-    decision_type = 'Unknown'
-    
-    # Check for Withdrawn (always check first)
-    if 'Withdrawn' in venueid or 'Withdrawn' in venue:
-        decision = 'Withdrawn'
-        decision_type = 'Withdrawn'
-    
-    # Check for Desk Reject
-    elif 'Desk_Rejected' in venueid or 'Desk Reject' in venue:
-        decision = 'Desk Reject'
-        decision_type = 'Reject'
-    
-    # Check for Reject (including "Submitted to ICLR YYYY" which means rejected)
-    elif 'Rejected_Submission' in venueid or 'Rejected' in venueid or \
-         venue.startswith('Submitted to ICLR'):
-        decision = 'Reject'
-        decision_type = 'Reject'
-    
-    # Check for Accept - Oral (most specific, check first)
-    elif 'Oral' in venueid or 'Oral' in venue:
-        decision = 'Accept (Oral)'
-        decision_type = 'Accept'
-    
-    # Check for Accept - Spotlight
-    elif 'Spotlight' in venueid or 'Spotlight' in venue:
-        decision = 'Accept (Spotlight)'
-        decision_type = 'Accept'
-    
-    # Check for Accept - Poster
-    elif 'Poster' in venueid or 'Poster' in venue:
-        decision = 'Accept (Poster)'
-        decision_type = 'Accept'
-    
-    # Fallback: if venue contains "ICLR YYYY" but not "Submitted" or "Withdrawn",
-    # it's likely an accepted paper (assume Poster if type unclear)
-    elif 'ICLR' in venue and 'Submitted' not in venue and 'Withdrawn' not in venue:
-        decision = 'Accept (Poster)'
-        decision_type = 'Accept'
-    
-    return (decision, decision_type)
+    return classify_decision(venue, venueid)
 
 
-def extract_submission_data(submissions: List[Dict], has_decisions: bool = True) -> pd.DataFrame:
+def extract_decisions(venue: pd.Series, venueid: pd.Series, has_decisions: bool) -> tuple:
+    """
+    extract_decision over whole venue/venueid columns
+    Only a handful of distinct venue/venueid pairs exist, so each distinct pair
+    is classified once and the result is broadcast back through the codes.
+    Returns (decision, decision_type) arrays
+    """
+    codes, pairs = pd.factorize(venue.fillna('').astype(str) + '\x00' + venueid.fillna('').astype(str))
+    rungs = [extract_decision(*pair.split('\x00', 1), has_decisions) for pair in pairs]
+    decision = np.array([rung[0] for rung in rungs], dtype=object)
+    decision_type = np.array([rung[1] for rung in rungs], dtype=object)
+    return decision[codes], decision_type[codes]
+
+
+def extract_submission_data(submissions: Iterable[Dict], has_decisions: bool = True,
+                            total: Optional[int] = None, progress: bool = True) -> pd.DataFrame:
     """
     Extract key information from submissions
     Fast extraction - no API calls needed!
+    Columns are collected straight from the iterable, so submissions can be streamed
+    (e.g. with iter_meta) instead of being held in memory as a list. Review scores
+    go into one flat buffer per field and are parsed in a single vectorized pass,
+    and decisions are derived for all submissions at once (extract_decisions).
     
     Args:
-        submissions: List of submission dictionaries from OpenReview
+        submissions: Iterable of submission dictionaries from OpenReview
         has_decisions: Whether to extract decision information (False for ongoing conferences)
+        total: Number of submissions, for the progress bar when streaming
+        progress: Whether to show the progress bar
+    """
+    df, _ = _extract_batch(_progress_bar(submissions, total) if progress else submissions, has_decisions)
+    return df
+
+
+def _progress_bar(submissions: Iterable[Dict], total: Optional[int]) -> Iterable[Dict]:
+    """
+    Progress bar over the submissions, redrawn about PROGRESS_UPDATES times in total
+    and at most every PROGRESS_INTERVAL seconds; disabled when not writing to a terminal
+    """
+    if total is None and hasattr(submissions, '__len__'):
+        total = len(submissions)
+    return tqdm(submissions, desc="Processing submissions", total=total,
+                miniters=max(1, (total or 0) // PROGRESS_UPDATES), mininterval=PROGRESS_INTERVAL,
+                disable=None)
+
+
+def _extract_batch(submissions: Iterable[Dict], has_decisions: bool) -> tuple:
+    """
+    Extracted table plus the parsed review scores; see extract_submission_data
+    Returns (df, scores) where scores maps each list column to the flat numeric
+    values of all submissions and their per-submission offsets
     """
-    data = []
+    columns = {name: [] for name in RECORD_COLUMNS if name != 'avg_rating'}
+    score_flat = {name: [] for name in REVIEW_SCORE_FIELDS.values()}  # back to back, per field
+    score_offsets = {name: [0] for name in REVIEW_SCORE_FIELDS.values()}
+    venues = []
+    venueids = []
     
-    for submission in tqdm(submissions, desc="Processing submissions"):
-        submission_id = submission.get('id')
-        number = submission.get('number', None)
+    for submission in submissions:
         content = submission.get('content', {})
         
         # Get primary area
@@ -180,82 +164,120 @@ def extract_submission_data(submissions: List[Dict], has_decisions: bool = True)
         if isinstance(venueid, dict):
             venueid = venueid.get('value', '')
         
-        decision, decision_type = extract_decision(venue, venueid, has_decisions)
-        
         # Extract reviews from replies
         replies = submission.get('details', {}).get('replies', [])
+        scores = _review_scores(replies)
         
-        ratings = []
-        confidences = []
-        soundness_scores = []
-        presentation_scores = []
-        contribution_scores = []
-        
-        for reply in replies:
-            reply_content = reply.get('content', {})
-            
-            # Check if this is a review
-            if 'rating' in reply_content and 'confidence' in reply_content:
-                # Extract rating
-                rating_val = reply_content['rating']
-                if isinstance(rating_val, dict):
-                    rating_val = rating_val.get('value')
-                if rating_val:
-                    ratings.append(rating_val)
-                
-                # Extract confidence
-                conf_val = reply_content['confidence']
-                if isinstance(conf_val, dict):
-                    conf_val = conf_val.get('value')
-                if conf_val:
-                    confidences.append(conf_val)
-                
-                # Extract other scores
-                for field, target_list in [('soundness', soundness_scores),
-                                          ('presentation', presentation_scores),
-                                          ('contribution', contribution_scores)]:
-                    if field in reply_content:
-                        val = reply_content[field]
-                        if isinstance(val, dict):
-                            val = val.get('value')
-                        if val:
-                            target_list.append(val)
-        
-        # Calculate averages
-        avg_rating = None
-        if ratings:
-            # Parse numeric values from ratings
-            numeric_ratings = []
-            for r in ratings:
-                if isinstance(r, (int, float)):
-                    numeric_ratings.append(r)
-                elif isinstance(r, str):
-                    try:
-                        # Try to extract number (format might be "5: Marginally below...")
-                        numeric_ratings.append(int(r.split(':')[0]))
-                    except:
-                        pass
-            if numeric_ratings:
-                avg_rating = sum(numeric_ratings) / len(numeric_ratings)
-        
-        record = {
-            'submission_id': submission_id,
-            'submission_number': number,
-            'primary_area': primary_area,
-            'decision': decision,
-            'decision_type': decision_type,
-            'num_reviews': len(ratings),
-            'ratings': str(ratings),
-            'confidences': str(confidences),
-            'soundness': str(soundness_scores),
-            'presentation': str(presentation_scores),
-            'contribution': str(contribution_scores),
-            'avg_rating': avg_rating
-        }
+        columns['submission_id'].append(submission.get('id'))
+        columns['submission_number'].append(submission.get('number', None))
+        columns['primary_area'].append(primary_area)
+        venues.append(venue)
+        venueids.append(venueid)
+        columns['num_reviews'].append(len(scores['ratings']))
+        for name in REVIEW_SCORE_FIELDS.values():
+            columns[name].append(str(scores[name]))
+            score_flat[name].extend(scores[name])
+            score_offsets[name].append(len(score_flat[name]))
+    
+    columns['decision'], columns['decision_type'] = extract_decisions(
+        pd.Series(venues, dtype=object), pd.Series(venueids, dtype=object), has_decisions)
+    
+    numeric = {name: _numeric_scores(score_flat[name], score_offsets[name]) for name in score_flat}
+    
+    df = pd.DataFrame(columns, columns=RECORD_COLUMNS).astype({name: 'category' for name in CATEGORY_COLUMNS})
+    _, avg_rating, _, _ = segment_stats(*numeric['ratings'])
+    df['avg_rating'] = avg_rating
+    return df, numeric
+
+
+# Review fields collected per submission, mapped to their output column
+REVIEW_SCORE_FIELDS = {'rating': 'ratings', 'confidence': 'confidences', 'soundness': 'soundness',
+                       'presentation': 'presentation', 'contribution': 'contribution'}
+
+
+def _review_scores(replies: list) -> Dict[str, list]:
+    """Non-empty score values of every review among the replies, per output column"""
+    scores = {name: [] for name in REVIEW_SCORE_FIELDS.values()}
+    for reply in replies:
+        reply_content = reply.get('content', {})
         
-        data.append(record)
+        # Check if this is a review
+        if 'rating' in reply_content and 'confidence' in reply_content:
+            for field, name in REVIEW_SCORE_FIELDS.items():
+                if field in reply_content:
+                    val = reply_content[field]
+                    if isinstance(val, dict):
+                        val = val.get('value')
+                    if val:
+                        scores[name].append(val)
+    return scores
+
+
+def _numeric_scores(score_flat: list, score_offsets: list) -> tuple:
+    """
+    Numeric values of a flat score buffer, with the segment offsets shifted to match
+    Numbers are used as is; strings such as "5: Marginally below..." contribute
+    their leading integer, parsed for all reviews with one vectorized regex.
+    Unparseable or invalid scores (see cache_metadata.parse_score, e.g. 5.5) are
+    skipped, so a submission with none gets an empty segment.
+    """
+    flat = pd.Series(score_flat, dtype=object)
+    is_str = flat.map(type).eq(str).to_numpy(dtype=bool)
+    is_num = flat.map(lambda r: isinstance(r, (int, float))).to_numpy(dtype=bool)
+    
+    values = np.full(len(flat), np.nan)
+    values[is_num] = flat[is_num].astype(np.float64)
+    values[is_str] = pd.to_numeric(flat[is_str].astype(str).str.extract('^' + LEADING_INT_PATTERN, expand=False))
     
-    return pd.DataFrame(data)
+    valid = valid_scores(values)
+    offsets = np.concatenate(([0], np.cumsum(valid)))[np.asarray(score_offsets)]
+    return values[valid], offsets
+
+
+def _typed_table(df: pd.DataFrame, numeric: Dict[str, tuple]) -> pa.Table:
+    """
+    Extracted table as PARQUET_SCHEMA: the review scores as native integer lists
+    _numeric_scores only keeps valid (whole, int8-range) scores, so the cast is exact
+    """
+    arrays = {}
+    for field in PARQUET_SCHEMA:
+        if field.name in numeric:
+            values, offsets = numeric[field.name]
+            arrays[field.name] = pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()),
+                                                          pa.array(values.astype(np.int8)))
+        elif pa.types.is_dictionary(field.type):
+            # Categorical columns convert straight to dictionary arrays
+            arrays[field.name] = pa.array(df[field.name], from_pandas=True).cast(field.type)
+        else:
+            arrays[field.name] = pa.array(df[field.name], type=field.type, from_pandas=True)
+    return pa.table(arrays, schema=PARQUET_SCHEMA)
+
+
+def write_submission_files(submissions: Iterable[Dict], output_file: str, has_decisions: bool = True,
+                           total: Optional[int] = None) -> int:
+    """
+    Extract submissions and write them to a CSV file plus a typed Parquet copy, batch by batch
+    Each batch of EXTRACT_BATCH_SIZE submissions is extracted (vectorized, as in
+    extract_submission_data) and appended to both files, so only one batch of rows
+    is ever held in memory. The Parquet copy sits next to the CSV with the same stem
+    (see ratings_io) and stores the review scores as integer lists.
+    Returns the number of rows written.
+    """
+    submissions = iter(_progress_bar(submissions, total))
+    num_rows = 0
+    # The CSV is closed (and flushed) before the Parquet footer is written, so the
+    # copy is never older than the CSV and load_ratings reads it
+    with pq.ParquetWriter(ratings_parquet_path(output_file), PARQUET_SCHEMA, compression='zstd') as writer, \
+            open(output_file, 'w', newline='') as f:
+        while True:
+            batch, numeric = _extract_batch(itertools.islice(submissions, EXTRACT_BATCH_SIZE), has_decisions)
+            if num_rows and batch.empty:
+                return num_rows
+            batch.to_csv(f, index=False, header=not num_rows)
+            writer.write_table(_typed_table(batch, numeric))
+            num_rows += len(batch)
+            if len(batch) < EXTRACT_BATCH_SIZE:
+                return num_rows
 
 
 def print_summary_statistics(df: pd.DataFrame, has_decisions: bool, conference_name: str):
@@ -284,7 +306,7 @@ def print_summary_statistics(df: pd.DataFrame, has_decisions: bool, conference_n
         decision_type_counts = df['decision_type'].value_counts()
         print("\n📈 Overall Status:")
         
-        total_non_withdrawn = len(df[df['decision_type'] != 'Withdrawn'])
+        total_non_withdrawn = len(df) - decision_type_counts.get('Withdrawn', 0)
         accepts = decision_type_counts.get('Accept', 0)
         
         for dtype in ['Accept', 'Reject', 'Withdrawn', 'Unknown']:
@@ -301,8 +323,9 @@ def print_summary_statistics(df: pd.DataFrame, has_decisions: bool, conference_n
     
     # Review statistics
     print(f"\n📝 Review Statistics:")
-    print(f"Submissions with reviews: {len(df[df['num_reviews'] > 0]):,}")
-    if len(df[df['num_reviews'] > 0]) > 0:
+    num_reviewed = (df['num_reviews'] > 0).sum()
+    print(f"Submissions with reviews: {num_reviewed:,}")
+    if num_reviewed > 0:
         print(f"Average reviews per submission: {df['num_reviews'].mean():.2f}")
         print(f"Total reviews collected: {df['num_reviews'].sum():,}")
     
@@ -321,23 +344,17 @@ def print_summary_statistics(df: pd.DataFrame, has_decisions: bool, conference_n
         print(f"  {i}. {area}: {count:,} ({pct:.1f}%)")
     
     # Rating by decision type (if applicable)
+    # (one grouped pass per decision column; NaN ratings are skipped and not counted)
     if has_decisions and df['avg_rating'].notna().any():
-        print("\n📊 Average Rating by Decision Type:")
-        for dtype in ['Accept', 'Reject', 'Withdrawn']:
-            subset = df[(df['decision_type'] == dtype) & (df['avg_rating'].notna())]
-            if len(subset) > 0:
-                mean_rating = subset['avg_rating'].mean()
-                median_rating = subset['avg_rating'].median()
-                print(f"  {dtype}: Mean={mean_rating:.2f}, Median={median_rating:.2f} (n={len(subset):,})")
-        
-        print("\n📊 Average Rating by Detailed Decision:")
-        decision_order = ['Accept (Oral)', 'Accept (Spotlight)', 'Accept (Poster)', 'Reject']
-        for decision in decision_order:
-            subset = df[(df['decision'] == decision) & (df['avg_rating'].notna())]
-            if len(subset) > 0:
-                mean_rating = subset['avg_rating'].mean()
-                median_rating = subset['avg_rating'].median()
-                print(f"  {decision}: Mean={mean_rating:.2f}, Median={median_rating:.2f} (n={len(subset):,})")
+        sections = [('Decision Type', 'decision_type', ['Accept', 'Reject', 'Withdrawn']),
+                    ('Detailed Decision', 'decision',
+                     ['Accept (Oral)', 'Accept (Spotlight)', 'Accept (Poster)', 'Reject'])]
+        for title, column, order in sections:
+            print(f"\n📊 Average Rating by {title}:")
+            rating_stats = (df.groupby(column, observed=True)['avg_rating']
+                            .agg(['mean', 'median', 'count']).reindex(order))
+            for label, row in rating_stats[rating_stats['count'] > 0].iterrows():
+                print(f"  {label}: Mean={row['mean']:.2f}, Median={row['median']:.2f} (n={int(row['count']):,})")
 
 
 def main():
@@ -352,6 +369,9 @@ Examples:
   # Scrape ICLR 2026 (no decisions yet)
   python scrape_iclr_universal.py --year 2026 --output iclr_2026/iclr_2026_v1 --no-decisions
   
+  # Decisions and areas only: skip the embedded reviews (much smaller pages)
+  python scrape_iclr_universal.py --year 2025 --output iclr_2025/iclr_2025_v1 --no-reviews
+  
   # Use custom venue ID
   python scrape_iclr_universal.py --venue "ICLR.cc/2024/Conference" --output iclr_2024
         """
@@ -362,6 +382,14 @@ Examples:
     parser.add_argument('--output', type=str, required=True, help='Output directory for data files')
     parser.add_argument('--no-decisions', action='store_true', 
                        help='Conference in progress (decisions not posted yet)')
+    parser.add_argument('--no-reviews', action='store_true',
+                       help='Skip the embedded reviews (no ratings/scores, much smaller listing pages)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore the on-disk page cache and fetch every page again')
+    parser.add_argument('--cache-ttl', type=float, default=None,
+                       help='Hours a cached page is reused without asking the server '
+                            f'(default: {CACHE_TTL_HOURS_FINAL:g} for past conferences, '
+                            f'{CACHE_TTL_HOURS_IN_PROGRESS:g} with --no-decisions)')
     
     args = parser.parse_args()
     
@@ -387,6 +415,8 @@ Examples:
     print(f"Venue ID: {venue_id}")
     print(f"Output: {output_dir}")
     print(f"Decision extraction: {'Enabled' if has_decisions else 'Disabled (conference in progress)'}")
+    print(f"Reviews: {'Skipped (--no-reviews)' if args.no_reviews else 'Included'}")
+    print(f"Page cache: {'Disabled (--no-cache)' if args.no_cache else 'Enabled'}")
     print("="*60)
     print()
     
@@ -395,10 +425,16 @@ Examples:
     
     # Fetch submissions
     print("STEP 1: Fetching submissions from OpenReview API")
-    print("This may take 30-60 minutes depending on total submissions...")
+    print("Pages are fetched concurrently under a shared rate limit...")
     print()
     
-    submissions = get_all_submissions(venue_id, output_dir)
+    # Replies are the bulk of each listing page, so they are only requested when wanted
+    details = 'invitation' if args.no_reviews else 'replies,invitation'
+    cache_ttl = args.cache_ttl
+    if cache_ttl is None:
+        cache_ttl = CACHE_TTL_HOURS_FINAL if has_decisions else CACHE_TTL_HOURS_IN_PROGRESS
+    submissions = fetch_all_notes(venue_id, output_dir, details=details,
+                                  cache_ttl=cache_ttl * 3600, use_cache=not args.no_cache)
     
     if not submissions:
         print("❌ No submissions fetched. Exiting.")
@@ -411,18 +447,28 @@ Examples:
     print()
     
     # Extract data
-    print("STEP 2: Extracting ratings, metadata" + (", and decisions" if has_decisions else "") + "...")
+    print("STEP 2: Extracting " + ("" if args.no_reviews else "ratings, ") + "metadata" +
+          (", and decisions" if has_decisions else "") + "...")
     print("This is fast - processing locally, no API calls!")
     print()
     
-    df = extract_submission_data(submissions, has_decisions)
+    # Stream the saved metadata back one submission at a time instead of
+    # keeping the fetched list alive alongside the table being built
+    num_submissions = len(submissions)
+    del submissions
+    submissions_file = os.path.join(output_dir, 'submissions_metadata.json')
     
-    # Save to CSV
+    # Save to CSV and a typed Parquet copy, written batch by batch as the submissions stream in
     output_file = os.path.join(output_dir, 'ratings_data.csv')
-    df.to_csv(output_file, index=False)
+    write_submission_files(iter_meta(submissions_file), output_file, has_decisions, total=num_submissions)
     print(f"\n✅ Data saved to {output_file}")
+    print(f"   Typed copy: {ratings_parquet_path(output_file)}")
     
-    # Print summary statistics
+    # Print summary statistics (only the columns they use are read back; text
+    # such as an 'N/A' area stays text, only an empty avg_rating is missing)
+    df = pd.read_csv(output_file, usecols=SUMMARY_COLUMNS,
+                     keep_default_na=False, na_values={'avg_rating': ['']},
+                     dtype={name: 'category' for name in CATEGORY_COLUMNS})
     print_summary_statistics(df, has_decisions, conference_name)
     
     print("\n" + "="*60)
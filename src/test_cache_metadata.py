@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared score parsing, flattening and segment statistics in cache_metadata
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import cache_metadata
+from cache_metadata import (LEADING_INT_PATTERN, LIST_SCORE_PATTERN, flatten_submission, list_column_stats,
+                            parse_score, segment_stats, valid_scores)
+
+# (raw score, parsed value)
+SCORE_CASES = [
+    (6, 6),
+    ({'value': 6}, 6),
+    ("6: Weak Accept", 6),
+    ({'value': "8: Accept"}, 8),
+    ("  10 : Strong Accept", 10),
+    ("-1: N/A", -1),
+    ("7", 7),
+    (6.0, 6),
+    # Only whole numbers that fit the int8 score lists are scores
+    (5.5, None),
+    (300, None),
+    ("300: Off the scale", None),
+    ("3 good", None),
+    ("5 five", None),
+    ("Weak Accept", None),
+    ("", None),
+    (None, None),
+    ({'value': None}, None),
+    (float('nan'), None),
+    (float('inf'), None),
+    ([6], None),
+]
+
+
+@pytest.mark.parametrize("raw,expected", SCORE_CASES)
+def test_parse_score(raw, expected):
+    assert parse_score(raw) == expected
+
+
+def test_leading_int_pattern_matches_parse_score():
+    """The vectorized pattern plus valid_scores (as scrape_iclr uses them) agree with parse_score on strings"""
+    strings = [raw for raw, _ in SCORE_CASES if isinstance(raw, str)]
+    extracted = pd.to_numeric(pd.Series(strings, dtype=object).str.extract('^' + LEADING_INT_PATTERN, expand=False))
+    parsed = [int(value) if valid else None for value, valid in zip(extracted, valid_scores(extracted))]
+    assert parsed == [parse_score(raw) for raw in strings]
+
+
+def test_list_score_pattern():
+    """Stringified lists follow the same rule: quoted elements like parse_score, 5.5 dropped not truncated"""
+    column = pd.Series(["[6, 5.5, -1, 300]", "['6: Weak Accept', '5 five', \"3\"]", "[]"])
+    parts = column.str.extractall(LIST_SCORE_PATTERN)
+    values = parts['text'].fillna(parts['number']).astype(np.float64).to_numpy()
+    assert list(values[valid_scores(values)]) == [6, -1, 6, 3]
+
+
+def test_flatten_skips_empty_scores():
+    """Empty scores (None, '', 0) are not ratings; non-reviews are ignored"""
+    submission = {
+        'number': 1,
+        'content': {'title': {'value': 'A paper'}},
+        'details': {'replies': [
+            {'content': {'rating': {'value': "6: Weak Accept"}, 'confidence': {'value': 3}}},
+            {'content': {'rating': {'value': 0}, 'confidence': {'value': ''}}},
+            {'content': {'comment': {'value': 'not a review'}}},
+        ]},
+    }
+    row = flatten_submission(submission)
+    assert row['ratings'] == [6]
+    assert row['confidences'] == [3]
+    assert row['title'] == 'A paper'
+    assert row['primary_area'] == 'N/A'
+
+
+SEGMENT_VALUES = [4.0, 8.0, 6.0, 3.0, 10.0, 1.0]
+SEGMENT_OFFSETS = [0, 3, 3, 4, 6, 6]
+
+
+def _expected_segments(values, offsets):
+    """Per-segment count/mean/min/max computed row by row"""
+    rows = [values[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+    return ([len(r) for r in rows],
+            [np.mean(r) if r else math.nan for r in rows],
+            [min(r) if r else math.nan for r in rows],
+            [max(r) if r else math.nan for r in rows])
+
+
+def _check_segments(result, values, offsets):
+    for got, want in zip(result, _expected_segments(values, offsets)):
+        np.testing.assert_allclose(got, want, equal_nan=True)
+
+
+def test_segment_stats_reduceat(monkeypatch):
+    """NumPy reduceat fallback, including empty segments in the middle and at the end"""
+    monkeypatch.setattr(cache_metadata, 'numba', None)
+    _check_segments(segment_stats(SEGMENT_VALUES, SEGMENT_OFFSETS), SEGMENT_VALUES, SEGMENT_OFFSETS)
+
+
+def test_segment_stats_all_empty(monkeypatch):
+    monkeypatch.setattr(cache_metadata, 'numba', None)
+    counts, avg, low, high = segment_stats([], [0, 0, 0])
+    assert list(counts) == [0, 0]
+    assert np.isnan(avg).all() and np.isnan(low).all() and np.isnan(high).all()
+
+
+@pytest.mark.skipif(cache_metadata.numba is None, reason="numba not installed")
+def test_segment_stats_numba():
+    _check_segments(segment_stats(SEGMENT_VALUES, SEGMENT_OFFSETS), SEGMENT_VALUES, SEGMENT_OFFSETS)
+
+
+def test_list_column_stats_sliced():
+    """A sliced list column (non-zero first offset) reduces over its own rows only"""
+    column = pa.array([[1], [4, 8], [], [6]], type=pa.list_(pa.int8())).slice(1)
+    counts, avg, low, high = list_column_stats(column)
+    assert list(counts) == [2, 0, 1]
+    np.testing.assert_allclose(avg, [6.0, math.nan, 6.0], equal_nan=True)
+    np.testing.assert_allclose(low, [4.0, math.nan, 6.0], equal_nan=True)
+    np.testing.assert_allclose(high, [8.0, math.nan, 6.0], equal_nan=True)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the conditional GET cache: storing, freshness and 304 revalidation
+Requests go to a stub session that returns canned responses.
+"""
+
+import io
+import json
+import os
+import time
+
+import pytest
+import requests
+
+import http_cache
+from http_cache import cached_get_items, cached_get_json
+
+URL = "https://api2.openreview.net/notes"
+PARAMS = {'invitation': 'ICLR.cc/2025/Conference/-/Submission', 'offset': 0}
+BODY = json.dumps({'notes': [{'id': 'a'}, {'id': 'b'}]}).encode()
+
+
+def make_response(status_code=200, body=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.raw = io.BytesIO(body)
+    response.headers.update(headers or {})
+    response.url = URL
+    return response
+
+
+class StubSession:
+    """Returns the queued responses in order and records the request headers"""
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.headers = []
+
+    def get(self, url, params=None, headers=None, timeout=None, stream=False):
+        self.headers.append(headers or {})
+        return self.responses.pop(0)
+
+
+def _age(cache_dir, seconds):
+    """Pretend every cached body was fetched `seconds` ago"""
+    then = time.time() - seconds
+    for name in os.listdir(cache_dir):
+        os.utime(os.path.join(cache_dir, name), (then, then))
+
+
+def test_plain_get_without_cache_dir():
+    session = StubSession(make_response(body=BODY))
+    assert cached_get_json(session, URL, PARAMS) == {'notes': [{'id': 'a'}, {'id': 'b'}]}
+
+
+def test_revalidates_with_etag(tmp_path):
+    session = StubSession(make_response(body=BODY, headers={'ETag': '"v1"'}),
+                          make_response(304))
+    first = cached_get_json(session, URL, PARAMS, cache_dir=str(tmp_path))
+    _age(tmp_path, 3600)
+
+    second = cached_get_json(session, URL, PARAMS, cache_dir=str(tmp_path))
+    assert second == first
+    assert session.headers[1] == {'If-None-Match': '"v1"'}
+
+    # The 304 marks the body freshly revalidated
+    body_path, _ = http_cache._cache_paths(str(tmp_path), URL, PARAMS)
+    assert time.time() - os.path.getmtime(body_path) < 60
+
+
+def test_fresh_body_skips_request(tmp_path):
+    session = StubSession(make_response(body=BODY))
+    cached_get_json(session, URL, PARAMS, cache_dir=str(tmp_path), max_age=600)
+    # No response left queued: a second request would fail
+    assert cached_get_json(session, URL, PARAMS, cache_dir=str(tmp_path), max_age=600)['notes'][0] == {'id': 'a'}
+
+
+def test_stale_body_is_refetched(tmp_path):
+    session = StubSession(make_response(body=BODY), make_response(body=b'{"notes": []}'))
+    cached_get_json(session, URL, PARAMS, cache_dir=str(tmp_path), max_age=600)
+    _age(tmp_path, 601)
+    assert cached_get_json(session, URL, PARAMS, cache_dir=str(tmp_path), max_age=600) == {'notes': []}
+    # Without validators there is nothing to revalidate with
+    assert session.headers[1] == {}
+
+
+def test_unvalidated_body_not_stored(tmp_path):
+    session = StubSession(make_response(body=BODY))
+    cached_get_json(session, URL, PARAMS, cache_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+
+def test_error_status_raises(tmp_path):
+    session = StubSession(make_response(404))
+    with pytest.raises(requests.HTTPError):
+        cached_get_json(session, URL, PARAMS, cache_dir=str(tmp_path))
+
+
+def test_items_stream_and_revalidate(tmp_path):
+    session = StubSession(make_response(body=BODY, headers={'Last-Modified': 'Wed, 01 Oct 2025 00:00:00 GMT'}),
+                          make_response(304))
+    first = list(cached_get_items(session, URL, PARAMS, cache_dir=str(tmp_path)))
+    assert first == [{'id': 'a'}, {'id': 'b'}]
+    _age(tmp_path, 3600)
+    assert list(cached_get_items(session, URL, PARAMS, cache_dir=str(tmp_path))) == first
+    assert session.headers[1] == {'If-Modified-Since': 'Wed, 01 Oct 2025 00:00:00 GMT'}
+
+
+def test_items_without_cache_dir():
+    session = StubSession(make_response(body=BODY))
+    assert [note['id'] for note in cached_get_items(session, URL, PARAMS)] == ['a', 'b']
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
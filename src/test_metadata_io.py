@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSONL checkpoint reader in metadata_io
+"""
+
+import pytest
+
+from metadata_io import append_jsonl, iter_jsonl
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    with open(path, 'ab') as f:
+        for record in ({'id': 'a', 'data': [1, 2]}, {'id': 'b', 'data': None}):
+            append_jsonl(f, record)
+    assert [record['id'] for record in iter_jsonl(path)] == ['a', 'b']
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    path.write_bytes(b'{"id": "a"}\n{"id": "b"}\n{"id": "c", "da')
+    assert [record['id'] for record in iter_jsonl(path)] == ['a', 'b']
+
+
+def test_corrupt_line_in_the_middle_raises(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    path.write_bytes(b'{"id": "a"}\n{"id": \n{"id": "c"}\n')
+    with pytest.raises(ValueError):
+        list(iter_jsonl(path))
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
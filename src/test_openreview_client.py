@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Tests for openreview_client: listing progress, rate limit and retry policy
+Requests and time are faked, so nothing here sleeps or touches the network.
+"""
+
+import json
+import os
+
+import pytest
+import requests
+
+import openreview_client
+from openreview_client import (MAX_ATTEMPTS, TokenBucket, fetch_all_notes, is_retryable, retry_wait,
+                               retry_with_backoff)
+
+TOTAL_NOTES = 1234
+PAGE_SIZE = 100
+
+
+class FakeListing:
+    """fetch_notes_page/fetch_note_count stand-ins over TOTAL_NOTES numbered notes"""
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.offsets = []
+
+    def fetch_notes_page(self, params, cache_dir=None, max_age=0):
+        offset = params['offset']
+        self.offsets.append(offset)
+        if offset == self.fail_at:
+            raise KeyboardInterrupt
+        return [{'id': str(i)} for i in range(offset, min(offset + params['limit'], TOTAL_NOTES))]
+
+    def fetch_note_count(self, invitation):
+        return TOTAL_NOTES
+
+
+@pytest.fixture
+def listing(monkeypatch):
+    def install(fail_at=None):
+        fake = FakeListing(fail_at)
+        monkeypatch.setattr(openreview_client, 'fetch_notes_page', fake.fetch_notes_page)
+        monkeypatch.setattr(openreview_client, 'fetch_note_count', fake.fetch_note_count)
+        return fake
+    # One worker, so pages complete in offset order
+    monkeypatch.setattr(openreview_client, 'PAGE_WORKERS', 1)
+    return install
+
+
+def test_complete_listing(tmp_path, listing):
+    listing()
+    notes = fetch_all_notes('ICLR.cc/2025/Conference', str(tmp_path), limit=PAGE_SIZE)
+    assert [note['id'] for note in notes] == [str(i) for i in range(TOTAL_NOTES)]
+    # The progress file is only kept for an unfinished listing
+    assert os.listdir(tmp_path) == ['submissions_metadata.json']
+
+
+def test_interrupted_listing_resumes(tmp_path, listing):
+    listing(fail_at=600)
+    with pytest.raises(KeyboardInterrupt):
+        fetch_all_notes('ICLR.cc/2025/Conference', str(tmp_path), limit=PAGE_SIZE)
+    assert os.listdir(tmp_path) == ['submissions_metadata.jsonl.gz']
+
+    fake = listing()
+    notes = fetch_all_notes('ICLR.cc/2025/Conference', str(tmp_path), limit=PAGE_SIZE)
+    assert [note['id'] for note in notes] == [str(i) for i in range(TOTAL_NOTES)]
+    # Only the pages the first run did not get are requested again
+    assert fake.offsets == list(range(600, TOTAL_NOTES, PAGE_SIZE))
+
+
+def test_progress_with_other_page_size_is_ignored(tmp_path, listing):
+    listing(fail_at=600)
+    with pytest.raises(KeyboardInterrupt):
+        fetch_all_notes('ICLR.cc/2025/Conference', str(tmp_path), limit=PAGE_SIZE)
+
+    fake = listing()
+    fetch_all_notes('ICLR.cc/2025/Conference', str(tmp_path), limit=2 * PAGE_SIZE)
+    assert fake.offsets == list(range(0, TOTAL_NOTES, 2 * PAGE_SIZE))
+
+
+def test_progress_is_saved_in_batches(tmp_path, listing, monkeypatch):
+    """Pages are appended once SAVE_THRESHOLD notes are pending, not one by one"""
+    monkeypatch.setattr(openreview_client, 'SAVE_THRESHOLD', 250)
+    flushes = []
+    append_jsonl = openreview_client.append_jsonl
+    open_progress = openreview_client.gzip.open
+
+    def record_open(*args, **kwargs):
+        flushes.append([])
+        return open_progress(*args, **kwargs)
+
+    def record_append(f, record):
+        flushes[-1].append(record['offset'])
+        append_jsonl(f, record)
+    monkeypatch.setattr(openreview_client.gzip, 'open', record_open)
+    monkeypatch.setattr(openreview_client, 'append_jsonl', record_append)
+
+    listing(fail_at=1100)
+    with pytest.raises(KeyboardInterrupt):
+        fetch_all_notes('ICLR.cc/2025/Conference', str(tmp_path), limit=PAGE_SIZE)
+    # The last flush is forced by the interrupt
+    assert flushes == [[0, 100, 200], [300, 400, 500], [600, 700, 800], [900, 1000]]
+
+
+def test_truncated_progress_file(tmp_path):
+    progress_file = str(tmp_path / 'submissions_metadata.jsonl.gz')
+    openreview_client._save_progress(progress_file, {0: [{'id': '0'}]}, 1, force=True)
+    openreview_client._save_progress(progress_file, {1: [{'id': '1'}] * 50}, 1, force=True)
+    with open(progress_file, 'rb') as f:
+        data = f.read()
+    with open(progress_file, 'wb') as f:
+        f.write(data[:-10])  # the second append was cut off
+    assert openreview_client._load_progress(progress_file, 1) == {0: [{'id': '0'}]}
+
+
+class FakeClock:
+    """monotonic()/sleep() pair where sleeping just advances the clock"""
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(openreview_client.time, 'monotonic', clock.monotonic)
+    monkeypatch.setattr(openreview_client.time, 'sleep', clock.sleep)
+    return clock
+
+
+def test_bucket_burst_then_rate(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+    for _ in range(5):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+    # Past the burst every request waits for one token at the steady rate
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.now == pytest.approx(0.3)
+
+
+def test_bucket_refills_up_to_burst(clock):
+    bucket = TokenBucket(rate=10, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 60  # idle: refills, but only to the burst size
+    for _ in range(2):
+        bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.1)]
+
+
+def http_error(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize("error,expected", [
+    (requests.ConnectionError(), True),
+    (requests.Timeout(), True),
+    (requests.exceptions.ChunkedEncodingError(), True),
+    (json.JSONDecodeError('Expecting value', '', 0), True),
+    (http_error(429), True),
+    (http_error(500), True),
+    (http_error(503), True),
+    (http_error(404), False),
+    (http_error(400), False),
+    (KeyError('content'), False),
+    (TypeError(), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+
+def test_retry_wait_honors_retry_after():
+    assert retry_wait(http_error(429, {'Retry-After': '7'}), 1) == 7.0
+
+
+def test_retry_wait_is_capped():
+    assert retry_wait(requests.Timeout(), 20) <= openreview_client.RETRY_CAP * 1.5
+
+
+def _flaky(errors, result='ok'):
+    """Function that raises the given errors in turn, then returns result"""
+    calls = []
+
+    @retry_with_backoff('testing')
+    def fn():
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return fn, calls
+
+
+def test_retries_transient_errors(clock):
+    fn, calls = _flaky([requests.Timeout(), http_error(502)])
+    assert fn() == 'ok'
+    assert len(calls) == 3
+    assert len(clock.sleeps) == 2
+
+
+def test_client_error_raised_immediately(clock):
+    fn, calls = _flaky([http_error(404)])
+    with pytest.raises(requests.HTTPError):
+        fn()
+    assert len(calls) == 1
+    assert clock.sleeps == []
+
+
+def test_bug_is_not_retried(clock):
+    fn, calls = _flaky([KeyError('content')])
+    with pytest.raises(KeyError):
+        fn()
+    assert len(calls) == 1
+
+
+def test_gives_up_after_max_attempts(clock):
+    fn, calls = _flaky([requests.ConnectionError()] * (MAX_ATTEMPTS + 1))
+    with pytest.raises(requests.ConnectionError):
+        fn()
+    assert len(calls) == MAX_ATTEMPTS
+    assert len(clock.sleeps) == MAX_ATTEMPTS - 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
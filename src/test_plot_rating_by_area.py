@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for area_rating_stats: the count-matrix statistics agree with pandas
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from plot_rating_by_area import _counts_quantile, area_rating_stats
+
+# The unrated area (and the single submission's std) divide by zero into NaN, as pandas gives
+pytestmark = pytest.mark.filterwarnings("ignore:invalid value encountered:RuntimeWarning")
+
+
+@pytest.fixture
+def ratings_df():
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        'primary_area': rng.choice(['optimization', 'robotics', 'theory', 'vision'], n),
+        # Averages of up to four reviews, as in the ratings table
+        'avg_rating': rng.choice([1, 2, 3, 4, 5, 6, 8, 10], (n, 4)).mean(axis=1),
+    })
+    df.loc[::17, 'avg_rating'] = np.nan
+    # An area with a single rated submission, and one without any rating
+    return pd.concat([df, pd.DataFrame({'primary_area': ['single', 'unrated'], 'avg_rating': [6.5, np.nan]})],
+                     ignore_index=True)
+
+
+def test_stats_match_pandas(ratings_df):
+    stats, _, _ = area_rating_stats(ratings_df)
+    grouped = ratings_df.dropna(subset=['avg_rating']).groupby('primary_area')['avg_rating']
+    expected = pd.DataFrame({
+        'count': grouped.count(),
+        'mean': grouped.mean(),
+        'median': grouped.median(),
+        'std': grouped.std(),
+        'min': grouped.min(),
+        'max': grouped.max(),
+        'q1': grouped.quantile(0.25),
+        'q3': grouped.quantile(0.75),
+    })
+    rated = stats.loc[expected.index]
+    pd.testing.assert_frame_equal(rated, expected, check_dtype=False, check_names=False)
+    assert stats.loc['unrated', 'count'] == 0
+
+
+def test_counts_matrix(ratings_df):
+    stats, counts_matrix, ratings = area_rating_stats(ratings_df)
+    assert list(ratings) == sorted(ratings_df['avg_rating'].dropna().unique())
+    i = list(stats.index).index('robotics')
+    robotics = ratings_df.loc[ratings_df['primary_area'] == 'robotics', 'avg_rating'].value_counts()
+    assert dict(zip(ratings[counts_matrix[i] > 0], counts_matrix[i][counts_matrix[i] > 0])) == robotics.to_dict()
+
+
+@pytest.mark.parametrize("q", [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0])
+def test_counts_quantile(q):
+    values = np.array([2.0, 4.5, 6.0, 8.0])
+    counts_matrix = np.array([[1, 0, 0, 0], [3, 1, 0, 2], [0, 2, 5, 1]])
+    expanded = [np.repeat(values, row) for row in counts_matrix]
+    got = _counts_quantile(counts_matrix, np.cumsum(counts_matrix, axis=1), values, counts_matrix.sum(axis=1), q)
+    np.testing.assert_allclose(got, [pd.Series(row).quantile(q) for row in expanded])
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for load_ratings: which of the CSV and its typed Parquet copy is read
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from ratings_io import load_ratings, ratings_parquet_path
+
+CSV_TEXT = "submission_number,primary_area,avg_rating\n1,optimization,4.0\n2,robotics,6.5\n"
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'ratings_data.csv'
+    path.write_text(CSV_TEXT)
+    return str(path)
+
+
+def _write_copy(csv_file, mtime_offset):
+    """Parquet copy with distinguishable contents, mtime shifted relative to the CSV"""
+    parquet_file = ratings_parquet_path(csv_file)
+    pd.DataFrame({'submission_number': [1], 'primary_area': ['from parquet'], 'avg_rating': [9.0]}) \
+        .to_parquet(parquet_file)
+    csv_mtime = os.path.getmtime(csv_file)
+    os.utime(parquet_file, (csv_mtime + mtime_offset, csv_mtime + mtime_offset))
+    return parquet_file
+
+
+def test_parquet_path_shares_stem():
+    assert ratings_parquet_path('data/ratings_data.csv') == os.path.join('data', 'ratings_data.parquet')
+
+
+def test_csv_without_copy_is_read_only(csv_file):
+    df = load_ratings(csv_file)
+    assert list(df['avg_rating']) == [4.0, 6.5]
+    assert os.listdir(os.path.dirname(csv_file)) == ['ratings_data.csv']
+
+
+def test_csv_columns(csv_file):
+    df = load_ratings(csv_file, columns=['primary_area', 'avg_rating'])
+    assert list(df.columns) == ['primary_area', 'avg_rating']
+
+
+def test_fresh_copy_is_preferred(csv_file):
+    _write_copy(csv_file, 10)
+    df = load_ratings(csv_file, columns=['primary_area'])
+    assert list(df['primary_area']) == ['from parquet']
+
+
+def test_stale_copy_is_ignored(csv_file):
+    """A CSV edited after the copy was written wins, and the copy is left untouched"""
+    parquet_file = _write_copy(csv_file, -10)
+    mtime = os.path.getmtime(parquet_file)
+    df = load_ratings(csv_file)
+    assert list(df['primary_area']) == ['optimization', 'robotics']
+    assert os.path.getmtime(parquet_file) == mtime
+
+
+def test_parquet_path_read_directly(csv_file):
+    parquet_file = _write_copy(csv_file, -10)
+    assert list(load_ratings(parquet_file)['avg_rating']) == [9.0]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for write_submission_files: the batched CSV and its typed Parquet copy
+"""
+
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import scrape_iclr
+from ratings_io import load_ratings, ratings_parquet_path
+from scrape_iclr import PARQUET_SCHEMA, extract_submission_data, write_submission_files
+
+
+def make_submission(number, ratings, venue="ICLR 2025 Poster", venueid="ICLR.cc/2025/Conference"):
+    replies = [{'content': {'rating': {'value': rating}, 'confidence': {'value': "3: Fairly confident"}}}
+               for rating in ratings]
+    replies.append({'content': {'comment': {'value': 'Thanks for the rebuttal'}}})
+    return {
+        'id': f'id{number}',
+        'number': number,
+        'content': {
+            'primary_area': {'value': 'optimization' if number % 2 else 'robotics'},
+            'venue': {'value': venue},
+            'venueid': {'value': venueid},
+        },
+        'details': {'replies': replies},
+    }
+
+
+SUBMISSIONS = [
+    make_submission(1, ["6: Weak Accept", "8: Accept"]),
+    make_submission(2, []),
+    make_submission(3, [5, "3 good"]),
+    make_submission(4, ["10: Strong Accept"], "Submitted to ICLR 2025", "ICLR.cc/2025/Conference/Rejected_Submission"),
+    make_submission(5, ["1: Strong Reject", "2: Reject", "4: Reject"]),
+]
+
+
+@pytest.fixture
+def output_file(tmp_path, monkeypatch):
+    # Small batches, so the five submissions span several appends to both files
+    monkeypatch.setattr(scrape_iclr, 'EXTRACT_BATCH_SIZE', 2)
+    return str(tmp_path / 'submissions.csv')
+
+
+def test_csv_matches_extraction(output_file):
+    assert write_submission_files(iter(SUBMISSIONS), output_file) == len(SUBMISSIONS)
+    expected = extract_submission_data(SUBMISSIONS, progress=False)
+    written = pd.read_csv(output_file, keep_default_na=False)
+    assert list(written.columns) == list(expected.columns)
+    assert list(written['submission_number']) == [1, 2, 3, 4, 5]
+    assert list(written['ratings']) == list(expected['ratings'])
+    assert list(written['decision']) == list(expected['decision'])
+
+
+def test_parquet_copy(output_file):
+    write_submission_files(iter(SUBMISSIONS), output_file)
+    parquet_file = ratings_parquet_path(output_file)
+    table = pq.read_table(parquet_file)
+    assert table.schema.equals(PARQUET_SCHEMA)
+    # Unparseable scores ("3 good") are left out of the typed lists
+    assert table['ratings'].to_pylist() == [[6, 8], [], [5], [10], [1, 2, 4]]
+    assert table['confidences'].to_pylist()[0] == [3, 3]
+    assert table['avg_rating'].to_pylist()[1] is None
+    assert table['decision'].to_pylist()[3] == 'Reject'
+
+    # The copy is finished after the CSV, so load_ratings picks it up
+    assert os.path.getmtime(parquet_file) >= os.path.getmtime(output_file)
+    assert load_ratings(output_file, columns=['ratings'])['ratings'].map(list).tolist()[0] == [6, 8]
+
+
+def test_no_submissions(output_file):
+    assert write_submission_files(iter([]), output_file) == 0
+    assert pq.read_table(ratings_parquet_path(output_file)).num_rows == 0
+    assert pd.read_csv(output_file).empty
+
+
+def test_invalid_scores_are_dropped(output_file):
+    """Fractional and out-of-range scores stay in the CSV lists but not in the numeric data"""
+    write_submission_files(iter([make_submission(1, [5.5, 6, 300])]), output_file)
+    written = pd.read_csv(output_file)
+    assert written['ratings'][0] == '[5.5, 6, 300]'
+    assert written['avg_rating'][0] == 6.0
+    assert pq.read_table(ratings_parquet_path(output_file))['ratings'].to_pylist() == [[6]]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))